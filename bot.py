@@ -1,67 +1,69 @@
-import os
-import json
-import time
-import threading
-import subprocess
-import tkinter as tk
-import random
-import importlib.util
-from tkinter import ttk, messagebox, filedialog, simpledialog
-
-import requests
-from datetime import datetime
+import time
+
+_STARTUP_T0 = time.perf_counter()  # first statement: startup profiling covers every import below
+
+import os  # noqa: E402
+import sys  # noqa: E402
+import json  # noqa: E402
+import heapq  # noqa: E402
+import threading  # noqa: E402
+import subprocess  # noqa: E402
+import tkinter as tk  # noqa: E402
+import re  # noqa: E402
+import logging  # noqa: E402
+import bisect  # noqa: E402
+import importlib.util  # noqa: E402
+from collections import deque  # noqa: E402
+from tkinter import ttk, messagebox, filedialog, simpledialog  # noqa: E402
+from datetime import datetime  # noqa: E402
+
+from common import (  # noqa: E402
+    APP_NAME, AUTO_LOG_FILENAME, DEFAULT_PROFILE_NAME, STARTUP_PROFILER, TRACE_DIRNAME, TRACER, DaemonPool,
+    ensure_dir, flush_auto_file_logger, get_auto_file_logger, list_profiles, load_config, profiles_root_dir,
+    sanitize_profile_name, save_config, traced, write_trace_run
+)
+from timezones import (  # noqa: E402
+    TZ_SERVICE, get_current_tz, get_tzutil_items_cached, iana_to_windows_best, make_tz_backend,
+    set_windows_timezone, windows_tz_candidates_by_offset
+)
+from feed import (  # noqa: E402
+    DEFAULT_PROVIDER_SPECS, DNS_RESOLVER, EXIT_DUP_STATUS, PROVIDER_PROXYSCRAPE, PROVIDER_TEXTBOX, AliveClock,
+    CandidateFeed, CandidateScheduler, ExitIpIndex, FifoOrder, fetch_proxyscrape_list, parse_provider_specs,
+    parse_proxy_line, proxy_dedupe_key, start_provider_fetch
+)
+from journal import RunJournal  # noqa: E402
+from profiling import (  # noqa: E402
+    PROFILING_DEFAULT_CONCURRENCY, PROFILING_DEFAULT_MINUTES, PROFILING_DEFAULT_PAGES_PER_PROFILE,
+    run_profiling_engine
+)
+from check_lanes import (  # noqa: E402
+    CHECK_BREAKER_ERROR, CHECK_DEFAULT_RETRIES, CHECK_ENGINES, CHECK_RETRY_MIN, CHECK_RETRY_RATIO,
+    LATENCY_DEFAULT_SAMPLES, LAUNCH_RACE_DEADLINE_S, LAUNCH_RACE_TOP_K, THROUGHPUT_DEFAULT_BUDGET_MB,
+    THROUGHPUT_DEFAULT_KB, THROUGHPUT_DEFAULT_URL, ByteBudget, bench_check_engines, build_requests_proxies,
+    failed_check_result, ipinfo_request, parse_node_list, race_verify, run_check_file, run_check_lanes,
+    serve_check_worker
+)
+from warm_pool import WARM_POOL_DEFAULT_SIZE, WarmPool, format_warm_pool_stats  # noqa: E402
+from query_daemon import QUERY_DAEMON_DEFAULT_LISTEN, ProxyIndex, QueryDaemon  # noqa: E402
+from provision import PROVISION_DEFAULT_PREFIX, format_bytes, provision_profiles  # noqa: E402
 
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
 except Exception:
     ZoneInfo = None
 
-APP_NAME = "Proxy Browser Launcher + Whoer 100%"
-WHOER_URL = "https://whoer.net/"
-IPINFO_URL = "https://ipinfo.io/json"
-
-# NEW: built-in provider
-PROXYSCRAPE_URL = (
-    "https://api.proxyscrape.com/v4/free-proxy-list/get"
-    "?request=display_proxies&proxy_format=ipport&format=text&timeout=5000"
-)
-
-PROFILES_ROOT_NAME = "Brave Profile"
-DEFAULT_PROFILE_NAME = "Default"
-PROFILING_DEFAULT_MINUTES = 15
-PROFILING_PROFILE_DIRNAME = "Browser Profiling"
-
-BROWSER_PROFILING_URLS = [
-    "https://openai.com/",
-    "https://www.anthropic.com/",
-    "https://ai.google/",
-    "https://huggingface.co/",
-    "https://pandas.pydata.org/",
-    "https://numpy.org/",
-    "https://scikit-learn.org/",
-    "https://cloud.google.com/",
-    "https://aws.amazon.com/",
-    "https://azure.microsoft.com/",
-    "https://playwright.dev/",
-    "https://www.selenium.dev/",
-    "https://docs.python.org/3/library/asyncio.html",
-    "https://developer.mozilla.org/",
-]
-
-
-# ===================== Basic utils =====================
-def desktop_path() -> str:
-    return os.path.join(os.path.expanduser("~"), "Desktop")
-
+STARTUP_PROFILER.start_at(_STARTUP_T0)
 
-def profiles_root_dir() -> str:
-    return os.path.join(desktop_path(), PROFILES_ROOT_NAME)
 
+WHOER_URL = "https://whoer.net/"
 
-def ensure_dir(path: str) -> None:
-    os.makedirs(path, exist_ok=True)
+AUTO_LOG_MAX_LINES = 2000
+AUTO_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+AUTO_LOG_DEFAULT_LEVEL = "INFO"  # on-screen only; the log file always gets DEBUG
+AUTO_REMAINING_REFRESH_MS = 1000  # the remaining-lines textbox is rebuilt at most this often during a run
 
 
+# ===================== Basic utils =====================
 def find_brave_exe() -> str | None:
     candidates = [
         os.path.join(os.environ.get("PROGRAMFILES", r"C:\Program Files"),
@@ -77,27 +79,6 @@ def find_brave_exe() -> str | None:
     return None
 
 
-def config_path(profile_dir: str) -> str:
-    return os.path.join(profile_dir, "launcher_config.json")
-
-
-def load_config(profile_dir: str) -> dict:
-    cfg_path = config_path(profile_dir)
-    if os.path.isfile(cfg_path):
-        try:
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-
-def save_config(profile_dir: str, cfg: dict) -> None:
-    cfg_path = config_path(profile_dir)
-    with open(cfg_path, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2)
-
-
 def launch_brave(brave_exe: str, user_data_dir: str, proxy_hostport: str | None) -> None:
     args = [
         brave_exe,
@@ -110,177 +91,6 @@ def launch_brave(brave_exe: str, user_data_dir: str, proxy_hostport: str | None)
     subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
-def get_current_tz() -> str:
-    p = subprocess.run(["tzutil", "/g"], capture_output=True, text=True)
-    return (p.stdout or "").strip()
-
-
-def set_windows_timezone(tz_id: str) -> tuple[bool, str]:
-    try:
-        subprocess.run(["tzutil", "/s", tz_id], check=True, capture_output=True, text=True)
-        return True, "Timezone changed."
-    except subprocess.CalledProcessError as e:
-        msg = (e.stderr or e.stdout or str(e)).strip()
-        return False, f"Fail change Timezone. Please Run as Administrator.\n{msg}"
-
-
-def build_requests_proxies(host: str, port: str, username: str = "", password: str = "") -> dict:
-    host = host.strip()
-    port = port.strip()
-    if not host or not port:
-        return {}
-    if username.strip():
-        proxy = f"http://{username.strip()}:{password.strip()}@{host}:{port}"
-    else:
-        proxy = f"http://{host}:{port}"
-    return {"http": proxy, "https": proxy}
-
-
-def parse_proxy_line(line: str):
-    raw = line.strip()
-    if not raw or raw.startswith("#"):
-        return None
-    parts = raw.split(":")
-    if len(parts) == 2:
-        host, port = parts
-        return {"host": host.strip(), "port": port.strip(), "user": "", "pass": "", "raw": raw}
-    if len(parts) >= 4:
-        host, port, user = parts[0], parts[1], parts[2]
-        pwd = ":".join(parts[3:])
-        return {"host": host.strip(), "port": port.strip(), "user": user.strip(), "pass": pwd.strip(), "raw": raw}
-    return None
-
-
-def ipinfo_request(proxies: dict | None, timeout_s: int = 15) -> tuple[int, dict, str]:
-    try:
-        r = requests.get(IPINFO_URL, proxies=proxies, timeout=timeout_s)
-        if r.status_code != 200:
-            return r.status_code, {}, f"HTTP {r.status_code}"
-        return 200, r.json(), ""
-    except requests.exceptions.ProxyError:
-        return 0, {}, "ProxyError"
-    except requests.exceptions.ConnectTimeout:
-        return 0, {}, "ConnectTimeout"
-    except requests.exceptions.ReadTimeout:
-        return 0, {}, "ReadTimeout"
-    except requests.exceptions.SSLError:
-        return 0, {}, "SSLError"
-    except requests.exceptions.RequestException as e:
-        return 0, {}, f"RequestException:{type(e).__name__}"
-    except Exception as e:
-        return 0, {}, f"Exception:{type(e).__name__}"
-
-
-def fetch_proxyscrape_list(timeout_s: int = 15) -> tuple[bool, list[str], str]:
-    """Fetch ip:port lines from ProxyScrape endpoint."""
-    try:
-        r = requests.get(PROXYSCRAPE_URL, timeout=timeout_s)
-        if r.status_code != 200:
-            return False, [], f"HTTP {r.status_code}"
-        txt = (r.text or "").strip()
-        lines = [ln.strip() for ln in txt.splitlines() if ln.strip()]
-        return True, lines, ""
-    except requests.exceptions.ConnectTimeout:
-        return False, [], "ConnectTimeout"
-    except requests.exceptions.ReadTimeout:
-        return False, [], "ReadTimeout"
-    except requests.exceptions.RequestException as e:
-        return False, [], f"RequestException:{type(e).__name__}"
-    except Exception as e:
-        return False, [], f"Exception:{type(e).__name__}"
-
-
-# ===================== Timezone mapping helpers =====================
-_TZUTIL_ITEMS_CACHE = None
-
-
-def parse_utc_offset_minutes(display: str) -> int | None:
-    if "(UTC" not in display:
-        return None
-    try:
-        inside = display.split("(UTC", 1)[1].split(")", 1)[0].strip()
-        if inside == "":
-            return 0
-        if inside.startswith("+"):
-            sign = 1
-            hhmm = inside[1:]
-        elif inside.startswith("-"):
-            sign = -1
-            hhmm = inside[1:]
-        else:
-            return 0
-        hh, mm = hhmm.split(":")
-        return sign * (int(hh) * 60 + int(mm))
-    except Exception:
-        return None
-
-
-def get_tzutil_items_cached() -> list[dict]:
-    global _TZUTIL_ITEMS_CACHE
-    if _TZUTIL_ITEMS_CACHE is not None:
-        return _TZUTIL_ITEMS_CACHE
-
-    p = subprocess.run(["tzutil", "/l"], capture_output=True, text=True)
-    lines = [ln.rstrip() for ln in (p.stdout or "").splitlines() if ln.strip()]
-
-    items = []
-    i = 0
-    while i < len(lines) - 1:
-        display = lines[i]
-        tzid = lines[i + 1]
-        off_min = parse_utc_offset_minutes(display)
-        items.append({"display": display, "id": tzid, "offset_min": off_min})
-        i += 2
-
-    _TZUTIL_ITEMS_CACHE = items
-    return items
-
-
-def iana_offset_minutes_now(iana_tz: str) -> int | None:
-    if not iana_tz or iana_tz == "-":
-        return None
-    if ZoneInfo is None:
-        return None
-    try:
-        dt = datetime.now(ZoneInfo(iana_tz))
-        off = dt.utcoffset()
-        if off is None:
-            return None
-        return int(off.total_seconds() // 60)
-    except Exception:
-        return None
-
-
-def iana_to_windows_best(iana_tz: str) -> str:
-    if not iana_tz or iana_tz in ("-", ""):
-        return "(no map)"
-
-    items = get_tzutil_items_cached()
-    off = iana_offset_minutes_now(iana_tz)
-    if off is None:
-        return "(no map)"
-
-    cands = [it for it in items if it["offset_min"] == off]
-    if not cands:
-        return "(no map)"
-
-    keyword = ""
-    if "/" in iana_tz:
-        keyword = iana_tz.split("/")[-1].replace("_", " ").strip().lower()
-
-    if keyword:
-        for it in cands:
-            if keyword in (it["display"] or "").lower():
-                return it["id"]
-
-    return cands[0]["id"]
-
-
-def windows_tz_candidates_by_offset(offset_min: int) -> list[dict]:
-    items = get_tzutil_items_cached()
-    return [it for it in items if it["offset_min"] == offset_min]
-
-
 # ===================== Scrollable Frame =====================
 class ScrollableFrame(ttk.Frame):
     def __init__(self, parent, *args, **kwargs):
@@ -319,48 +129,690 @@ class ScrollableFrame(ttk.Frame):
         self.canvas.yview_scroll(delta, "units")
 
 
-# ===================== Profiles helpers =====================
-def list_profiles() -> list[tuple[str, str]]:
-    root = profiles_root_dir()
-    ensure_dir(root)
-    out = []
+# ===================== Results store =====================
+class ProxyResult:
+    """One checked proxy. Slotted; repeated strings are interned by ResultsStore."""
+
+    __slots__ = ("host", "port", "user", "status", "latency_ms", "ip", "country",
+                 "iana_tz", "win_tz", "error", "source", "kbps", "ttfb_ms",
+                 "min_ms", "p50_ms", "p95_ms", "jitter_ms", "dups")
+
+    def __init__(self, host, port, user, status, latency_ms, ip, country, iana_tz, win_tz, error, source,
+                 kbps=None, ttfb_ms=None, min_ms=None, p50_ms=None, p95_ms=None, jitter_ms=None, dups=0):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.status = status
+        self.latency_ms = latency_ms
+        self.ip = ip
+        self.country = country
+        self.iana_tz = iana_tz
+        self.win_tz = win_tz
+        self.error = error
+        self.source = source
+        self.kbps = kbps
+        self.ttfb_ms = ttfb_ms
+        self.min_ms = min_ms
+        self.p50_ms = p50_ms
+        self.p95_ms = p95_ms
+        self.jitter_ms = jitter_ms
+        self.dups = dups
+
+    @property
+    def rank_latency(self) -> int:
+        """p95 when sampled, else the single check latency."""
+        return self.p95_ms if self.p95_ms is not None else self.latency_ms
+
+    @property
+    def hostport(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def key(self) -> str:
+        """host:port:user, the same identity as proxy_dedupe_key()."""
+        return f"{self.host}:{self.port}:{self.user}".lower()
+
+    @property
+    def proxy_show(self) -> str:
+        return self.hostport + (":***" if self.user else "")
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "OK"
+
+
+class ResultsStore:
+    """Slotted checker results with interned low-cardinality strings, indexed by rec.key (host:port:user)."""
+
+    def __init__(self):
+        self._rows: list[ProxyResult] = []
+        self._index: dict[str, int] = {}
+        self._passwords: dict[str, str] = {}
+        self.ok_count = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def clear(self) -> None:
+        self._rows = []
+        self._index = {}
+        self._passwords = {}
+        self.ok_count = 0
+
+    def add(self, host: str, port: str, user: str = "", pwd: str = "", status: str = "FAIL",
+            latency_ms: int = 0, ip: str = "-", country: str = "-", iana_tz: str = "-",
+            win_tz: str = "-", error: str = "", source: str = "") -> ProxyResult:
+        intern = sys.intern
+        rec = ProxyResult(
+            # user is not interned: session-style usernames are unique per proxy and the intern table never shrinks
+            host, intern(str(port)), user or "", intern(status), int(latency_ms), ip,
+            intern(country or "-"), intern(iana_tz or "-"), intern(win_tz or "-"),
+            intern(error) if error else "", intern(source) if source else "",
+        )
+        key = rec.key
+        if pwd:
+            self._passwords[key] = pwd
+        self._index[key] = len(self._rows)
+        self._rows.append(rec)
+        if rec.ok:
+            self.ok_count += 1
+        return rec
+
+    def add_dict(self, d: dict) -> ProxyResult:
+        rec = self.add(
+            d.get("host", ""), d.get("port", ""), d.get("user", ""), d.get("pass", ""),
+            d.get("status", "FAIL"), d.get("latency_ms", 0), d.get("ip", "-"), d.get("country", "-"),
+            d.get("iana_tz", "-"), d.get("win_tz", "-"), d.get("error", ""), d.get("source", ""),
+        )
+        for name in ("kbps", "ttfb_ms", "min_ms", "p50_ms", "p95_ms", "jitter_ms"):
+            setattr(rec, name, d.get(name))
+        rec.dups = int(d.get("dups") or 0)
+        return rec
+
+    def remove(self, rec: ProxyResult) -> None:
+        """Drop one record (swap with the last row, so O(1); row order is not kept)."""
+        key = rec.key
+        i = self._index.get(key)
+        if i is None or self._rows[i] is not rec:
+            try:
+                i = self._rows.index(rec)
+            except ValueError:
+                return
+        if self._index.get(key) == i:
+            del self._index[key]
+        last = self._rows.pop()
+        if last is not rec:
+            self._rows[i] = last
+            if self._index.get(last.key) == len(self._rows):
+                self._index[last.key] = i
+        self._passwords.pop(key, None)
+        if rec.ok:
+            self.ok_count -= 1
+
+    def get(self, key: str) -> ProxyResult | None:
+        """Latest record for a proxy_dedupe_key() (host:port:user)."""
+        i = self._index.get(key.lower())
+        return None if i is None else self._rows[i]
+
+    def password(self, rec: ProxyResult) -> str:
+        return self._passwords.get(rec.key, "")
+
+    def ok(self):
+        return (r for r in self._rows if r.ok)
+
+    def best_ok(self) -> ProxyResult | None:
+        """Lowest p95 (or single-sample latency when not sampled) among alive proxies."""
+        return min(self.ok(), key=lambda r: r.rank_latency, default=None)
+
+    def to_dict(self, rec: ProxyResult) -> dict:
+        """Plain dict (with password) for journals and exports."""
+        d = {name: getattr(rec, name) for name in ProxyResult.__slots__}
+        d["pass"] = self.password(rec)
+        return d
+
+    def iter_dicts(self, ok_only: bool = False):
+        for rec in self._rows:
+            if ok_only and not rec.ok:
+                continue
+            yield self.to_dict(rec)
+
+
+TOPK_DEFAULT_K = 20
+# ranking name -> (record key, higher is better)
+TOPK_KEYS = {
+    "latency": ("rank_latency", False),
+    "p95": ("p95_ms", False),
+    "ttfb": ("ttfb_ms", False),
+    "kbps": ("kbps", True),
+}
+
+
+class TopKRanking:
+    """Streaming top-k of alive results by one TOPK_KEYS key, overall and optionally per country."""
+
+    def __init__(self, k: int = TOPK_DEFAULT_K, key: str = "latency", per_country: bool = True):
+        self.k = max(1, int(k))
+        self.key = key if key in TOPK_KEYS else "latency"
+        self.attr, self.desc = TOPK_KEYS[self.key]
+        self.per_country = per_country
+        self.offered = 0
+        self._overall: list[tuple] = []
+        self._by_country: dict[str, list[tuple]] = {}
+        self._refs: dict = {}  # record -> number of heaps holding it
+        self._seq = 0
+
+    def _score(self, rec) -> float:
+        """Lower is better."""
+        v = _record_get(rec, self.attr)
+        if v is None:
+            return float("inf")
+        return -v if self.desc else v
+
+    def _offer_heap(self, heap: list, entry: tuple) -> tuple[bool, object]:
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+            return True, None
+        if entry[0] <= heap[0][0]:
+            return False, None
+        return True, heapq.heapreplace(heap, entry)[2]
+
+    def offer(self, rec) -> tuple[bool, list]:
+        """Returns (rec kept, records that no longer rank anywhere)."""
+        self.offered += 1
+        self._seq += 1
+        entry = (-self._score(rec), -self._seq, rec)  # ties: the earlier result stays
+        heaps = [self._overall]
+        if self.per_country:
+            heaps.append(self._by_country.setdefault(_record_get(rec, "country") or "-", []))
+        dropped = []
+        for heap in heaps:
+            added, out = self._offer_heap(heap, entry)
+            if added:
+                self._refs[rec] = self._refs.get(rec, 0) + 1
+            if out is not None:
+                n = self._refs[out] - 1
+                if n:
+                    self._refs[out] = n
+                else:
+                    del self._refs[out]
+                    dropped.append(out)
+        return rec in self._refs, dropped
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def ranked(self, country: str | None = None) -> list:
+        heap = self._by_country.get(country, []) if country else self._overall
+        return [e[2] for e in sorted(heap, key=lambda e: (-e[0], -e[1]))]
+
+
+# ===================== Virtual results table =====================
+RESULT_COLUMNS = (
+    # (column id, record key, width)
+    ("proxy", "proxy_show", 220),
+    ("status", "status", 70),
+    ("latency_ms", "latency_ms", 90),
+    ("ip", "ip", 150),
+    ("country", "country", 70),
+    ("IP_timezone", "iana_tz", 170),
+    ("WIN_timezone", "win_tz", 220),
+    ("p50", "p50_ms", 60),
+    ("p95", "p95_ms", 60),
+    ("jitter", "jitter_ms", 60),
+    ("kbps", "kbps", 70),
+    ("dups", "dups", 50),
+)
+
+RESULT_FILTER_ALIASES = {
+    "proxy": "proxy_show",
+    "latency": "latency_ms",
+    "ms": "latency_ms",
+    "cc": "country",
+    "tz": "iana_tz",
+    "ip_timezone": "iana_tz",
+    "win": "win_tz",
+    "win_timezone": "win_tz",
+    "throughput": "kbps",
+    "speed": "kbps",
+    "ttfb": "ttfb_ms",
+    "p50": "p50_ms",
+    "p95": "p95_ms",
+    "jitter": "jitter_ms",
+}
+RESULT_FILTER_FIELDS = frozenset(ProxyResult.__slots__) | frozenset(RESULT_FILTER_ALIASES.values())
+
+_FILTER_OPS = ("<=", ">=", "==", "!=", "<", ">", "=", "~")
+_FILTER_OP_RE = "|".join(re.escape(op) for op in _FILTER_OPS)
+# ',' always ends a clause; ' and ' only when a `field op` follows, so values may contain "and"
+_FILTER_SPLIT_RE = re.compile(rf"\s*,\s*|\s+and\s+(?=\w+\s*(?:{_FILTER_OP_RE}))", re.IGNORECASE)
+_FILTER_CLAUSE_RE = re.compile(rf"^(\w+)\s*({_FILTER_OP_RE})\s*(.*)$", re.DOTALL)
+
+
+def _filter_number(v):
     try:
-        for name in os.listdir(root):
-            p = os.path.join(root, name)
-            if os.path.isdir(p):
-                out.append((name, p))
-    except Exception:
-        pass
-    out.sort(key=lambda x: x[0].lower())
-    return out
+        return float(str(v).strip().lower().removesuffix("ms"))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_result_filter(expr: str):
+    """Parse 'country == US, latency < 500ms' into a record predicate; ValueError if malformed."""
+    expr = (expr or "").strip()
+    if not expr:
+        return None
+
+    clauses = []
+    for part in _FILTER_SPLIT_RE.split(expr):
+        part = part.strip()
+        if not part:
+            continue
+        m = _FILTER_CLAUSE_RE.match(part)
+        if m is None:
+            raise ValueError(f"Invalid filter: {part}")
+        field, op, value = m.groups()
+        field = field.lower()
+        field = RESULT_FILTER_ALIASES.get(field, field)
+        if field not in RESULT_FILTER_FIELDS:
+            raise ValueError(f"Unknown filter field: {m.group(1)}")
+        value = value.strip().strip('"').strip("'")
+        clauses.append((field, "==" if op == "=" else op, value, _filter_number(value)))
+
+    def pred(rec) -> bool:
+        for field, op, value, num in clauses:
+            got = rec.get(field, "") if isinstance(rec, dict) else getattr(rec, field, "")
+            if op == "~":
+                if value.lower() not in str(got).lower():
+                    return False
+                continue
+            got_num = _filter_number(got)
+            if num is not None and got_num is not None:
+                a, b = got_num, num
+            else:
+                a, b = str(got).lower(), value.lower()
+                if op not in ("==", "!="):
+                    return False
+            if op == "==" and not a == b:
+                return False
+            if op == "!=" and not a != b:
+                return False
+            if op == "<" and not a < b:
+                return False
+            if op == "<=" and not a <= b:
+                return False
+            if op == ">" and not a > b:
+                return False
+            if op == ">=" and not a >= b:
+                return False
+        return True
+
+    return pred
+
+
+def _record_get(rec, key):
+    return rec.get(key) if isinstance(rec, dict) else getattr(rec, key, None)
+
+
+def _display_value(v):
+    return "-" if v is None else v
+
+
+class ResultsTableModel:
+    """Filtered/sorted view over result records (references only, never copies)."""
+
+    def __init__(self):
+        self.records = {}
+        self.view = []
+        self._seq = 0
+        self.sort_key = None
+        self.sort_desc = False
+        self.pred = None
+
+    def _sort_value(self, rec):
+        v = _record_get(rec, self.sort_key)
+        num = v if isinstance(v, (int, float)) else _filter_number(v)
+        if num is not None:
+            return 0, num, ""
+        return 1, 0, str(v or "").lower()
+
+    def clear(self) -> None:
+        self.records = {}
+        self.view = []
+
+    def append(self, rec) -> None:
+        self._seq += 1
+        self.records[id(rec)] = (self._seq, rec)
+        if self.pred is not None and not self.pred(rec):
+            return
+        if self.sort_key is None:
+            self.view.append(rec)
+            return
+        key = self._sort_value(rec)
+        if self.sort_desc:
+            lo, hi = 0, len(self.view)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._sort_value(self.view[mid]) >= key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            self.view.insert(lo, rec)
+        else:
+            bisect.insort_right(self.view, rec, key=self._sort_value)
+
+    def remove(self, rec) -> None:
+        entry = self.records.pop(id(rec), None)
+        if entry is None:
+            return
+        i = self._view_index(entry[0], rec)
+        if i is not None:
+            del self.view[i]
+
+    def _view_index(self, seq: int, rec) -> int | None:
+        view = self.view
+        if self.sort_key is None:
+            # unsorted view keeps arrival order
+            i = bisect.bisect_left(view, seq, key=lambda r: self.records.get(id(r), (seq,))[0])
+            return i if i < len(view) and view[i] is rec else None
+        key = self._sort_value(rec)
+        if self.sort_desc:
+            lo, hi = 0, len(view)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._sort_value(view[mid]) > key:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        else:
+            lo = bisect.bisect_left(view, key, key=self._sort_value)
+        while lo < len(view) and self._sort_value(view[lo]) == key:
+            if view[lo] is rec:
+                return lo
+            lo += 1
+        # the record changed after it was placed (e.g. dups bumped); fall back to a scan
+        return next((i for i, r in enumerate(view) if r is rec), None)
+
+    def set_sort(self, key: str | None, desc: bool = False) -> None:
+        self.sort_key = key
+        self.sort_desc = desc
+        self._rebuild()
+
+    def set_filter(self, pred) -> None:
+        self.pred = pred
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        rows = [r for _, r in self.records.values() if self.pred is None or self.pred(r)]
+        if self.sort_key is not None:
+            rows.sort(key=self._sort_value, reverse=self.sort_desc)
+        self.view = rows
+
+
+class VirtualResultsTable(ttk.Frame):
+    """Treeview that only ever holds `height` items and rewrites them as the view scrolls."""
+
+    def __init__(self, parent, height: int = 10, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.model = ResultsTableModel()
+        self.height = height
+        self.offset = 0
+        self._selected = None
+        self._render_pending = False
+        self._rendering = False
+
+        cols = [c for c, _, _ in RESULT_COLUMNS]
+        self.tree = ttk.Treeview(self, columns=cols, show="headings", height=height, selectmode="browse")
+        for col, key, width in RESULT_COLUMNS:
+            self.tree.heading(col, text=col, command=lambda k=key, c=col: self.toggle_sort(k, c))
+            self.tree.column(col, width=width)
+
+        self._iids = [self.tree.insert("", "end", values=()) for _ in range(height)]
+        for iid in self._iids:
+            self.tree.detach(iid)
+
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.columnconfigure(0, weight=1)
+        self.tree.grid(row=0, column=0, sticky="ew")
+        self.vsb.grid(row=0, column=1, sticky="ns")
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self._update_scrollbar()
+
+    # ----- data -----
+    def append(self, rec) -> None:
+        self.model.append(rec)
+        self.schedule_render()
+
+    def remove(self, rec) -> None:
+        self.model.remove(rec)
+        if self._selected is rec:
+            self._selected = None
+        self.schedule_render()
+
+    def clear(self) -> None:
+        self.model.clear()
+        self.offset = 0
+        self._selected = None
+        self.render()
+
+    def set_filter_expr(self, expr: str) -> None:
+        self.model.set_filter(parse_result_filter(expr))
+        self.offset = 0
+        self.render()
+
+    def toggle_sort(self, key: str, col: str | None = None) -> None:
+        desc = self.model.sort_key == key and not self.model.sort_desc
+        self.set_sort(key, desc, col)
+
+    def set_sort(self, key: str, desc: bool = False, col: str | None = None) -> None:
+        if col is None:
+            col = next((c for c, k, _ in RESULT_COLUMNS if k == key), None)
+        self.model.set_sort(key, desc)
+        for c, _, _ in RESULT_COLUMNS:
+            self.tree.heading(c, text=c)
+        if col:
+            self.tree.heading(col, text=f"{col} {'v' if desc else '^'}")
+        self.offset = 0
+        self.render()
+
+    def selected_record(self):
+        return self._selected
+
+    def row_count(self) -> int:
+        return len(self.model.view)
+
+    # ----- rendering -----
+    def schedule_render(self) -> None:
+        if self._render_pending:
+            return
+        self._render_pending = True
+        self.after_idle(traced("ui: table render", self.render))
+
+    def render(self) -> None:
+        self._render_pending = False
+        self._rendering = True
+        try:
+            view = self.model.view
+            max_off = max(0, len(view) - self.height)
+            self.offset = min(max(0, self.offset), max_off)
+            window = view[self.offset:self.offset + self.height]
+
+            self.tree.selection_set(())
+            for i, iid in enumerate(self._iids):
+                if i < len(window):
+                    rec = window[i]
+                    self.tree.item(iid, values=tuple(_display_value(_record_get(rec, key)) for _, key, _ in RESULT_COLUMNS))
+                    self.tree.move(iid, "", i)
+                    if rec is self._selected:
+                        self.tree.selection_set(iid)
+                else:
+                    self.tree.detach(iid)
+        finally:
+            self._rendering = False
+        self._update_scrollbar()
+
+    def _update_scrollbar(self) -> None:
+        n = len(self.model.view)
+        if n <= self.height:
+            self.vsb.set(0.0, 1.0)
+            return
+        self.vsb.set(self.offset / n, (self.offset + self.height) / n)
+
+    def scroll_by(self, rows: int) -> None:
+        self.offset += rows
+        self.render()
+
+    def _on_scrollbar(self, *args) -> None:
+        n = len(self.model.view)
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * n)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.offset += step * (self.height if args[2] == "pages" else 1)
+        self.render()
+
+    def _on_wheel(self, event) -> str:
+        self.scroll_by(-1 * (event.delta // 120) * 3)
+        return "break"
+
+    def _on_select(self, event=None) -> None:
+        if self._rendering:
+            return
+        sel = self.tree.selection()
+        if not sel:
+            return
+        i = self._iids.index(sel[0])
+        idx = self.offset + i
+        view = self.model.view
+        self._selected = view[idx] if idx < len(view) else None
+
+
+# ===================== Background UI tasks =====================
+UI_TASK_WORKERS = 4
+
+
+class UiTask:
+    """Handle for one submitted action; cancel() drops its result and sets cancel_event."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def cancel(self) -> None:
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
 
+class UiTaskRunner:
+    """Runs blocking UI actions on a shared pool and hands results back to the Tk thread."""
 
-def sanitize_profile_name(name: str) -> str:
-    bad = '<>:"/\\|?*'
-    name = (name or "").strip()
-    for ch in bad:
-        name = name.replace(ch, "")
-    name = name.strip().strip(".")
-    return name
+    def __init__(self, schedule, max_workers: int = UI_TASK_WORKERS, on_busy=None, on_error=None):
+        self._schedule = schedule
+        self._pool = DaemonPool(max_workers, thread_name_prefix="ui-task")
+        self._on_busy = on_busy or (lambda name, busy: None)
+        self._on_error = on_error or (lambda name, exc: None)
+        self._tasks: dict[str, UiTask] = {}
+        self._lock = threading.Lock()
+
+    def busy(self, name: str) -> bool:
+        with self._lock:
+            return name in self._tasks
+
+    def submit(self, name: str, fn, *args, on_done=None, on_error=None, pass_cancel: bool = False,
+               **kwargs) -> UiTask | None:
+        """Run fn(*args, **kwargs) in the pool; None if `name` is already running."""
+        with self._lock:
+            if name in self._tasks:
+                return None
+            task = UiTask(name)
+            self._tasks[name] = task
+        self._on_busy(name, True)
+        if pass_cancel:
+            kwargs["cancel_event"] = task.cancel_event
+
+        def run():
+            try:
+                result, exc = fn(*args, **kwargs), None
+            except Exception as e:
+                result, exc = None, e
+            self._schedule(lambda: self._finish(task, result, exc, on_done, on_error))
+
+        task.future = self._pool.submit(run)
+        return task
+
+    def _finish(self, task: UiTask, result, exc, on_done, on_error) -> None:
+        with self._lock:
+            released = self._tasks.get(task.name) is task
+            if released:
+                del self._tasks[task.name]
+        if released:
+            self._on_busy(task.name, False)
+        if task.cancelled:
+            return
+        if exc is not None:
+            (on_error or (lambda e: self._on_error(task.name, e)))(exc)
+        elif on_done is not None:
+            on_done(result)
+
+    def cancel(self, name: str) -> bool:
+        """Cancel a running action; True if there was one."""
+        with self._lock:
+            task = self._tasks.pop(name, None)
+        if task is None:
+            return False
+        task.cancel()
+        self._on_busy(name, False)
+        return True
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            names = list(self._tasks)
+        for name in names:
+            self.cancel(name)
+
+    def shutdown(self) -> None:
+        self.cancel_all()
+        self._pool.shutdown()
 
 
 # ===================== App =====================
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, lazy_tabs: bool = True):
         super().__init__()
+        STARTUP_PROFILER.mark("Tk init")
+        self.lazy_tabs = lazy_tabs
         self.title(APP_NAME)
         self.geometry("1040x900")
         self.minsize(940, 740)
         self.resizable(True, True)
 
+        # every blocking action (network, tzutil) goes through here; see _task_button
+        self._task_widgets: dict[str, list] = {}
+        self.tasks = UiTaskRunner(lambda fn: self.after(0, fn), on_busy=self._on_task_busy,
+                                  on_error=lambda name, e: messagebox.showerror("Failed", f"{type(e).__name__}: {e}"))
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
         ensure_dir(profiles_root_dir())
         default_profile_dir = os.path.join(profiles_root_dir(), DEFAULT_PROFILE_NAME)
         ensure_dir(default_profile_dir)
 
         self.active_profile_dir = default_profile_dir
         self.cfg = load_config(self.active_profile_dir)
+        STARTUP_PROFILER.mark("profile dirs + config")
 
         self.brave_path_var = tk.StringVar(value=self.cfg.get("brave_exe", find_brave_exe() or ""))
+        STARTUP_PROFILER.mark("find brave.exe")
 
         self.profile_selected_name_var = tk.StringVar(value=DEFAULT_PROFILE_NAME)
         self.profile_dir_var = tk.StringVar(value=self.cfg.get("profile_dir", self.active_profile_dir))
@@ -375,7 +827,7 @@ class App(tk.Tk):
         self.detect_country_var = tk.StringVar(value="-")
         self.detect_iana_tz_var = tk.StringVar(value="-")
         self.tz_windows_reco_var = tk.StringVar(value="-")
-        self.tz_current_var = tk.StringVar(value=get_current_tz() or "-")
+        self.tz_current_var = tk.StringVar(value="-")  # filled off the startup path, see _after_startup
         self.mismatch_var = tk.StringVar(value="(Belum dicek)")
 
         # Manual UTC/GMT picker state
@@ -383,25 +835,131 @@ class App(tk.Tk):
         self.manual_win_tz_pick_var = tk.StringVar(value="(belum dipilih)")
 
         # Auto options
-        self.auto_proxy_source_var = tk.StringVar(value="provider")  # provider | proxyscrape
+        self.auto_proxy_source_var = tk.StringVar(value="provider")  # provider | proxyscrape | providers
         self.auto_timeout_var = tk.IntVar(value=12)
         self.auto_stop_first_var = tk.BooleanVar(value=True)
+        self.auto_smart_order_var = tk.BooleanVar(value=self.cfg.get("auto_smart_order", True))
+        self.auto_latency_sampling_var = tk.BooleanVar(value=self.cfg.get("auto_latency_sampling", False))
+        self.auto_latency_samples_var = tk.IntVar(value=self.cfg.get("auto_latency_samples", LATENCY_DEFAULT_SAMPLES))
+        self.auto_throughput_var = tk.BooleanVar(value=self.cfg.get("auto_throughput", False))
+        self.auto_throughput_url_var = tk.StringVar(value=self.cfg.get("auto_throughput_url", THROUGHPUT_DEFAULT_URL))
+        self.auto_throughput_kb_var = tk.IntVar(value=self.cfg.get("auto_throughput_kb", THROUGHPUT_DEFAULT_KB))
+        self.auto_throughput_budget_var = tk.IntVar(
+            value=self.cfg.get("auto_throughput_budget_mb", THROUGHPUT_DEFAULT_BUDGET_MB))
+        self.auto_threads_var = tk.IntVar(value=self.cfg.get("auto_threads", 1))
+        self.auto_engine_var = tk.StringVar(value=self.cfg.get("auto_engine", "requests"))
+        self.auto_exit_dedupe_var = tk.BooleanVar(value=self.cfg.get("auto_exit_dedupe", True))
+        self.auto_trace_var = tk.BooleanVar(value=self.cfg.get("auto_trace", False))
+        self.auto_retries_var = tk.IntVar(value=self.cfg.get("auto_retries", CHECK_DEFAULT_RETRIES))
+        self.auto_host_breaker_var = tk.BooleanVar(value=self.cfg.get("auto_host_breaker", True))
+        self.auto_topk_var = tk.BooleanVar(value=self.cfg.get("auto_topk", False))
+        self.auto_topk_k_var = tk.IntVar(value=self.cfg.get("auto_topk_k", TOPK_DEFAULT_K))
+        self.auto_topk_key_var = tk.StringVar(value=self.cfg.get("auto_topk_key", "latency"))
+        self.auto_topk_per_country_var = tk.BooleanVar(value=self.cfg.get("auto_topk_per_country", True))
+        self.auto_processes_var = tk.IntVar(value=self.cfg.get("auto_processes", 0))
+        self.auto_nodes_var = tk.StringVar(value=self.cfg.get("auto_nodes", ""))
+        self.auto_worker_token_var = tk.StringVar(value=self.cfg.get("auto_worker_token", ""))
+        self.warm_pool_source_var = tk.StringVar(value=self.cfg.get("warm_pool_source", PROVIDER_PROXYSCRAPE))
+        self.warm_pool_size_var = tk.IntVar(value=self.cfg.get("warm_pool_size", WARM_POOL_DEFAULT_SIZE))
+        self.warm_pool_countries_var = tk.StringVar(value=self.cfg.get("warm_pool_countries", ""))
+        self.warm_pool_stats_var = tk.StringVar(value="stopped")
+        self.warm_pool: WarmPool | None = None
+        self.query_daemon_listen_var = tk.StringVar(value=self.cfg.get("query_daemon_listen",
+                                                                       QUERY_DAEMON_DEFAULT_LISTEN))
+        self.query_daemon_token_var = tk.StringVar(value=self.cfg.get("query_daemon_token", ""))
+        self.query_daemon_status_var = tk.StringVar(value="stopped")
+        self.proxy_index = ProxyIndex()
+        self.query_daemon: QueryDaemon | None = None
         self.auto_progress_var = tk.IntVar(value=0)
         self.auto_status_var = tk.StringVar(value="Siap.")
         self.auto_is_running = False
-        self.auto_results = []
+        self.auto_cancel_event = threading.Event()
+        self.auto_resume_event = threading.Event()
+        self.auto_resume_event.set()
+        self._auto_feed = None
+        self.auto_results = ResultsStore()
+        self.auto_filter_var = tk.StringVar(value="")
+        self.auto_log_level_var = tk.StringVar(value=self.cfg.get("auto_log_level", AUTO_LOG_DEFAULT_LEVEL))
+        self.auto_log_ring = deque(maxlen=AUTO_LOG_MAX_LINES)
+        self.auto_log = None  # built with the Semi Auto tab; lines wait in auto_log_ring until then
+        self._auto_log_pending = deque()
+        self._auto_log_flush_scheduled = False
+        self._auto_file_logger = None
+        self.auto_rows_var = tk.StringVar(value="0 rows")
 
         self.profiling_duration_var = tk.IntVar(value=self.cfg.get("profiling_duration_min", PROFILING_DEFAULT_MINUTES))
         self.profiling_status_var = tk.StringVar(value="Ready.")
         self.profiling_is_running = False
+        self.profiling_stop_event = threading.Event()
+        self.profiling_concurrency_var = tk.IntVar(
+            value=self.cfg.get("profiling_concurrency", PROFILING_DEFAULT_CONCURRENCY))
+        self.profiling_pages_var = tk.IntVar(
+            value=self.cfg.get("profiling_pages_per_profile", PROFILING_DEFAULT_PAGES_PER_PROFILE))
+        self.profiling_block_heavy_var = tk.BooleanVar(value=self.cfg.get("profiling_block_heavy", False))
+        self.profiling_headless_var = tk.BooleanVar(value=self.cfg.get("profiling_headless", False))
 
         self.all_profile_names: list[str] = []
         self.profile_search_typed = ""
         self.profile_search_last_ts = 0.0
 
+        STARTUP_PROFILER.mark("state vars")
         self._build_ui()
+        STARTUP_PROFILER.mark("build UI (eager parts)")
         self.refresh_profile_list()
-        self.load_profile_by_name(DEFAULT_PROFILE_NAME)
+        self.load_profile_by_name(DEFAULT_PROFILE_NAME, refresh_tz=False)
+        STARTUP_PROFILER.mark("load default profile")
+        self.after_idle(self._after_startup)
+
+    def _task_button(self, name: str, button, cancellable: bool = False):
+        """Tie a button to task `name`: greyed out while it runs, or relabelled Cancel if cancellable."""
+        self._task_widgets.setdefault(name, []).append((button, button.cget("text"), cancellable))
+        return button
+
+    def _on_task_busy(self, name: str, busy: bool):
+        for button, text, cancellable in self._task_widgets.get(name, ()):
+            try:
+                if cancellable:
+                    button.configure(text="Cancel" if busy else text)
+                else:
+                    button.configure(state="disabled" if busy else "normal")
+            except tk.TclError:
+                pass
+
+    def _on_close(self):
+        # in-flight requests cannot be interrupted; drop them instead of waiting at exit
+        self.tasks.shutdown()
+        DNS_RESOLVER.close()
+        if self.warm_pool is not None:
+            self.warm_pool.stop()
+        if self.query_daemon is not None:
+            self.query_daemon.stop()
+        self.destroy()
+
+    def _after_startup(self):
+        STARTUP_PROFILER.mark("first idle (window shown)")
+
+        def prime():
+            t0 = time.perf_counter()
+            cur = get_current_tz() or "-"
+            STARTUP_PROFILER.add("current timezone (background)", time.perf_counter() - t0)
+            return cur
+
+        self.tasks.submit("refresh_tz", prime, on_done=self._show_system_tz)
+        # warm the tzutil /l mapping so the first detect / offset search does not pay for it
+        self.tasks.submit("tz_items", get_tzutil_items_cached, on_error=lambda e: None)
+        TZ_SERVICE.subscribe(lambda tz: self.after(0, lambda: self._on_system_tz_changed(tz)))
+        TZ_SERVICE.start_watch()
+        if STARTUP_PROFILER.enabled:
+            self.after(1000, self._print_startup_profile)
+
+    def _print_startup_profile(self):
+        report = STARTUP_PROFILER.report()
+        print(report, flush=True)
+        try:
+            with open(os.path.join(profiles_root_dir(), "startup_profile.txt"), "w", encoding="utf-8") as f:
+                f.write(report + "\n")
+        except OSError:
+            pass
 
     def browse_brave(self):
         path = filedialog.askopenfilename(
@@ -413,7 +971,9 @@ class App(tk.Tk):
             self.save_current_profile_config()
 
     # ===== Unified detect state =====
-    def unified_apply_detect_state(self, ip: str, country: str, iana_tz: str):
+    def unified_apply_detect_state(self, ip: str, country: str, iana_tz: str, win_tz: str = "(no map)",
+                                   refresh_tz: bool = True):
+        # win_tz is mapped off the Tk thread (a cold tzutil cache spawns `tzutil /l`)
         ip = (ip or "-").strip()
         country = (country or "-").strip()
         iana_tz = (iana_tz or "-").strip()
@@ -422,11 +982,10 @@ class App(tk.Tk):
         self.detect_country_var.set(country)
         self.detect_iana_tz_var.set(iana_tz)
 
-        win_tz = iana_to_windows_best(iana_tz)
-        self.tz_windows_reco_var.set(win_tz)
+        self.tz_windows_reco_var.set((win_tz or "").strip() or "(no map)")
 
-        self.refresh_timezone()
-        self.check_mismatch()
+        if refresh_tz:
+            self.refresh_timezone()
 
     # ===== Profile list/search/create =====
     def refresh_profile_list(self):
@@ -436,6 +995,7 @@ class App(tk.Tk):
             names.insert(0, DEFAULT_PROFILE_NAME)
         self.all_profile_names = names
         self.profile_combo["values"] = self.all_profile_names
+        self.refresh_profiling_profiles()
 
     def _reset_profile_type_search_if_needed(self):
         now = time.time()
@@ -499,6 +1059,9 @@ class App(tk.Tk):
             "proxy_pass": "",
             "auto_proxy_list": "",
             "auto_proxy_source": "provider",
+            "auto_providers": DEFAULT_PROVIDER_SPECS,
+            "auto_smart_order": True,
+            "auto_log_level": AUTO_LOG_DEFAULT_LEVEL,
         }
         save_config(new_dir, cfg)
 
@@ -507,7 +1070,70 @@ class App(tk.Tk):
         self.load_profile_by_name(name)
         messagebox.showinfo("OK", f"Profile '{name}' created:\n{new_dir}")
 
-    def load_profile_by_name(self, name: str):
+    def bulk_create_profiles(self):
+        """Clone the current profile (ideally already warmed by profiling) into N new profiles."""
+        template = self.profile_dir_var.get().strip() or self.active_profile_dir
+        tname = os.path.basename(template)
+        count = simpledialog.askinteger("Bulk Create", f"How many profiles to create from '{tname}'?",
+                                        parent=self, minvalue=1, maxvalue=1000)
+        if not count:
+            return
+        prefix = simpledialog.askstring("Bulk Create", "Name prefix:", parent=self,
+                                        initialvalue=PROVISION_DEFAULT_PREFIX)
+        prefix = sanitize_profile_name(prefix or "")
+        if not prefix:
+            return
+        if any(os.path.exists(os.path.join(template, n)) for n in ("SingletonLock", "lockfile")):
+            if not messagebox.askyesno("Template in use", f"'{tname}' looks open in Brave; close it for a "
+                                                          "consistent copy.\n\nContinue anyway?"):
+                return
+
+        self.save_current_profile_config()
+        proxies = []
+        if self.auto_results.ok_count and messagebox.askyesno(
+                "Assign proxies", f"Give each new profile its own alive proxy from the results (best first)?\n"
+                                  f"{self.auto_results.ok_count} available."):
+            best = heapq.nsmallest(count, self.auto_results.ok(), key=lambda r: r.rank_latency)
+            proxies = [{"host": r.host, "port": r.port, "user": r.user, "pass": self.auto_results.password(r)}
+                       for r in best]
+        hardlink = messagebox.askyesno(
+            "Share caches", "Hardlink the template's browser caches instead of copying them?\n\n"
+                            "Saves disk, but the profiles are no longer isolated: cache files are shared, "
+                            "so what one profile caches the others (and the template) see.",
+            icon="warning", default="no")
+        if hardlink:
+            self.log_auto("[provision] browser caches are hardlinked: the new profiles share them", logging.WARNING)
+
+        def progress(done, total, rep):
+            self.log_auto(f"[provision] {done}/{total} {rep['name']}: {rep['seconds']:.2f}s, "
+                          f"{format_bytes(rep['copied_bytes'])} new, "
+                          f"{format_bytes(rep['linked_bytes'] + rep['reflinked_bytes'])} shared"
+                          + (f", proxy {rep['proxy']}" if rep["proxy"] else ""))
+
+        def done(reports):
+            self.refresh_profile_list()
+            secs = sum(r["seconds"] for r in reports)
+            new = sum(r["copied_bytes"] for r in reports)
+            shared = sum(r["linked_bytes"] + r["reflinked_bytes"] for r in reports)
+            errors = sum(r["errors"] for r in reports)
+            linked = sum(r["linked_bytes"] for r in reports)
+            if linked:
+                messagebox.showwarning("Bulk Create", f"{format_bytes(linked)} of browser cache is hardlinked "
+                                                      f"between '{tname}' and the new profiles; they are not "
+                                                      "isolated from each other.")
+            messagebox.showinfo(
+                "Bulk Create",
+                f"Created {len(reports)} profiles from '{tname}' in {secs:.1f}s "
+                f"({secs / max(len(reports), 1):.2f}s each).\n"
+                f"Disk: {format_bytes(new / max(len(reports), 1))} new per profile, "
+                f"{format_bytes(shared / max(len(reports), 1))} shared with the template."
+                + (f"\n{errors} files could not be copied." if errors else "")
+            )
+
+        self.tasks.submit("provision", provision_profiles, template, count, prefix, proxies,
+                          hardlink_caches=hardlink, on_progress=progress, on_done=done)
+
+    def load_profile_by_name(self, name: str, refresh_tz: bool = True):
         name = (name or "").strip()
         if not name:
             return
@@ -542,9 +1168,43 @@ class App(tk.Tk):
         if cfg.get("auto_proxy_source"):
             self.auto_proxy_source_var.set(cfg.get("auto_proxy_source", "provider"))
 
+        if hasattr(self, "auto_providers_text"):
+            self.auto_providers_text.delete("1.0", "end")
+            self.auto_providers_text.insert("1.0", cfg.get("auto_providers", DEFAULT_PROVIDER_SPECS))
+
+        self.auto_smart_order_var.set(bool(cfg.get("auto_smart_order", True)))
+        self.auto_latency_sampling_var.set(bool(cfg.get("auto_latency_sampling", False)))
+        self.auto_latency_samples_var.set(int(cfg.get("auto_latency_samples", LATENCY_DEFAULT_SAMPLES)))
+        self.auto_throughput_var.set(bool(cfg.get("auto_throughput", False)))
+        self.auto_throughput_url_var.set(cfg.get("auto_throughput_url", THROUGHPUT_DEFAULT_URL))
+        self.auto_throughput_kb_var.set(int(cfg.get("auto_throughput_kb", THROUGHPUT_DEFAULT_KB)))
+        self.auto_throughput_budget_var.set(int(cfg.get("auto_throughput_budget_mb", THROUGHPUT_DEFAULT_BUDGET_MB)))
+        self.auto_threads_var.set(int(cfg.get("auto_threads", 1)))
+        self.auto_engine_var.set(cfg.get("auto_engine", "requests"))
+        self.auto_exit_dedupe_var.set(bool(cfg.get("auto_exit_dedupe", True)))
+        self.auto_trace_var.set(bool(cfg.get("auto_trace", False)))
+        self.auto_retries_var.set(int(cfg.get("auto_retries", CHECK_DEFAULT_RETRIES)))
+        self.auto_host_breaker_var.set(bool(cfg.get("auto_host_breaker", True)))
+        self.auto_topk_var.set(bool(cfg.get("auto_topk", False)))
+        self.auto_topk_k_var.set(int(cfg.get("auto_topk_k", TOPK_DEFAULT_K)))
+        self.auto_topk_key_var.set(cfg.get("auto_topk_key", "latency"))
+        self.auto_topk_per_country_var.set(bool(cfg.get("auto_topk_per_country", True)))
+        self.auto_processes_var.set(int(cfg.get("auto_processes", 0)))
+        self.auto_nodes_var.set(cfg.get("auto_nodes", ""))
+        self.auto_worker_token_var.set(cfg.get("auto_worker_token", ""))
+        self.warm_pool_source_var.set(cfg.get("warm_pool_source", PROVIDER_PROXYSCRAPE))
+        self.warm_pool_size_var.set(int(cfg.get("warm_pool_size", WARM_POOL_DEFAULT_SIZE)))
+        self.warm_pool_countries_var.set(cfg.get("warm_pool_countries", ""))
+        self.query_daemon_listen_var.set(cfg.get("query_daemon_listen", QUERY_DAEMON_DEFAULT_LISTEN))
+        self.query_daemon_token_var.set(cfg.get("query_daemon_token", ""))
+        self.auto_log_level_var.set(cfg.get("auto_log_level", AUTO_LOG_DEFAULT_LEVEL))
         self.profiling_duration_var.set(int(cfg.get("profiling_duration_min", PROFILING_DEFAULT_MINUTES)))
+        self.profiling_concurrency_var.set(int(cfg.get("profiling_concurrency", PROFILING_DEFAULT_CONCURRENCY)))
+        self.profiling_pages_var.set(int(cfg.get("profiling_pages_per_profile", PROFILING_DEFAULT_PAGES_PER_PROFILE)))
+        self.profiling_block_heavy_var.set(bool(cfg.get("profiling_block_heavy", False)))
+        self.profiling_headless_var.set(bool(cfg.get("profiling_headless", False)))
 
-        self.unified_apply_detect_state("-", "-", "-")
+        self.unified_apply_detect_state("-", "-", "-", refresh_tz=refresh_tz)
         self.manual_win_tz_pick_var.set("(no selected)")
 
     # ===== Config save =====
@@ -559,9 +1219,42 @@ class App(tk.Tk):
             "proxy_port": self.proxy_port_var.get().strip(),
             "proxy_user": self.proxy_user_var.get().strip(),
             "proxy_pass": self.proxy_pass_var.get().strip(),
-            "auto_proxy_list": self.auto_list_text.get("1.0", "end").strip() if hasattr(self, "auto_list_text") else "",
+            "auto_proxy_list": (self.auto_list_text.get("1.0", "end").strip()
+                                if hasattr(self, "auto_list_text") else self.cfg.get("auto_proxy_list", "")),
             "auto_proxy_source": self.auto_proxy_source_var.get().strip(),
+            "auto_providers": (self.auto_providers_text.get("1.0", "end").strip()
+                               if hasattr(self, "auto_providers_text") else self.cfg.get("auto_providers", DEFAULT_PROVIDER_SPECS)),
+            "auto_smart_order": bool(self.auto_smart_order_var.get()),
+            "auto_latency_sampling": bool(self.auto_latency_sampling_var.get()),
+            "auto_latency_samples": int(self.auto_latency_samples_var.get()),
+            "auto_throughput": bool(self.auto_throughput_var.get()),
+            "auto_throughput_url": self.auto_throughput_url_var.get().strip(),
+            "auto_throughput_kb": int(self.auto_throughput_kb_var.get()),
+            "auto_throughput_budget_mb": int(self.auto_throughput_budget_var.get()),
+            "auto_threads": int(self.auto_threads_var.get()),
+            "auto_engine": self.auto_engine_var.get(),
+            "auto_exit_dedupe": bool(self.auto_exit_dedupe_var.get()),
+            "auto_trace": bool(self.auto_trace_var.get()),
+            "auto_retries": int(self.auto_retries_var.get()),
+            "auto_host_breaker": bool(self.auto_host_breaker_var.get()),
+            "auto_topk": bool(self.auto_topk_var.get()),
+            "auto_topk_k": int(self.auto_topk_k_var.get()),
+            "auto_topk_key": self.auto_topk_key_var.get(),
+            "auto_topk_per_country": bool(self.auto_topk_per_country_var.get()),
+            "auto_processes": int(self.auto_processes_var.get()),
+            "auto_nodes": self.auto_nodes_var.get().strip(),
+            "auto_worker_token": self.auto_worker_token_var.get(),
+            "warm_pool_source": self.warm_pool_source_var.get().strip(),
+            "warm_pool_size": int(self.warm_pool_size_var.get()),
+            "warm_pool_countries": self.warm_pool_countries_var.get().strip(),
+            "query_daemon_listen": self.query_daemon_listen_var.get().strip(),
+            "query_daemon_token": self.query_daemon_token_var.get(),
+            "auto_log_level": self.auto_log_level_var.get().strip(),
             "profiling_duration_min": int(self.profiling_duration_var.get()),
+            "profiling_concurrency": int(self.profiling_concurrency_var.get()),
+            "profiling_pages_per_profile": int(self.profiling_pages_var.get()),
+            "profiling_block_heavy": bool(self.profiling_block_heavy_var.get()),
+            "profiling_headless": bool(self.profiling_headless_var.get()),
         }
         save_config(prof_dir, cfg)
 
@@ -592,6 +1285,9 @@ class App(tk.Tk):
         self.profile_combo.bind("<<ComboboxSelected>>", lambda e: self.load_profile_by_name(self.profile_selected_name_var.get()))
         self.profile_combo.bind("<KeyRelease>", self.on_profile_type_filter)
         ttk.Button(srow, text="Create New Profile...", command=self.create_new_profile).grid(row=0, column=2, sticky="e")
+        self._task_button("provision", ttk.Button(srow, text="Bulk Create From This Profile...",
+                                                  command=self.bulk_create_profiles)).grid(row=0, column=3,
+                                                                                           sticky="e", padx=(8, 0))
 
         ttk.Label(srow, text="Folder Path Profile:").grid(row=1, column=0, sticky="w", pady=(6, 0))
         ttk.Entry(srow, textvariable=self.profile_dir_var, state="readonly").grid(row=1, column=1, columnspan=2,
@@ -608,12 +1304,34 @@ class App(tk.Tk):
         nb.add(profiling_tab, text="Browser Profiling")
 
         self._build_manual_tab(manual_tab.content)
-        self._build_auto_tab(auto_tab.content)
-        self._build_profiling_tab(profiling_tab.content)
+
+        # Auto and Profiling tabs are built the first time they are opened
+        self.notebook = nb
+        self._tab_builders = {
+            str(auto_tab): (auto_tab, self._build_auto_tab, "Semi Auto"),
+            str(profiling_tab): (profiling_tab, self._build_profiling_tab, "Browser Profiling"),
+        }
+        if self.lazy_tabs:
+            nb.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        else:
+            for key in list(self._tab_builders):
+                self._ensure_tab_built(key)
 
         bottom = ttk.Frame(outer)
         bottom.pack(fill="x")
-        ttk.Button(bottom, text="Exit", command=self.destroy).pack(side="right")
+        ttk.Button(bottom, text="Exit", command=self._on_close).pack(side="right")
+
+    def _on_tab_changed(self, event=None):
+        self._ensure_tab_built(self.notebook.select())
+
+    def _ensure_tab_built(self, key: str) -> None:
+        entry = self._tab_builders.pop(key, None)
+        if entry is None:
+            return
+        frame, builder, label = entry
+        t0 = time.perf_counter()
+        builder(frame.content)
+        STARTUP_PROFILER.add(f"build {label} tab (on first open)", time.perf_counter() - t0)
 
     def _build_manual_tab(self, parent):
         parent.columnconfigure(0, weight=1)
@@ -653,9 +1371,10 @@ class App(tk.Tk):
 
         btns = ttk.Frame(detect)
         btns.grid(row=1, column=0, sticky="w", padx=10, pady=(0, 10))
-        ttk.Button(btns, text="Detect", command=self.detect_manual).pack(side="left")
-        ttk.Button(btns, text="Apply Recomended Timezone (Sometimes Run as Admin Require)", command=self.apply_recommended_timezone).pack(side="left", padx=10)
-        ttk.Button(btns, text="Refresh Timezone", command=self.refresh_timezone).pack(side="left")
+        self._task_button("detect", ttk.Button(btns, text="Detect", command=self.detect_manual),
+                          cancellable=True).pack(side="left")
+        self._task_button("apply_tz", ttk.Button(btns, text="Apply Recomended Timezone (Sometimes Run as Admin Require)", command=self.apply_recommended_timezone)).pack(side="left", padx=10)
+        self._task_button("refresh_tz", ttk.Button(btns, text="Refresh Timezone", command=lambda: self.refresh_timezone(force=True))).pack(side="left")
 
         out = ttk.LabelFrame(parent, text="Results")
         out.grid(row=2, column=0, sticky="ew", padx=12, pady=6)
@@ -702,15 +1421,15 @@ class App(tk.Tk):
         cb = ttk.Combobox(mtz, textvariable=self.utc_offset_var, values=offsets, state="readonly", width=12)
         cb.grid(row=0, column=1, sticky="w", padx=(0, 10), pady=(10, 6))
 
-        ttk.Button(mtz, text="Search Timezone", command=self.manual_tz_pick_offset).grid(row=0, column=2, sticky="e", padx=10, pady=(10, 6))
+        self._task_button("tz_pick", ttk.Button(mtz, text="Search Timezone", command=self.manual_tz_pick_offset)).grid(row=0, column=2, sticky="e", padx=10, pady=(10, 6))
 
         ttk.Label(mtz, text="Selected Timezone:").grid(row=1, column=0, sticky="w", padx=10, pady=(0, 6))
         ttk.Label(mtz, textvariable=self.manual_win_tz_pick_var).grid(row=1, column=1, columnspan=2, sticky="w", padx=(0, 10), pady=(0, 6))
 
         mbtn = ttk.Frame(mtz)
         mbtn.grid(row=2, column=0, columnspan=3, sticky="w", padx=10, pady=(0, 10))
-        ttk.Button(mbtn, text="Apply Timezone (Sometimes Run as Admin Require)", command=self.manual_tz_apply_selected).pack(side="left")
-        ttk.Button(mbtn, text="Refresh Timezone", command=self.refresh_timezone).pack(side="left", padx=10)
+        self._task_button("apply_tz", ttk.Button(mbtn, text="Apply Timezone (Sometimes Run as Admin Require)", command=self.manual_tz_apply_selected)).pack(side="left")
+        self._task_button("refresh_tz", ttk.Button(mbtn, text="Refresh Timezone", command=lambda: self.refresh_timezone(force=True))).pack(side="left", padx=10)
 
     def _build_auto_tab(self, parent):
         parent.columnconfigure(0, weight=1)
@@ -726,8 +1445,12 @@ class App(tk.Tk):
         ttk.Radiobutton(src_row, text="Manual Source", value="provider",
                         variable=self.auto_proxy_source_var,
                         command=self.save_current_profile_config).pack(side="left", padx=10)
+        ttk.Radiobutton(src_row, text="Providers (concurrent)", value="providers",
+                        variable=self.auto_proxy_source_var,
+                        command=self.save_current_profile_config).pack(side="left")
 
-        ttk.Button(src_row, text="Generate From ProxyScrape", command=self.fetch_proxyscrape_into_text).pack(side="right")
+        self._task_button("fetch_proxyscrape", ttk.Button(src_row, text="Generate From ProxyScrape", command=self.fetch_proxyscrape_into_text),
+                          cancellable=True).pack(side="right")
 
         hint = ("Format Use:\n"
                 "  host:port\n"
@@ -742,13 +1465,72 @@ class App(tk.Tk):
         if self.cfg.get("auto_proxy_list"):
             self.auto_list_text.insert("1.0", self.cfg["auto_proxy_list"])
 
+        ttk.Label(top, text="Providers (one per line: proxyscrape, http(s):// URL, or path to .txt):").grid(
+            row=3, column=0, sticky="w", padx=10
+        )
+        self.auto_providers_text = tk.Text(top, height=3)
+        self.auto_providers_text.grid(row=4, column=0, sticky="ew", padx=10, pady=(4, 8))
+        self.auto_providers_text.insert("1.0", self.cfg.get("auto_providers", DEFAULT_PROVIDER_SPECS))
+
         ctl = ttk.Frame(top)
-        ctl.grid(row=3, column=0, sticky="ew", padx=10, pady=(0, 10))
+        ctl.grid(row=5, column=0, sticky="ew", padx=10, pady=(0, 10))
         ttk.Label(ctl, text="Timeout (second):").pack(side="left")
         ttk.Spinbox(ctl, from_=5, to=60, textvariable=self.auto_timeout_var, width=6).pack(side="left", padx=6)
         ttk.Checkbutton(ctl, text="Stop When Proxy is Alive", variable=self.auto_stop_first_var).pack(side="left", padx=12)
+        ttk.Checkbutton(ctl, text="Smart ordering", variable=self.auto_smart_order_var,
+                        command=self.save_current_profile_config).pack(side="left")
         ttk.Button(ctl, text="Load from file .txt", command=self.load_proxy_file).pack(side="right")
 
+        qual = ttk.Frame(top)
+        qual.grid(row=6, column=0, sticky="ew", padx=10, pady=(0, 10))
+        qual.columnconfigure(2, weight=1)
+        ttk.Checkbutton(qual, text="Measure throughput of alive proxies", variable=self.auto_throughput_var).grid(
+            row=0, column=0, sticky="w")
+        ttk.Label(qual, text="Payload URL:").grid(row=0, column=1, sticky="e", padx=(12, 4))
+        ttk.Entry(qual, textvariable=self.auto_throughput_url_var).grid(row=0, column=2, sticky="ew")
+        ttk.Label(qual, text="KB/proxy:").grid(row=0, column=3, padx=(8, 4))
+        ttk.Spinbox(qual, from_=16, to=10240, textvariable=self.auto_throughput_kb_var, width=6).grid(row=0, column=4)
+        ttk.Label(qual, text="Budget MB/run:").grid(row=0, column=5, padx=(8, 4))
+        ttk.Spinbox(qual, from_=1, to=10000, textvariable=self.auto_throughput_budget_var, width=6).grid(row=0, column=6)
+        lat = ttk.Frame(qual)
+        lat.grid(row=1, column=0, columnspan=7, sticky="w", pady=(6, 0))
+        ttk.Checkbutton(lat, text="Sample latency (rank by p95)", variable=self.auto_latency_sampling_var).pack(
+            side="left")
+        ttk.Label(lat, text="Samples/proxy:").pack(side="left", padx=(12, 4))
+        ttk.Spinbox(lat, from_=2, to=50, textvariable=self.auto_latency_samples_var, width=4).pack(side="left")
+        ttk.Checkbutton(lat, text="Collapse proxies sharing an exit IP (sample instead of re-testing)",
+                        variable=self.auto_exit_dedupe_var).pack(side="left", padx=(16, 0))
+        dist = ttk.Frame(qual)
+        dist.grid(row=2, column=0, columnspan=7, sticky="ew", pady=(6, 0))
+        dist.columnconfigure(7, weight=1)
+        ttk.Label(dist, text="Engine:").grid(row=0, column=0, padx=(0, 4))
+        ttk.Combobox(dist, textvariable=self.auto_engine_var, values=CHECK_ENGINES, state="readonly",
+                     width=9).grid(row=0, column=1)
+        ttk.Label(dist, text="Threads:").grid(row=0, column=2, padx=(12, 4))
+        ttk.Spinbox(dist, from_=0, to=2000, textvariable=self.auto_threads_var, width=5).grid(row=0, column=3)
+        ttk.Label(dist, text="Worker processes:").grid(row=0, column=4, padx=(12, 4))
+        ttk.Spinbox(dist, from_=0, to=64, textvariable=self.auto_processes_var, width=4).grid(row=0, column=5)
+        ttk.Label(dist, text="Remote nodes (host:port, ...):").grid(row=0, column=6, padx=(12, 4))
+        ttk.Entry(dist, textvariable=self.auto_nodes_var).grid(row=0, column=7, sticky="ew")
+        ttk.Label(dist, text="Token:").grid(row=0, column=8, padx=(8, 4))
+        ttk.Entry(dist, textvariable=self.auto_worker_token_var, show="*", width=12).grid(row=0, column=9)
+        ttk.Checkbutton(dist, text="Trace run", variable=self.auto_trace_var).grid(row=0, column=10, padx=(12, 0))
+        rel = ttk.Frame(qual)
+        rel.grid(row=3, column=0, columnspan=7, sticky="w", pady=(6, 0))
+        ttk.Label(rel, text="Retries (ReadTimeout / 5xx):").pack(side="left", padx=(0, 4))
+        ttk.Spinbox(rel, from_=0, to=5, textvariable=self.auto_retries_var, width=3).pack(side="left")
+        ttk.Checkbutton(rel, text="Skip hosts whose ports keep failing (circuit breaker)",
+                        variable=self.auto_host_breaker_var).pack(side="left", padx=(16, 0))
+        rank = ttk.Frame(qual)
+        rank.grid(row=4, column=0, columnspan=7, sticky="w", pady=(6, 0))
+        ttk.Checkbutton(rank, text="Keep only the top", variable=self.auto_topk_var).pack(side="left")
+        ttk.Spinbox(rank, from_=1, to=1000, textvariable=self.auto_topk_k_var, width=5).pack(side="left", padx=4)
+        ttk.Label(rank, text="by").pack(side="left")
+        ttk.Combobox(rank, textvariable=self.auto_topk_key_var, values=tuple(TOPK_KEYS), state="readonly",
+                     width=8).pack(side="left", padx=4)
+        ttk.Checkbutton(rank, text="and the top per country (other results are not kept; they only go to the journal)",
+                        variable=self.auto_topk_per_country_var).pack(side="left", padx=(8, 0))
+
         bar = ttk.Frame(parent)
         bar.grid(row=1, column=0, sticky="ew", padx=12, pady=6)
         bar.columnconfigure(0, weight=1)
@@ -761,43 +1543,82 @@ class App(tk.Tk):
         btns = ttk.Frame(bar)
         btns.grid(row=1, column=0, columnspan=2, sticky="w", pady=(8, 0))
         ttk.Button(btns, text="Check proxies", command=self.auto_test_proxies).pack(side="left")
+        self.auto_pause_btn = ttk.Button(btns, text="Pause", command=self.auto_toggle_pause, state="disabled")
+        self.auto_pause_btn.pack(side="left", padx=(10, 0))
+        self.auto_cancel_btn = ttk.Button(btns, text="Cancel", command=self.auto_cancel, state="disabled")
+        self.auto_cancel_btn.pack(side="left", padx=(6, 0))
         ttk.Button(btns, text="Use selected proxy (fill to manual settings)", command=self.use_selected_proxy).pack(side="left", padx=10)
         ttk.Button(btns, text="Launch Browser (selected proxy)", command=self.auto_launch_selected).pack(side="left", padx=10)
+        self._task_button("launch_best", ttk.Button(btns, text=f"Launch best (re-verify top {LAUNCH_RACE_TOP_K})",
+                                                    command=self.auto_launch_best), cancellable=True).pack(side="left")
+
+        pool = ttk.LabelFrame(bar, text="Warm pool (verified in background)")
+        pool.grid(row=2, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+        pool.columnconfigure(1, weight=1)
+        ttk.Label(pool, text="Source (proxyscrape or file):").grid(row=0, column=0, padx=(10, 4), pady=6)
+        ttk.Entry(pool, textvariable=self.warm_pool_source_var).grid(row=0, column=1, sticky="ew")
+        ttk.Label(pool, text="Size:").grid(row=0, column=2, padx=(8, 4))
+        ttk.Spinbox(pool, from_=1, to=500, textvariable=self.warm_pool_size_var, width=5).grid(row=0, column=3)
+        ttk.Label(pool, text="Countries (e.g. US,DE):").grid(row=0, column=4, padx=(8, 4))
+        ttk.Entry(pool, textvariable=self.warm_pool_countries_var, width=12).grid(row=0, column=5)
+        self.warm_pool_btn = ttk.Button(pool, text="Start pool", command=self.toggle_warm_pool)
+        self.warm_pool_btn.grid(row=0, column=6, padx=10)
+        ttk.Label(pool, textvariable=self.warm_pool_stats_var).grid(row=1, column=0, columnspan=7, sticky="w",
+                                                                    padx=10, pady=(0, 6))
+
+        qd = ttk.LabelFrame(bar, text="Query daemon (other tools lease verified proxies)")
+        qd.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(8, 0))
+        qd.columnconfigure(5, weight=1)
+        ttk.Label(qd, text="Listen (host:port or unix:/path):").grid(row=0, column=0, padx=(10, 4), pady=6)
+        ttk.Entry(qd, textvariable=self.query_daemon_listen_var, width=24).grid(row=0, column=1)
+        ttk.Label(qd, text="Token:").grid(row=0, column=2, padx=(8, 4))
+        ttk.Entry(qd, textvariable=self.query_daemon_token_var, show="*", width=12).grid(row=0, column=3)
+        self.query_daemon_btn = ttk.Button(qd, text="Start daemon", command=self.toggle_query_daemon)
+        self.query_daemon_btn.grid(row=0, column=4, padx=10)
+        ttk.Label(qd, textvariable=self.query_daemon_status_var).grid(row=0, column=5, sticky="w")
 
         table_frame = ttk.LabelFrame(parent, text="Results Proxy (ALIVE)")
         table_frame.grid(row=2, column=0, sticky="ew", padx=12, pady=6)
         table_frame.columnconfigure(0, weight=1)
 
-        cols = ("proxy", "status", "latency_ms", "ip", "country", "IP_timezone", "WIN_timezone")
-        self.tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=10)
-        for c in cols:
-            self.tree.heading(c, text=c)
-
-        self.tree.column("proxy", width=220)
-        self.tree.column("status", width=70)
-        self.tree.column("latency_ms", width=90)
-        self.tree.column("ip", width=150)
-        self.tree.column("country", width=70)
-        self.tree.column("IP_timezone", width=170)
-        self.tree.column("WIN_timezone", width=220)
-
-        yscroll = ttk.Scrollbar(table_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=yscroll.set)
-
-        self.tree.grid(row=0, column=0, sticky="ew", padx=(10, 0), pady=10)
-        yscroll.grid(row=0, column=1, sticky="ns", padx=(0, 10), pady=10)
+        filt = ttk.Frame(table_frame)
+        filt.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
+        filt.columnconfigure(1, weight=1)
+        ttk.Label(filt, text="Filter (e.g. country == US, latency < 500):").grid(row=0, column=0, sticky="w")
+        filter_entry = ttk.Entry(filt, textvariable=self.auto_filter_var)
+        filter_entry.grid(row=0, column=1, sticky="ew", padx=8)
+        filter_entry.bind("<Return>", lambda e: self.apply_results_filter())
+        ttk.Button(filt, text="Apply", command=self.apply_results_filter).grid(row=0, column=2)
+        ttk.Button(filt, text="Clear", command=self.clear_results_filter).grid(row=0, column=3, padx=(8, 0))
+        ttk.Label(filt, textvariable=self.auto_rows_var).grid(row=0, column=4, padx=(8, 0))
+
+        self.results_table = VirtualResultsTable(table_frame, height=10)
+        self.results_table.grid(row=1, column=0, sticky="ew", padx=10, pady=10)
+        self.tree = self.results_table.tree
 
         log_frame = ttk.LabelFrame(parent, text="Checking Process (realtime)")
         log_frame.grid(row=3, column=0, sticky="ew", padx=12, pady=(6, 20))
         log_frame.columnconfigure(0, weight=1)
 
+        log_ctl = ttk.Frame(log_frame)
+        log_ctl.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(10, 0))
+        ttk.Label(log_ctl, text="Show level:").pack(side="left")
+        level_cb = ttk.Combobox(log_ctl, textvariable=self.auto_log_level_var, values=AUTO_LOG_LEVELS,
+                                state="readonly", width=10)
+        level_cb.pack(side="left", padx=6)
+        level_cb.bind("<<ComboboxSelected>>", lambda e: self.on_auto_log_level_changed())
+        ttk.Label(log_ctl, text=f"(last {AUTO_LOG_MAX_LINES} lines; full log in profile folder: {AUTO_LOG_FILENAME})").pack(
+            side="left", padx=6
+        )
+
         self.auto_log = tk.Text(log_frame, height=10)
         log_scroll = ttk.Scrollbar(log_frame, orient="vertical", command=self.auto_log.yview)
         self.auto_log.configure(yscrollcommand=log_scroll.set)
 
-        self.auto_log.grid(row=0, column=0, sticky="ew", padx=(10, 0), pady=10)
-        log_scroll.grid(row=0, column=1, sticky="ns", padx=(0, 10), pady=10)
+        self.auto_log.grid(row=1, column=0, sticky="ew", padx=(10, 0), pady=10)
+        log_scroll.grid(row=1, column=1, sticky="ns", padx=(0, 10), pady=10)
         self.auto_log.configure(state="disabled")
+        self._render_auto_log_ring()
 
     def _build_profiling_tab(self, parent):
         parent.columnconfigure(0, weight=1)
@@ -819,32 +1640,73 @@ class App(tk.Tk):
             )
         ).grid(row=1, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 10))
 
+        ttk.Label(info, text="Profiles (Ctrl/Shift-click for several):").grid(row=2, column=0, sticky="nw", padx=10)
+        self.profiling_profiles_list = tk.Listbox(info, selectmode="extended", height=5, exportselection=False)
+        self.profiling_profiles_list.grid(row=2, column=1, sticky="ew", padx=(0, 10), pady=(0, 6))
+        self.refresh_profiling_profiles()
+
+        opts = ttk.Frame(info)
+        opts.grid(row=3, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 10))
+        ttk.Label(opts, text="Parallel pages:").pack(side="left")
+        ttk.Spinbox(opts, from_=1, to=32, textvariable=self.profiling_concurrency_var, width=4).pack(side="left", padx=6)
+        ttk.Label(opts, text="Pages per profile:").pack(side="left", padx=(10, 0))
+        ttk.Spinbox(opts, from_=1, to=8, textvariable=self.profiling_pages_var, width=4).pack(side="left", padx=6)
+        ttk.Checkbutton(opts, text="Block images/media/fonts", variable=self.profiling_block_heavy_var).pack(
+            side="left", padx=10)
+        ttk.Checkbutton(opts, text="Headless", variable=self.profiling_headless_var).pack(side="left")
+
         controls = ttk.Frame(info)
-        controls.grid(row=2, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 10))
+        controls.grid(row=4, column=0, columnspan=2, sticky="w", padx=10, pady=(0, 10))
         self.profiling_start_btn = ttk.Button(
             controls,
             text="Start Browser Profiling",
             command=self.start_browser_profiling
         )
         self.profiling_start_btn.pack(side="left")
+        self.profiling_stop_btn = ttk.Button(controls, text="Stop", command=self.stop_browser_profiling,
+                                             state="disabled")
+        self.profiling_stop_btn.pack(side="left", padx=(8, 0))
         ttk.Label(controls, textvariable=self.profiling_status_var).pack(side="left", padx=12)
+
+    def refresh_profiling_profiles(self):
+        if not hasattr(self, "profiling_profiles_list"):
+            return
+        lb = self.profiling_profiles_list
+        lb.delete(0, "end")
+        active = os.path.basename(os.path.normpath(self.profile_dir_var.get().strip() or self.active_profile_dir))
+        for i, name in enumerate(self.all_profile_names):
+            lb.insert("end", name)
+            if name == active:
+                lb.selection_set(i)
+
+    def _selected_profiling_dirs(self) -> list[str]:
+        dirs = []
+        if hasattr(self, "profiling_profiles_list"):
+            for i in self.profiling_profiles_list.curselection():
+                dirs.append(os.path.join(profiles_root_dir(), self.profiling_profiles_list.get(i)))
+        if not dirs:
+            dirs.append(self.profile_dir_var.get().strip() or self.active_profile_dir)
+        return dirs
 
     # ===== Auto: fetch provider =====
     def fetch_proxyscrape_into_text(self):
+        if self.tasks.cancel("fetch_proxyscrape"):
+            self.auto_status_var.set("Ready.")
+            return
         self.auto_status_var.set("Fetch...")
-        self.update_idletasks()
 
-        ok, lines, err = fetch_proxyscrape_list(timeout_s=20)
-        if not ok:
-            messagebox.showerror("Failed", f"Failed fetch ProxyScrape: {err}")
+        def done(res):
+            ok, lines, err = res
             self.auto_status_var.set("Ready.")
-            return
+            if not ok:
+                messagebox.showerror("Failed", f"Failed fetch ProxyScrape: {err}")
+                return
+            self.auto_list_text.delete("1.0", "end")
+            self.auto_list_text.insert("1.0", "\n".join(lines) + ("\n" if lines else ""))
+            self.save_current_profile_config()
+            messagebox.showinfo("OK", f"Fetch {len(lines)} proxy from ProxyScrape.\n")
 
-        self.auto_list_text.delete("1.0", "end")
-        self.auto_list_text.insert("1.0", "\n".join(lines) + ("\n" if lines else ""))
-        self.save_current_profile_config()
-        messagebox.showinfo("OK", f"Fetch {len(lines)} proxy from ProxyScrape.\n")
-        self.auto_status_var.set("Ready.")
+        self.tasks.submit("fetch_proxyscrape", fetch_proxyscrape_list, timeout_s=20, on_done=done)
 
     # ===== Manual tz by offset =====
     def _parse_offset_string_to_minutes(self, s: str) -> int | None:
@@ -875,22 +1737,25 @@ class App(tk.Tk):
             messagebox.showerror("Error", "Format offset invalid.")
             return
 
-        cands = windows_tz_candidates_by_offset(off_min)
-        if not cands:
-            self.manual_win_tz_pick_var.set("(no match)")
-            messagebox.showwarning("None", "None Windows with current timezone")
-            return
+        def done(cands):
+            if not cands:
+                self.manual_win_tz_pick_var.set("(no match)")
+                messagebox.showwarning("None", "None Windows with current timezone")
+                return
 
-        pick = None
-        for it in cands:
-            if it["id"].upper().startswith("UTC") or "COORDINATED UNIVERSAL TIME" in (it["display"] or "").upper():
-                pick = it
-                break
-        if pick is None:
-            pick = cands[0]
+            pick = None
+            for it in cands:
+                if it["id"].upper().startswith("UTC") or "COORDINATED UNIVERSAL TIME" in (it["display"] or "").upper():
+                    pick = it
+                    break
+            if pick is None:
+                pick = cands[0]
 
-        self.manual_win_tz_pick_var.set(pick["id"])
-        self.check_mismatch()
+            self.manual_win_tz_pick_var.set(pick["id"])
+            self.check_mismatch()
+
+        # first call runs tzutil /l
+        self.tasks.submit("tz_pick", windows_tz_candidates_by_offset, off_min, on_done=done)
 
     def manual_tz_apply_selected(self):
         tzid = (self.manual_win_tz_pick_var.get() or "").strip()
@@ -898,24 +1763,25 @@ class App(tk.Tk):
             messagebox.showwarning("Not Selected", "Please Hit Search Timezone First")
             return
 
-        cur = get_current_tz() or "-"
-        if cur == tzid:
-            self.refresh_timezone()
-            self.check_mismatch()
-            messagebox.showinfo("OK", "Timezone Windows OK")
-            return
+        def applied(res):
+            ok2, msg = res
+            if ok2:
+                self.refresh_timezone()
+                messagebox.showinfo("Success", "Timezone changed succesfully")
+            else:
+                messagebox.showerror("Gagal", msg)
 
-        ok = messagebox.askyesno("Confirm", f"Change Windows Timezone from:\n{cur}\n\nto:\n{tzid}\n\nNext?")
-        if not ok:
-            return
+        def got_current(cur):
+            cur = cur or "-"
+            self._show_system_tz(cur)
+            if cur == tzid:
+                messagebox.showinfo("OK", "Timezone Windows OK")
+                return
+            ok = messagebox.askyesno("Confirm", f"Change Windows Timezone from:\n{cur}\n\nto:\n{tzid}\n\nNext?")
+            if ok:
+                self.tasks.submit("apply_tz", set_windows_timezone, tzid, on_done=applied)
 
-        ok2, msg = set_windows_timezone(tzid)
-        if ok2:
-            self.refresh_timezone()
-            self.check_mismatch()
-            messagebox.showinfo("Success", "Timezone changed succesfully")
-        else:
-            messagebox.showerror("Gagal", msg)
+        self.tasks.submit("apply_tz", TZ_SERVICE.current, True, on_done=got_current)
 
     # ===== Auto helpers =====
     def load_proxy_file(self):
@@ -931,21 +1797,114 @@ class App(tk.Tk):
         self.auto_list_text.insert("1.0", content)
         self.save_current_profile_config()
 
+    def remove_result_row(self, rec):
+        self.results_table.remove(rec)
+        self.auto_rows_var.set(f"{self.results_table.row_count()} rows")
+
     def clear_tree(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.results_table.clear()
+        self.auto_rows_var.set("0 rows")
 
-    def log_auto(self, msg: str):
+    def add_result_row(self, rec):
+        self.results_table.append(rec)
+        self.auto_rows_var.set(f"{self.results_table.row_count()} rows")
+
+    def apply_results_filter(self):
+        try:
+            self.results_table.set_filter_expr(self.auto_filter_var.get())
+        except ValueError as e:
+            messagebox.showerror("Filter", str(e))
+            return
+        self.auto_rows_var.set(f"{self.results_table.row_count()} rows")
+
+    def clear_results_filter(self):
+        self.auto_filter_var.set("")
+        self.apply_results_filter()
+
+    def log_auto(self, msg: str, level: int = logging.INFO):
+        """Safe from any thread: file log now, on-screen log in batches on the Tk thread."""
+        logger = self._auto_file_logger
+        if logger is not None:
+            logger.log(level, msg)
+        self._auto_log_pending.append((level, msg))
+        if not self._auto_log_flush_scheduled:
+            self._auto_log_flush_scheduled = True
+            self.after(100, traced("ui: log flush", self._flush_auto_log))
+
+    def _auto_log_min_level(self) -> int:
+        return logging.getLevelName(self.auto_log_level_var.get() or AUTO_LOG_DEFAULT_LEVEL)
+
+    def _flush_auto_log(self):
+        self._auto_log_flush_scheduled = False
+        if not self._auto_log_pending:
+            return
+        min_level = self._auto_log_min_level()
+        shown = []
+        while self._auto_log_pending:
+            level, msg = self._auto_log_pending.popleft()
+            self.auto_log_ring.append((level, msg))
+            if level >= min_level:
+                shown.append(msg)
+        if not shown or self.auto_log is None:
+            return
+
+        shown = shown[-AUTO_LOG_MAX_LINES:]
+        self.auto_log.configure(state="normal")
+        self.auto_log.insert("end", "\n".join(shown) + "\n")
+        line_count = int(self.auto_log.index("end-1c").split(".")[0]) - 1
+        excess = line_count - AUTO_LOG_MAX_LINES
+        if excess > 0:
+            self.auto_log.delete("1.0", f"{excess + 1}.0")
+        self.auto_log.see("end")
+        self.auto_log.configure(state="disabled")
+
+    def _render_auto_log_ring(self):
+        if self.auto_log is None:
+            return
+        min_level = self._auto_log_min_level()
+        lines = [msg for level, msg in self.auto_log_ring if level >= min_level]
         self.auto_log.configure(state="normal")
-        self.auto_log.insert("end", msg + "\n")
+        self.auto_log.delete("1.0", "end")
+        if lines:
+            self.auto_log.insert("end", "\n".join(lines) + "\n")
         self.auto_log.see("end")
         self.auto_log.configure(state="disabled")
 
-    def refresh_timezone(self):
-        self.tz_current_var.set(get_current_tz() or "-")
+    def on_auto_log_level_changed(self):
+        self._render_auto_log_ring()
+        self.save_current_profile_config()
 
-    def check_mismatch(self):
-        cur = (get_current_tz() or "-").strip()
+    def clear_auto_log(self):
+        self._auto_log_pending.clear()
+        self.auto_log_ring.clear()
+        if self.auto_log is not None:
+            self.auto_log.configure(state="normal")
+            self.auto_log.delete("1.0", "end")
+            self.auto_log.configure(state="disabled")
+
+    def refresh_timezone(self, force: bool = False):
+        """Show the system timezone; a backend read (tzutil) only happens on the task pool."""
+        cached = TZ_SERVICE.cached()
+        if cached is not None and not force:
+            self._show_system_tz(cached)
+            return
+        self.tasks.submit("refresh_tz", TZ_SERVICE.current, force, on_done=self._show_system_tz)
+
+    def _show_system_tz(self, tz_id: str):
+        self.tz_current_var.set(tz_id or "-")
+        self.check_mismatch(tz_id or "-")
+
+    def _on_system_tz_changed(self, tz_id: str):
+        self._show_system_tz(tz_id)
+
+    def check_mismatch(self, cur: str | None = None):
+        if cur is None:
+            cur = TZ_SERVICE.cached()
+            if cur is None:
+                # not read yet: refresh_timezone() calls back here once it is known
+                self.refresh_timezone()
+                return
+        cur = (cur or "-").strip()
         reco = (self.tz_windows_reco_var.get() or "-").strip()
         if reco in ("-", "", "(no map)"):
             self.mismatch_var.set("(No recomended timezone)")
@@ -959,29 +1918,27 @@ class App(tk.Tk):
         if remaining_lines:
             self.auto_list_text.insert("1.0", "\n".join(remaining_lines).rstrip() + "\n")
 
-    def _get_lines_for_testing(self) -> list[str]:
+    def _get_candidate_sources(self) -> tuple[list[str], list[dict]]:
         """
-        Decide proxy lines source:
+        Decide proxy sources:
         - provider: from textbox as-is
-        - proxyscrape: if textbox empty, fetch automatically; else use textbox content
+        - proxyscrape: textbox content, or stream ProxyScrape if textbox is empty
+        - providers: textbox content plus every registered provider, fetched concurrently
         """
         source = self.auto_proxy_source_var.get().strip()
         current = [ln.strip() for ln in self.auto_list_text.get("1.0", "end").splitlines() if ln.strip()]
 
         if source == "proxyscrape":
-            # If user hasn't fetched yet (textbox empty), auto-fetch now.
             if not current:
-                ok, lines, err = fetch_proxyscrape_list(timeout_s=20)
-                if not ok:
-                    raise RuntimeError(f"Failed fetch ProxyScrape: {err}")
-                self.auto_list_text.delete("1.0", "end")
-                self.auto_list_text.insert("1.0", "\n".join(lines) + ("\n" if lines else ""))
-                self.save_current_profile_config()
-                return lines
-            return current
+                return [], parse_provider_specs(PROVIDER_PROXYSCRAPE)
+            return current, []
+
+        if source == "providers":
+            providers = parse_provider_specs(self.auto_providers_text.get("1.0", "end"))
+            return current, providers
 
         # provider
-        return current
+        return current, []
 
     def auto_test_proxies(self):
         if ZoneInfo is None:
@@ -993,191 +1950,532 @@ class App(tk.Tk):
             return
 
         try:
-            original_lines = self._get_lines_for_testing()
+            original_lines, providers = self._get_candidate_sources()
         except Exception as e:
             messagebox.showerror("Failed", str(e))
             return
 
-        candidates = []
-        for idx, line in enumerate(original_lines):
-            p = parse_proxy_line(line)
-            if p:
-                candidates.append((idx, line, p))
-
-        if not candidates:
+        if not providers and not any(parse_proxy_line(ln) for ln in original_lines):
             messagebox.showwarning("List empty", "Fill list first")
             return
 
         timeout_s = int(self.auto_timeout_var.get())
         stop_first = bool(self.auto_stop_first_var.get())
+        smart_order = bool(self.auto_smart_order_var.get())
+        latency_samples = max(2, int(self.auto_latency_samples_var.get())) if self.auto_latency_sampling_var.get() else 0
+        throughput = bool(self.auto_throughput_var.get())
+        throughput_url = self.auto_throughput_url_var.get().strip() or THROUGHPUT_DEFAULT_URL
+        throughput_bytes = max(1, int(self.auto_throughput_kb_var.get())) * 1024
+        byte_budget = ByteBudget(max(0, int(self.auto_throughput_budget_var.get())) * 1024 * 1024)
+        threads = max(0, int(self.auto_threads_var.get()))
+        processes = max(0, int(self.auto_processes_var.get()))
+        nodes = parse_node_list(self.auto_nodes_var.get())
+        worker_token = self.auto_worker_token_var.get()
+        exit_index = ExitIpIndex() if self.auto_exit_dedupe_var.get() else None
+        check_opts = {"timeout_s": timeout_s, "latency_samples": latency_samples, "engine": self.auto_engine_var.get(),
+                      "throughput_url": throughput_url, "throughput_bytes": throughput_bytes if throughput else 0,
+                      "retries": max(0, int(self.auto_retries_var.get())),
+                      "breaker": bool(self.auto_host_breaker_var.get())}
+
+        profile_dir = self.profile_dir_var.get().strip() or self.active_profile_dir
+        ensure_dir(profile_dir)
+        journal = RunJournal(profile_dir)
+        resumed = []
+        previous = journal.load()
+        if previous is not None:
+            header, done = previous
+            started = datetime.fromtimestamp(header.get("started", 0)).strftime("%Y-%m-%d %H:%M")
+            if messagebox.askyesno(
+                "Resume",
+                f"Unfinished run from {started} ({len(done)} proxies tested).\n\n"
+                "Resume it and skip proxies already tested?\n(No = start over)"
+            ):
+                resumed = done
+            else:
+                journal.discard()
 
         self.clear_tree()
-        self.auto_results = []
+        self.auto_results.clear()
+        if latency_samples:
+            self.results_table.set_sort("p95_ms")
+        elif throughput:
+            self.results_table.set_sort("kbps", desc=True)
+        ranking = None
+        if self.auto_topk_var.get():
+            ranking = TopKRanking(self.auto_topk_k_var.get(), self.auto_topk_key_var.get(),
+                                  bool(self.auto_topk_per_country_var.get()))
+            self.results_table.set_sort(ranking.attr, desc=ranking.desc)
         self.auto_progress_var.set(0)
         self.auto_status_var.set("Mulai")
 
-        self.auto_log.configure(state="normal")
-        self.auto_log.delete("1.0", "end")
-        self.auto_log.configure(state="disabled")
+        self.clear_auto_log()
+        self._auto_file_logger = get_auto_file_logger(profile_dir)
+
+        trace = bool(self.auto_trace_var.get())
+        if trace:
+            TRACER.start()
+            self.log_auto(f"Tracing this run -> {os.path.join(profile_dir, TRACE_DIRNAME)}")
 
         self.auto_is_running = True
-        get_tzutil_items_cached()
+        self.auto_cancel_event.clear()
+        self.auto_resume_event.set()
+        self.auto_pause_btn.configure(state="normal", text="Pause")
+        self.auto_cancel_btn.configure(state="normal")
+
+        def rank_admit(rec, exit_rows=None) -> bool:
+            """Top-k mode: offer an alive record; whatever it pushes out leaves the store, index and table."""
+            kept, dropped = ranking.offer(rec)
+            for old in dropped:
+                self.auto_results.remove(old)
+                self.proxy_index.remove(old.key)
+                self.after(0, lambda r=old: self.remove_result_row(r))
+                if exit_rows is not None and exit_rows.get(old.ip) is old:
+                    del exit_rows[old.ip]
+            return kept
+
+        self.proxy_index.replace_origin("run", (d for _, d in resumed) if ranking is None else ())
+        for _, rec_dict in resumed:
+            rec = self.auto_results.add_dict(rec_dict)
+            if ranking is not None and not (rec.ok and rank_admit(rec)):
+                self.auto_results.remove(rec)
+            elif rec.ok:
+                if ranking is not None:
+                    self.proxy_index.upsert(rec_dict, "run")
+                self.add_result_row(rec)
+
+        def ui_log(s: str, level: int = logging.INFO):
+            self.log_auto(s, level)
+
+        def ui_row(rec):
+            self.after(0, traced("ui: add row", lambda: self.add_result_row(rec)))
 
-        def ui_log(s: str):
-            self.after(0, lambda: self.log_auto(s))
+        def ui_prog(pct: int, text: str):
+            self.after(0, traced("ui: progress",
+                                 lambda: (self.auto_progress_var.set(pct), self.auto_status_var.set(text))))
 
-        def ui_row(vals):
-            self.after(0, lambda: self.tree.insert("", "end", values=vals))
+        tested_line_indexes = set()  # textbox lines handled this run; bounded by the textbox itself
+        remaining_due = threading.Event()
 
-        def ui_prog(pct: int, text: str):
-            self.after(0, lambda: (self.auto_progress_var.set(pct), self.auto_status_var.set(text)))
+        def refresh_remaining():
+            remaining_due.clear()
+            self._auto_set_remaining_list([ln for i, ln in enumerate(original_lines) if i not in tested_line_indexes])
+
+        def line_done(line_idx):
+            # rebuilding the textbox is O(lines); batch it instead of redrawing once per result
+            if line_idx is None:
+                return
+            tested_line_indexes.add(line_idx)
+            if not remaining_due.is_set():
+                remaining_due.set()
+                self.after(AUTO_REMAINING_REFRESH_MS, traced("ui: remaining list", refresh_remaining))
+
+        # lines the feed drops (resumed, duplicate, collapsed, unresolved) leave the textbox too
+        feed = CandidateFeed(CandidateScheduler() if smart_order else FifoOrder(), resolver=DNS_RESOLVER,
+                             on_drop=line_done)
+        feed.preload_seen(key for key, _ in resumed)
+        feed.open_sources(1 + len(providers))
+        for idx, line in enumerate(original_lines):
+            feed.put_line(line, PROVIDER_TEXTBOX, line_idx=idx)
+        feed.close_source()
+        start_provider_fetch(providers, feed, timeout_s=20, on_log=ui_log)
+        self._auto_feed = feed
 
-        def ui_replace_remaining(remaining):
-            self.after(0, lambda: self._auto_set_remaining_list(remaining))
+        journal.begin({"source": self.auto_proxy_source_var.get(), "providers": [p["target"] for p in providers]},
+                      resumed)
+
+        cancel_event = self.auto_cancel_event
+        resume_event = self.auto_resume_event
 
         def worker():
-            total = len(candidates)
-            ui_log(f"starting test {total} proxy (timeout={timeout_s}s, stop_first={stop_first}, source={self.auto_proxy_source_var.get()})")
-
-            tested_line_indexes = set()
-
-            for seq, (line_idx, line_text, p) in enumerate(candidates, start=1):
-                host, port, user, pwd = p["host"], p["port"], p["user"], p["pass"]
-                show_proxy = f"{host}:{port}"
-                ui_log(f"[{seq}/{total}] {show_proxy} - checking...")
-
-                t0 = time.time()
-                status = "FAIL"
-                ip = "-"
-                cc = "-"
-                iana_tz = "-"
-                win_tz = "-"
-                err = ""
-
-                proxies = build_requests_proxies(host, port, user, pwd)
-                code, info, err = ipinfo_request(proxies=proxies, timeout_s=timeout_s)
-                latency_ms = int((time.time() - t0) * 1000)
-
-                tested_line_indexes.add(line_idx)
-
-                if code == 200:
-                    status = "OK"
-                    ip = info.get("ip", "-")
-                    cc = info.get("country", "-")
-                    iana_tz = info.get("timezone", "-")
-                    win_tz = iana_to_windows_best(iana_tz)
-
-                proxy_show = show_proxy + (":***" if user else "")
-                rec = {
-                    "host": host, "port": port, "user": user, "pass": pwd,
-                    "proxy_show": proxy_show,
-                    "status": status,
-                    "latency_ms": latency_ms,
-                    "ip": ip, "country": cc,
-                    "iana_tz": iana_tz,
-                    "win_tz": win_tz,
-                    "error": err,
-                    "source_line": line_text,
-                }
-                self.auto_results.append(rec)
-
-                if status == "OK":
-                    ui_row((proxy_show, status, latency_ms, ip, cc, iana_tz, win_tz))
-                    ui_log(f"{show_proxy} - OK(200) - {cc} - {iana_tz} -> {win_tz} - {latency_ms}ms")
+            try:
+                get_tzutil_items_cached()
+            except Exception:
+                pass
+            ui_log(f"starting test (timeout={timeout_s}s, stop_first={stop_first}, smart_order={smart_order}, "
+                   f"source={self.auto_proxy_source_var.get()}, providers={len(providers)}, "
+                   f"engine={check_opts['engine']}, threads={threads}, processes={processes}, nodes={len(nodes)})")
+            if resumed:
+                ui_log(f"Resumed run: skipping {len(resumed)} proxies already tested")
+
+            done_keys = set()
+            clock = AliveClock()
+            lock = threading.Lock()
+            state = {"started": 0, "done": 0, "found_first": False, "collapsed": 0}
+            exit_rows = {}  # exit ip -> the table record the duplicates are counted on
+
+            def pre_check(item):
+                exit_ip = exit_index.sample(item[2]) if exit_index is not None else None
+                if exit_ip is None:
+                    return None
+                return dict(failed_check_result(item[2], ""), status=EXIT_DUP_STATUS, ip=exit_ip)
+
+            def on_start(item):
+                p = item[2]
+                with lock:
+                    state["started"] += 1
+                    n = state["started"]
+                # total keeps growing while providers are still streaming
+                total_show = f"{feed.accepted}" if feed.finished else f"{feed.accepted}+"
+                ui_log(f"[{n}/{total_show}] {p['host']}:{p['port']} - checking...", logging.DEBUG)
+
+            def on_result(item, res):
+                line_idx, _, p = item
+                key = proxy_dedupe_key(p)
+                ok = res["status"] == "OK"
+                sampled = res["status"] == EXIT_DUP_STATUS
+                skipped = res["error"] == CHECK_BREAKER_ERROR
+                with lock:
+                    # a re-queued proxy can come back from two lanes; keep the first answer
+                    if key in done_keys:
+                        return
+                    done_keys.add(key)
+                    state["done"] += 1
+                    done = state["done"]
+                    if not (sampled or skipped):
+                        feed.record_result(p, ok, res["error"])
+                        clock.record(ok)
+                    rec = self.auto_results.add_dict(res)
+                    canonical = None
+                    if sampled or (ok and exit_index is not None and exit_index.record(p, rec.ip)):
+                        canonical = exit_rows.get(rec.ip)
+                        if canonical is not None:
+                            canonical.dups += 1
+                            state["collapsed"] += 1
+                    elif ok:
+                        exit_rows.setdefault(rec.ip, rec)
+                    if not (sampled or skipped):
+                        # exit-IP samples and breaker skips were never checked; a resume retries them
+                        journal.record(key, self.auto_results.to_dict(rec))
+                    shown = ok and canonical is None
+                    if ranking is not None:
+                        # only ranked records stay in memory; the journal above has every final result
+                        if shown:
+                            shown = rank_admit(rec, exit_rows)
+                        if not shown:
+                            self.auto_results.remove(rec)
+                            if exit_rows.get(rec.ip) is rec:
+                                del exit_rows[rec.ip]
+                    if shown:
+                        self.proxy_index.upsert(res, "run")
+                        ui_row(rec)
+                    first_alive = ok and stop_first and not state["found_first"]
+                    if first_alive:
+                        state["found_first"] = True
+
+                show_proxy = f"{rec.host}:{rec.port}"
+                if canonical is not None:
+                    self.after(0, traced("ui: schedule render", self.results_table.schedule_render))
+                    ui_log(f"{show_proxy} - same exit IP as {canonical.hostport} ({rec.ip})"
+                           f"{'' if sampled else f' - OK(200) - {rec.latency_ms}ms'}", logging.DEBUG)
+                elif sampled:
+                    ui_log(f"{show_proxy} - exit {rec.ip} already known, not checked", logging.DEBUG)
+                elif skipped:
+                    ui_log(f"{show_proxy} - host keeps failing (circuit breaker open), not checked", logging.DEBUG)
+                elif ok:
+                    speed = f" - {rec.kbps} KB/s (ttfb {rec.ttfb_ms}ms)" if rec.kbps is not None else ""
+                    if rec.p95_ms is not None:
+                        speed = f" - p50 {rec.p50_ms}ms p95 {rec.p95_ms}ms jitter {rec.jitter_ms}ms" + speed
+                    ui_log(f"{show_proxy} - OK(200) - {rec.country} - {rec.iana_tz} -> {rec.win_tz} - "
+                           f"{rec.latency_ms}ms{speed}")
+                    if res.get("tp_error"):
+                        ui_log(f"{show_proxy} - throughput ERROR({res['tp_error']})", logging.DEBUG)
                 else:
-                    ui_log(f"{show_proxy} - ERROR({err or 'Unknown'}) - {latency_ms}ms")
-
-                pct = int((seq / total) * 100)
-                ui_prog(pct, f"{pct}%")
+                    ui_log(f"{show_proxy} - ERROR({rec.error or 'Unknown'}) - {rec.latency_ms}ms", logging.DEBUG)
 
-                remaining_lines = [ln for i, ln in enumerate(original_lines) if i not in tested_line_indexes]
-                ui_replace_remaining(remaining_lines)
+                pct = int((done / max(feed.accepted, 1)) * 100)
+                if not feed.finished:
+                    pct = min(pct, 99)
+                ui_prog(min(pct, 100), f"{min(pct, 100)}%")
+                line_done(line_idx)
 
-                if stop_first and status == "OK":
+                if first_alive:
                     ui_log("Found Alive Proxy")
-                    break
+                    feed.stop()
+
+            lane_counts = {}
+            error = None
+            try:
+                lane_counts = run_check_lanes(
+                    feed, check_opts, on_result, on_start=on_start, threads=threads, processes=processes,
+                    nodes=nodes, token=worker_token, budget=byte_budget if throughput else None, pre_check=pre_check,
+                    cancel_event=cancel_event, resume_event=resume_event, on_log=ui_log)
+            except Exception as e:
+                # a lane or pool failure must still release the UI below
+                error = f"{type(e).__name__}: {e}"
+                ui_log(f"Run stopped by an error: {error}", logging.ERROR)
+            finally:
+                cancelled = cancel_event.is_set()
+                feed.stop()
+                journal.close(completed=not cancelled and error is None)
+
+            try:
+                if feed.duplicates:
+                    ui_log(f"Skipped {feed.duplicates} duplicate proxies across sources")
+                if feed.collapsed or feed.unresolved:
+                    ui_log(f"DNS: {feed.collapsed} hostnames collapsed onto an already queued ip:port, "
+                           f"{feed.unresolved} unresolved")
+                ui_log(clock.summary())
+                if exit_index is not None and (exit_index.sampled or state["collapsed"]):
+                    ui_log(f"Exit-IP dedupe: {exit_index.sampled} proxies not checked (known exit), "
+                           f"{state['collapsed']} collapsed onto {len(exit_rows)} exit IPs")
+                if ranking is not None:
+                    ui_log(f"Top-{ranking.k} by {ranking.key}"
+                           f"{' (overall and per country)' if ranking.per_country else ''}: "
+                           f"kept {len(ranking)} of {ranking.offered} alive proxies")
+                if len(lane_counts) > 1 or processes or nodes:
+                    ui_log("Checked per lane: " + ", ".join(f"{k}={v}" for k, v in lane_counts.items()))
+                if throughput:
+                    ui_log(f"Throughput probes used {byte_budget.used // 1024} KB "
+                           f"of {byte_budget.limit // 1024} KB budget")
+
+                if error is not None:
+                    ui_prog(self.auto_progress_var.get(), "Failed")
+                    ui_log(f"Stopped after {state['done']} proxies. Progress saved; next run can resume.",
+                           logging.WARNING)
+                elif cancelled:
+                    ui_prog(self.auto_progress_var.get(), "Cancelled")
+                    ui_log(f"Cancelled after {state['done']} proxies. Progress saved; next run can resume.",
+                           logging.WARNING)
+                else:
+                    ui_prog(100, "Done")
+                    ui_log("Done." if not state["found_first"] else "Done (stopped at first alive).")
+            finally:
+                flush_auto_file_logger(self._auto_file_logger)
+                if original_lines:
+                    self.after(0, refresh_remaining)
+                self.after(0, lambda: self._auto_run_finished(cancelled, profile_dir if trace else None, error))
 
-            ui_prog(100, "Done")
-            ui_log("Done.")
+        def traced_worker():
+            with TRACER.profile_thread():
+                worker()
+
+        threading.Thread(target=traced_worker, daemon=True).start()
+
+    def _auto_run_finished(self, cancelled: bool, trace_dir_parent: str | None = None, error: str | None = None):
         self.auto_is_running = False
-        self.after(0, lambda: messagebox.showinfo(
-            "Done",
-            "Testing Done.\n- Table will show Alive Proxy"
-        ))
-        self.after(0, self.save_current_profile_config)
+        self.auto_pause_btn.configure(state="disabled", text="Pause")
+        self.auto_cancel_btn.configure(state="disabled")
+        self.save_current_profile_config()
+        if trace_dir_parent is not None:
+            self._write_run_trace(TRACER.stop(), os.path.join(trace_dir_parent, TRACE_DIRNAME))
+        if error is not None:
+            messagebox.showerror("Failed", f"Testing stopped by an error:\n{error}\n"
+                                           "- Progress saved, next run can resume")
+        elif cancelled:
+            messagebox.showinfo("Cancelled", "Testing cancelled.\n- Progress saved, next run can resume")
+        else:
+            messagebox.showinfo("Done", "Testing Done.\n- Table will show Alive Proxy")
 
-        threading.Thread(target=worker, daemon=True).start()
+    def _write_run_trace(self, snap: dict, out_dir: str):
+        def done(written):
+            dropped = f", {written['dropped']} dropped" if written["dropped"] else ""
+            self.log_auto(f"Trace written: {written['trace']} ({written['events']} events{dropped})")
+            if written["profile"]:
+                self.log_auto(f"cProfile dump: {written['profile']}")
+            for line in written["summary"]:
+                self.log_auto(f"  {line}")
+
+        self.tasks.submit("trace", write_trace_run, snap, out_dir, on_done=done,
+                          on_error=lambda e: self.log_auto(f"Trace not written: {e}", logging.WARNING))
+
+    def auto_toggle_pause(self):
+        if not self.auto_is_running:
+            return
+        if self.auto_resume_event.is_set():
+            self.auto_resume_event.clear()
+            self.auto_pause_btn.configure(text="Resume")
+            self.auto_status_var.set("Pausing...")
+            self.log_auto("Paused (after current proxy).", logging.WARNING)
+        else:
+            self.auto_resume_event.set()
+            self.auto_pause_btn.configure(text="Pause")
+            self.log_auto("Resumed.", logging.WARNING)
+
+    def auto_cancel(self):
+        if not self.auto_is_running:
+            return
+        self.auto_cancel_event.set()
+        self.auto_resume_event.set()
+        if self._auto_feed is not None:
+            self._auto_feed.stop()
+        self.auto_status_var.set("Cancelling...")
+        self.auto_cancel_btn.configure(state="disabled")
+
+    def toggle_warm_pool(self):
+        if self.warm_pool is not None and self.warm_pool.running:
+            self.warm_pool.stop()
+            self.proxy_index.replace_origin("pool", [])
+            self.warm_pool_btn.configure(text="Start pool")
+            return
+
+        countries = [c for c in self.warm_pool_countries_var.get().replace(" ", ",").split(",") if c]
+        opts = {"timeout_s": int(self.auto_timeout_var.get()), "engine": self.auto_engine_var.get()}
+
+        def on_change(stats):
+            self.proxy_index.replace_origin("pool", pool.members())
+            self.after(0, lambda: self.warm_pool_stats_var.set(format_warm_pool_stats(stats)))
+
+        self.warm_pool = pool = WarmPool(self.warm_pool_source_var.get(), int(self.warm_pool_size_var.get()),
+                                         countries, opts, on_change=on_change, on_log=self.log_auto)
+        self.warm_pool.start()
+        self.warm_pool_btn.configure(text="Stop pool")
+        self.save_current_profile_config()
+
+    def toggle_query_daemon(self):
+        if self.query_daemon is not None and self.query_daemon.running:
+            self.query_daemon.stop()
+            self.query_daemon_btn.configure(text="Start daemon")
+            self.query_daemon_status_var.set("stopped")
+            return
+        daemon = QueryDaemon(self.query_daemon_listen_var.get(), self.proxy_index, self.query_daemon_token_var.get())
+        try:
+            listen = daemon.start()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Query daemon", f"Cannot listen on {daemon.listen}:\n{e}")
+            return
+        self.query_daemon = daemon
+        self.query_daemon_btn.configure(text="Stop daemon")
+        self.log_auto(f"Query daemon listening on {listen}")
+        self.save_current_profile_config()
+        self._refresh_query_daemon_status()
+
+    def _refresh_query_daemon_status(self):
+        if self.query_daemon is None or not self.query_daemon.running:
+            return
+        st = self.proxy_index.stats()
+        self.query_daemon_status_var.set(f"serving {st['proxies']} proxies on {self.query_daemon.listen} | "
+                                         f"{st['leased']} leased | {st['queries']} queries")
+        self.after(2000, self._refresh_query_daemon_status)
+
+    def _adopt_pool_member(self, m: dict):
+        """Results-table record for a warm-pool member (added once, so password lookup and launch work)."""
+        rec = self.auto_results.get(proxy_dedupe_key(m))
+        if rec is not None and rec.ok:
+            return rec
+        rec = self.auto_results.add_dict(m)
+        self.add_result_row(rec)
+        return rec
+
+    def _warm_pool_pick(self):
+        member = self.warm_pool.best() if self.warm_pool is not None else None
+        return self._adopt_pool_member(member) if member else None
 
     def _get_selected_ok_record(self):
-        sel = self.tree.selection()
-        if not sel:
+        rec = self.results_table.selected_record()
+        if rec is None:
             return None, "Select Alive Proxy From Table"
-        values = self.tree.item(sel[0], "values")
-        if not values:
-            return None, "Selection empty."
-        proxy_show, status, latency_ms, ip, cc, iana_tz, win_tz = values
-        if status != "OK":
+        if not rec.ok:
             return None, "Select Alive Proxy"
-
-        hostport = str(proxy_show).replace(":***", "")
-        rec = None
-        for r in self.auto_results:
-            if r["proxy_show"].replace(":***", "") == hostport and r["status"] == "OK":
-                rec = r
-                break
-        if not rec:
-            return None, "No Data Proxy"
         return rec, ""
 
     def use_selected_proxy(self):
         rec, err = self._get_selected_ok_record()
+        if not rec:
+            # nothing selected: a warm-pool proxy (verified recently), else the best alive one by p95
+            rec = self._warm_pool_pick() or self.auto_results.best_ok()
         if not rec:
             messagebox.showwarning("Cannot", err)
             return
 
-        self.proxy_hostport_var.set(f'{rec["host"]}:{rec["port"]}')
-        self.proxy_host_var.set(rec["host"])
-        self.proxy_port_var.set(rec["port"])
-        self.proxy_user_var.set(rec["user"])
-        self.proxy_pass_var.set(rec["pass"])
+        self.proxy_hostport_var.set(rec.hostport)
+        self.proxy_host_var.set(rec.host)
+        self.proxy_port_var.set(rec.port)
+        self.proxy_user_var.set(rec.user)
+        self.proxy_pass_var.set(self.auto_results.password(rec))
 
-        self.unified_apply_detect_state(rec["ip"], rec["country"], rec["iana_tz"])
+        self.unified_apply_detect_state(rec.ip, rec.country, rec.iana_tz, rec.win_tz)
         self.save_current_profile_config()
         messagebox.showinfo("OK", "Alive Proxy has filled")
 
     def auto_launch_selected(self):
         rec, err = self._get_selected_ok_record()
+        if not rec and self.results_table.selected_record() is None:
+            rec = self._warm_pool_pick()
         if not rec:
             messagebox.showwarning("Cannot", err)
             return
 
         brave_exe = self.brave_path_var.get().strip()
-        prof_dir = self.profile_dir_var.get().strip()
         if not brave_exe or not os.path.isfile(brave_exe):
             messagebox.showerror("Error", "Path brave.exe invalid.")
             return
+        self._launch_with_record(rec, brave_exe, rec.ip, rec.country, rec.iana_tz)
+
+    def auto_launch_best(self):
+        """Race the top K alive results (current filter applies) and launch the first that is still good."""
+        if self.tasks.cancel("launch_best"):
+            self.auto_status_var.set("")
+            return
+        brave_exe = self.brave_path_var.get().strip()
+        if not brave_exe or not os.path.isfile(brave_exe):
+            messagebox.showerror("Error", "Path brave.exe invalid.")
+            return
+        pool = [r for r in self.results_table.model.view if r.ok] or list(self.auto_results.ok())
+        if not pool and self.warm_pool is not None:
+            pool = [self._adopt_pool_member(m) for m in self.warm_pool.members()[:LAUNCH_RACE_TOP_K]]
+        top = heapq.nsmallest(LAUNCH_RACE_TOP_K, pool, key=lambda r: r.rank_latency)
+        if not top:
+            messagebox.showwarning("Cannot", "No Alive Proxy in table")
+            return
+
+        candidates = [dict(host=r.host, port=r.port, user=r.user, iana_tz=r.iana_tz,
+                           **{"pass": self.auto_results.password(r)}) for r in top]
+        by_key = {r.key: r for r in top}
+        self.auto_status_var.set("Verifying...")
+        self.log_auto(f"Launch best: re-verifying {len(top)} proxies (deadline {LAUNCH_RACE_DEADLINE_S:.0f}s)")
+
+        def done(res):
+            winner, info, attempts = res
+            for a in attempts:
+                if a["error"]:
+                    self.log_auto(f"{a['host']}:{a['port']} - re-verify ERROR({a['error']}) - {a['ms']}ms",
+                                  logging.DEBUG)
+            rec = by_key.get(proxy_dedupe_key(winner)) if winner else None
+            self._launch_best_done(rec, info, brave_exe, len(attempts), len(top))
+
+        self.tasks.submit("launch_best", race_verify, candidates, on_done=done)
+
+    def _launch_best_done(self, rec, info: dict, brave_exe: str, answered: int, raced: int):
+        self.auto_status_var.set("")
+        if rec is None:
+            self.log_auto(f"Launch best: none of {raced} proxies passed ({answered} answered in time)",
+                          logging.WARNING)
+            messagebox.showwarning("Cannot", f"None of the top {raced} proxies is still alive with the same timezone.\n"
+                                             "Run Check proxies again.")
+            return
+        self.log_auto(f"Launch best: {rec.hostport} verified ({info.get('ip', '-')} {info.get('timezone', '-')})")
+        self._launch_with_record(rec, brave_exe, info.get("ip", rec.ip), info.get("country", rec.country),
+                                 info.get("timezone", rec.iana_tz))
 
+    def _launch_with_record(self, rec, brave_exe: str, ip: str, country: str, iana_tz: str):
+        prof_dir = self.profile_dir_var.get().strip()
         ensure_dir(prof_dir)
-        proxy_hp = f'{rec["host"]}:{rec["port"]}'
+        proxy_hp = rec.hostport
         self.proxy_hostport_var.set(proxy_hp)
 
-        self.unified_apply_detect_state(rec["ip"], rec["country"], rec["iana_tz"])
+        self.unified_apply_detect_state(ip, country, iana_tz, rec.win_tz, refresh_tz=False)
 
-        cur = get_current_tz() or "-"
-        reco = (self.tz_windows_reco_var.get() or "").strip()
-        if reco not in ("", "-", "(no map)") and cur != reco:
-            ok = messagebox.askyesno(
-                "Timezone mismatch",
-                f"Now Timezone:\n{cur}\n\nRecomended:\n{reco}\n\nApply timezone?"
-            )
-            if ok:
-                ok2, msg = set_windows_timezone(reco)
-                if not ok2:
-                    messagebox.showerror("Gagal", msg)
+        def launch(res=None):
+            if res is not None and not res[0]:
+                messagebox.showerror("Gagal", res[1])
+            self.save_current_profile_config()
+            launch_brave(brave_exe, prof_dir, proxy_hp)
+            messagebox.showinfo("Success", "Browser Opened With Proxy")
+
+        def got_current(cur):
+            cur = cur or "-"
+            self._show_system_tz(cur)
+            reco = (self.tz_windows_reco_var.get() or "").strip()
+            if reco not in ("", "-", "(no map)") and cur != reco:
+                ok = messagebox.askyesno(
+                    "Timezone mismatch",
+                    f"Now Timezone:\n{cur}\n\nRecomended:\n{reco}\n\nApply timezone?"
+                )
+                if ok and self.tasks.submit("apply_tz", set_windows_timezone, reco, on_done=launch) is not None:
+                    return
+            launch()
 
-        self.save_current_profile_config()
-        launch_brave(brave_exe, prof_dir, proxy_hp)
-        messagebox.showinfo("Success", "Browser Opened With Proxy")
+        self.tasks.submit("launch", TZ_SERVICE.current, on_done=got_current)
 
     # ===== Manual actions =====
     def manual_launch_brave(self):
@@ -1221,17 +2519,28 @@ class App(tk.Tk):
             messagebox.showwarning("Proxy empty", "Fill Host and Port")
             return
 
-        proxies = build_requests_proxies(host, port, user, pwd)
-        code, info, err = ipinfo_request(proxies=proxies, timeout_s=15)
-        if code != 200:
-            messagebox.showerror("Failed", f"Failed: {err}")
+        if self.tasks.cancel("detect"):
             return
 
-        ip = info.get("ip", "-")
-        country = info.get("country", "-")
-        iana_tz = info.get("timezone", "-")
-        self.unified_apply_detect_state(ip, country, iana_tz)
-        self.save_current_profile_config()
+        def detect(proxies):
+            code, info, err = ipinfo_request(proxies, 15)
+            win_tz = iana_to_windows_best(info.get("timezone", "-")) if code == 200 else "(no map)"
+            return code, info, err, win_tz
+
+        def done(res):
+            code, info, err, win_tz = res
+            if code != 200:
+                messagebox.showerror("Failed", f"Failed: {err}")
+                return
+
+            ip = info.get("ip", "-")
+            country = info.get("country", "-")
+            iana_tz = info.get("timezone", "-")
+            self.unified_apply_detect_state(ip, country, iana_tz, win_tz)
+            self.save_current_profile_config()
+
+        proxies = build_requests_proxies(host, port, user, pwd)
+        self.tasks.submit("detect", detect, proxies, on_done=done)
 
     def apply_recommended_timezone(self):
         reco = (self.tz_windows_reco_var.get() or "").strip()
@@ -1239,24 +2548,25 @@ class App(tk.Tk):
             messagebox.showwarning("No Any Recomend", "Recomended Timezone not available")
             return
 
-        cur = get_current_tz() or "-"
-        if cur == reco:
-            self.refresh_timezone()
-            self.check_mismatch()
-            messagebox.showinfo("OK", "Timezone Windows as Recomend")
-            return
+        def applied(res):
+            ok2, msg = res
+            if ok2:
+                self.refresh_timezone()
+                messagebox.showinfo("Success", "Timezone has changed, Please Refresh whoer status")
+            else:
+                messagebox.showerror("Failed", msg)
 
-        ok = messagebox.askyesno("Confirm", f"Change Windows Timezone from:\n{cur}\n\nto:\n{reco}\n\nNext?")
-        if not ok:
-            return
+        def got_current(cur):
+            cur = cur or "-"
+            self._show_system_tz(cur)
+            if cur == reco:
+                messagebox.showinfo("OK", "Timezone Windows as Recomend")
+                return
+            ok = messagebox.askyesno("Confirm", f"Change Windows Timezone from:\n{cur}\n\nto:\n{reco}\n\nNext?")
+            if ok:
+                self.tasks.submit("apply_tz", set_windows_timezone, reco, on_done=applied)
 
-        ok2, msg = set_windows_timezone(reco)
-        if ok2:
-            self.refresh_timezone()
-            self.check_mismatch()
-            messagebox.showinfo("Success", "Timezone has changed, Please Refresh whoer status")
-        else:
-            messagebox.showerror("Failed", msg)
+        self.tasks.submit("apply_tz", TZ_SERVICE.current, True, on_done=got_current)
 
     def start_browser_profiling(self):
         if self.profiling_is_running:
@@ -1279,18 +2589,33 @@ class App(tk.Tk):
             )
             return
 
+        profile_dirs = self._selected_profiling_dirs()
+        concurrency = int(self.profiling_concurrency_var.get())
+        pages_per_profile = int(self.profiling_pages_var.get())
+        block_heavy = bool(self.profiling_block_heavy_var.get())
+        headless = bool(self.profiling_headless_var.get())
+
         self.save_current_profile_config()
         self.profiling_is_running = True
+        self.profiling_stop_event.clear()
         self.profiling_status_var.set("Running...")
         self.profiling_start_btn.configure(state="disabled")
+        self.profiling_stop_btn.configure(state="normal")
 
         def ui_status(msg: str):
             self.after(0, lambda: self.profiling_status_var.set(msg))
 
-        def finish(ok: bool, err: str = ""):
+        def finish(ok: bool, err: str = "", failures: list[str] | None = None):
             self.profiling_is_running = False
-            self.after(0, lambda: self.profiling_start_btn.configure(state="normal"))
-            if ok:
+            self.after(0, lambda: (self.profiling_start_btn.configure(state="normal"),
+                                   self.profiling_stop_btn.configure(state="disabled")))
+            if ok and failures:
+                n = f"{len(failures)} failure{'s' if len(failures) != 1 else ''}"
+                ui_status(f"Completed with {n}.")
+                detail = "\n".join(failures)
+                self.after(0, lambda: messagebox.showwarning("Done",
+                                                             f"Browser profiling completed with {n}.\n{detail}"))
+            elif ok:
                 ui_status("Completed.")
                 self.after(0, lambda: messagebox.showinfo("Done", "Browser profiling completed."))
             else:
@@ -1299,52 +2624,151 @@ class App(tk.Tk):
 
         def worker():
             try:
-                self._run_browser_profiling(duration_min, ui_status)
-                finish(True)
+                failures = run_profiling_engine(
+                    profile_dirs, duration_min,
+                    concurrency=concurrency, pages_per_profile=pages_per_profile,
+                    block_heavy=block_heavy, headless=headless,
+                    ui_status=ui_status, stop_event=self.profiling_stop_event,
+                )
+                finish(True, failures=failures)
             except Exception as exc:
                 finish(False, str(exc))
 
         threading.Thread(target=worker, daemon=True).start()
 
-    def _run_browser_profiling(self, duration_min: int, ui_status) -> None:
-        from playwright.sync_api import sync_playwright
+    def stop_browser_profiling(self):
+        if self.profiling_is_running:
+            self.profiling_stop_event.set()
+            self.profiling_status_var.set("Stopping after current visits...")
 
-        profile_dir = self.profile_dir_var.get().strip()
-        ensure_dir(profile_dir)
-        user_data_dir = os.path.join(profile_dir, PROFILING_PROFILE_DIRNAME)
-        ensure_dir(user_data_dir)
 
-        end_time = time.time() + (duration_min * 60)
-        url_index = 0
+def main(argv: list[str] | None = None) -> None:
+    import argparse
 
-        with sync_playwright() as p:
-            context = p.chromium.launch_persistent_context(
-                user_data_dir=user_data_dir,
-                headless=False,
-                viewport={"width": 1280, "height": 720}
-            )
-            page = context.new_page()
+    parser = argparse.ArgumentParser(description=APP_NAME)
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print a breakdown of startup time (also saved as startup_profile.txt)")
+    parser.add_argument("--eager-tabs", action="store_true",
+                        help="build every tab at startup instead of on first open")
+    parser.add_argument("--tz-backend", default=None,
+                        help="system timezone backend: tzutil, localtime or static[:<tz id>]")
+    parser.add_argument("--profiling-run", nargs="+", metavar="PROFILE_DIR",
+                        help="warm these profile folders without the GUI, then exit")
+    parser.add_argument("--profiling-urls", nargs="+", metavar="URL",
+                        help="URLs to visit instead of the built-in list (e.g. a local static site)")
+    parser.add_argument("--profiling-minutes", type=float, default=PROFILING_DEFAULT_MINUTES)
+    parser.add_argument("--profiling-concurrency", type=int, default=PROFILING_DEFAULT_CONCURRENCY)
+    parser.add_argument("--profiling-pages", type=int, default=PROFILING_DEFAULT_PAGES_PER_PROFILE)
+    parser.add_argument("--block-heavy", action="store_true", help="abort image/media/font requests")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--check-worker", metavar="HOST:PORT",
+                        help="serve proxy checks for a coordinator on another machine, then block")
+    parser.add_argument("--worker-token", default="", help="shared secret between coordinator and worker nodes")
+    parser.add_argument("--check-file", metavar="FILE",
+                        help="check the proxies in FILE without the GUI; JSON results on stdout")
+    parser.add_argument("--threads", type=int, default=1, help="in-process check lanes")
+    parser.add_argument("--processes", type=int, default=0, help="local worker processes")
+    parser.add_argument("--nodes", default="", help="remote check workers, comma separated host:port")
+    parser.add_argument("--timeout", type=int, default=12)
+    parser.add_argument("--latency-samples", type=int, default=0)
+    parser.add_argument("--retries", type=int, default=CHECK_DEFAULT_RETRIES,
+                        help="extra attempts for ReadTimeout / HTTP 5xx failures; one proxy's attempts stop once "
+                             "they would exceed (1 + retries) timeouts plus backoff, and run-wide retries are "
+                             f"capped at {CHECK_RETRY_MIN} + {CHECK_RETRY_RATIO * 100:.0f}%% of the proxies checked")
+    parser.add_argument("--no-breaker", action="store_true", help="check every port of hosts that keep failing")
+    parser.add_argument("--engine", choices=CHECK_ENGINES, default="requests",
+                        help="raw = asyncio CONNECT checker; --threads is then the number of concurrent checks")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="with --check-file: write a Chrome trace and a cProfile dump of the run to DIR")
+    parser.add_argument("--serve-pool", metavar="LISTEN",
+                        help="serve verified proxies to other tools on host:port or unix:/path (query daemon); "
+                             "fed by --pool-file and/or --check-file")
+    parser.add_argument("--pool-file", action="append", default=[], metavar="JSONL",
+                        help="check results (--check-file output) to index for --serve-pool")
+    parser.add_argument("--daemon-token", default="",
+                        help="token clients must send to the query daemon (required for host:port listeners)")
+    parser.add_argument("--provision", metavar="TEMPLATE_DIR",
+                        help="create --count profiles from a template profile folder, then exit")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--prefix", default=PROVISION_DEFAULT_PREFIX)
+    parser.add_argument("--hardlink-caches", action="store_true",
+                        help="with --provision: hardlink browser caches instead of copying (profiles share them)")
+    parser.add_argument("--bench-engines", metavar="FILE",
+                        help="check FILE with every engine at --threads concurrency and print a comparison")
+    args = parser.parse_args(argv)
 
-            try:
-                while time.time() < end_time:
-                    url = BROWSER_PROFILING_URLS[url_index % len(BROWSER_PROFILING_URLS)]
-                    url_index += 1
-                    ui_status(f"Visiting {url}")
-                    try:
-                        page.goto(url, wait_until="load", timeout=60000)
-                    except Exception:
-                        continue
+    if args.provision:
+        if args.hardlink_caches:
+            print("warning: browser caches are hardlinked; the new profiles are not isolated", file=sys.stderr)
+        for rep in provision_profiles(args.provision, args.count, args.prefix, hardlink_caches=args.hardlink_caches):
+            print(json.dumps(rep), flush=True)
+        return
 
-                    page.wait_for_timeout(int(random.uniform(2, 5) * 1000))
+    if args.bench_engines:
+        opts = {"timeout_s": args.timeout}
+        for row in bench_check_engines(args.bench_engines, opts, concurrency=max(1, args.threads)):
+            print(json.dumps(row))
+        return
 
-                    for _ in range(random.randint(3, 7)):
-                        page.mouse.wheel(0, random.randint(400, 1200))
-                        page.wait_for_timeout(random.randint(400, 1200))
+    if args.check_worker:
+        try:
+            serve_check_worker(args.check_worker, args.worker_token)
+        except ValueError as e:
+            parser.error(str(e))
+        return
 
-                    page.wait_for_timeout(int(random.uniform(2, 8) * 1000))
-            finally:
-                context.close()
+    check_opts = {"timeout_s": args.timeout, "latency_samples": args.latency_samples, "engine": args.engine,
+                  "retries": args.retries, "breaker": not args.no_breaker}
+
+    if args.serve_pool:
+        index = ProxyIndex()
+        for path in args.pool_file:
+            print(f"indexed {index.load_jsonl(path)} proxies from {path}", file=sys.stderr, flush=True)
+        daemon = QueryDaemon(args.serve_pool, index, args.daemon_token)
+        try:
+            listen = daemon.start()
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"query daemon listening on {listen}", file=sys.stderr, flush=True)
+        if args.check_file:
+            run_check_file(args.check_file, check_opts, threads=args.threads, processes=args.processes,
+                           nodes=parse_node_list(args.nodes), token=args.worker_token,
+                           also=lambda res: index.upsert(res, "run"))
+        try:
+            daemon.wait()
+        except KeyboardInterrupt:
+            daemon.stop()
+        return
+
+    if args.check_file:
+        run_check_file(args.check_file, check_opts, threads=args.threads, processes=args.processes,
+                       nodes=parse_node_list(args.nodes), token=args.worker_token, trace_dir=args.trace)
+        return
+
+    if args.profiling_run:
+        failures = run_profiling_engine(
+            args.profiling_run, args.profiling_minutes, urls=args.profiling_urls,
+            concurrency=args.profiling_concurrency, pages_per_profile=args.profiling_pages,
+            block_heavy=args.block_heavy, headless=args.headless, ui_status=print,
+        )
+        if failures:
+            print(f"Completed with {len(failures)} failure{'s' if len(failures) != 1 else ''}:", *failures,
+                  sep="\n", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if args.tz_backend:
+        TZ_SERVICE.backend = make_tz_backend(args.tz_backend)
+
+    if args.startup_profile:
+        STARTUP_PROFILER.enabled = True
+    STARTUP_PROFILER.mark("module import")
+    App(lazy_tabs=not args.eager_tabs).mainloop()
 
 
 if __name__ == "__main__":
-    App().mainloop()
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+
+        multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,1072 @@
+"""Proxy check engines (requests and raw asyncio) and the local/process/remote check lanes."""
+
+import time
+import sys
+import json
+import threading
+import socket
+import base64
+import ipaddress
+import hmac
+import random
+import logging
+from collections import OrderedDict, Counter
+from urllib.parse import urlsplit
+
+from common import APP_NAME, TRACER, asyncio, percentile, requests, ssl, write_trace_run
+from timezones import iana_to_windows_best
+from feed import DNS_RESOLVER, PROVIDER_TEXTBOX, CandidateFeed, error_class
+
+
+IPINFO_URL = "https://ipinfo.io/json"
+
+LATENCY_PROBE_URL = "https://ipinfo.io/ip"
+LATENCY_DEFAULT_SAMPLES = 5
+
+THROUGHPUT_DEFAULT_URL = "https://speed.cloudflare.com/__down?bytes=262144"
+THROUGHPUT_DEFAULT_KB = 256
+THROUGHPUT_DEFAULT_BUDGET_MB = 50
+
+
+# ===================== Proxy check helpers =====================
+def build_requests_proxies(host: str, port: str, username: str = "", password: str = "") -> dict:
+    host = host.strip()
+    port = port.strip()
+    if not host or not port:
+        return {}
+    if username.strip():
+        proxy = f"http://{username.strip()}:{password.strip()}@{host}:{port}"
+    else:
+        proxy = f"http://{host}:{port}"
+    return {"http": proxy, "https": proxy}
+
+
+class ProxySessionPool:
+    """One keep-alive requests.Session per proxy URL (LRU-bounded, idle sessions expire)."""
+
+    def __init__(self, max_sessions: int = 256, idle_ttl_s: float = 60.0):
+        self.max_sessions = max_sessions
+        self.idle_ttl_s = idle_ttl_s
+        self._lock = threading.Lock()
+        self._sessions: OrderedDict[str, list] = OrderedDict()  # key -> [session, last_used]
+
+    @staticmethod
+    def _key(proxies: dict | None) -> str:
+        return (proxies or {}).get("https") or (proxies or {}).get("http") or "direct"
+
+    def _new_session(self, proxies: dict | None):
+        session = requests.Session()
+        session.trust_env = False  # proxies are explicit; skip env/netrc lookups on every request
+        if proxies:
+            session.proxies.update(proxies)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session_for(self, proxies: dict | None):
+        key = self._key(proxies)
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and now - entry[1] > self.idle_ttl_s:
+                # the proxy has most likely dropped the idle connection already
+                stale.append(self._sessions.pop(key)[0])
+                entry = None
+            if entry is None:
+                entry = [self._new_session(proxies), now]
+                self._sessions[key] = entry
+                while len(self._sessions) > self.max_sessions:
+                    stale.append(self._sessions.popitem(last=False)[1][0])
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(key)
+            session = entry[0]
+        for old in stale:
+            old.close()
+        return session
+
+    def discard(self, proxies: dict | None) -> None:
+        with self._lock:
+            entry = self._sessions.pop(self._key(proxies), None)
+        if entry is not None:
+            entry[0].close()
+
+    def clear(self) -> None:
+        with self._lock:
+            sessions = [e[0] for e in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+PROXY_SESSIONS = ProxySessionPool()
+
+
+def ipinfo_request(proxies: dict | None, timeout_s: int = 15, session=None,
+                   url: str = IPINFO_URL) -> tuple[int, dict, str]:
+    if session is None:
+        session = PROXY_SESSIONS.session_for(proxies)
+    try:
+        r = session.get(url, proxies=proxies, timeout=timeout_s)
+        if r.status_code != 200:
+            return r.status_code, {}, f"HTTP {r.status_code}"
+        return 200, r.json(), ""
+    except requests.exceptions.ProxyError:
+        PROXY_SESSIONS.discard(proxies)
+        return 0, {}, "ProxyError"
+    except requests.exceptions.ConnectTimeout:
+        PROXY_SESSIONS.discard(proxies)
+        return 0, {}, "ConnectTimeout"
+    except requests.exceptions.ReadTimeout:
+        return 0, {}, "ReadTimeout"
+    except requests.exceptions.SSLError:
+        return 0, {}, "SSLError"
+    except requests.exceptions.RequestException as e:
+        return 0, {}, f"RequestException:{type(e).__name__}"
+    except Exception as e:
+        return 0, {}, f"Exception:{type(e).__name__}"
+
+
+def latency_stats(samples_ms: list[float]) -> dict:
+    """min/p50/p95 and jitter (mean absolute difference of consecutive samples, as in RFC 3550)."""
+    if not samples_ms:
+        return {"min_ms": None, "p50_ms": None, "p95_ms": None, "jitter_ms": None}
+    diffs = [abs(b - a) for a, b in zip(samples_ms, samples_ms[1:])]
+    return {
+        "min_ms": int(min(samples_ms)),
+        "p50_ms": int(percentile(samples_ms, 50)),
+        "p95_ms": int(percentile(samples_ms, 95)),
+        "jitter_ms": int(sum(diffs) / len(diffs)) if diffs else 0,
+    }
+
+
+def sample_latency(proxies: dict | None, k: int = LATENCY_DEFAULT_SAMPLES, timeout_s: int = 10,
+                   url: str = LATENCY_PROBE_URL, session=None) -> dict:
+    """K small GETs over the proxy's kept-alive session, timed with perf_counter."""
+    if session is None:
+        session = PROXY_SESSIONS.session_for(proxies)
+    samples = []
+    errors = 0
+    for _ in range(max(1, int(k))):
+        t0 = time.perf_counter()
+        try:
+            r = session.get(url, proxies=proxies, timeout=timeout_s)
+            r.content
+            if r.status_code != 200:
+                errors += 1
+                continue
+        except requests.exceptions.RequestException:
+            errors += 1
+            continue
+        samples.append((time.perf_counter() - t0) * 1000)
+    out = latency_stats(samples)
+    out["samples"] = len(samples)
+    out["errors"] = errors
+    return out
+
+
+class ByteBudget:
+    """Thread-safe byte allowance shared by all throughput probes of a run."""
+
+    def __init__(self, limit_bytes: int):
+        self.limit = max(0, int(limit_bytes))
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int) -> int:
+        with self._lock:
+            grant = max(0, min(int(n), self.limit - self.used))
+            self.used += grant
+            return grant
+
+    def refund(self, n: int) -> None:
+        if n > 0:
+            with self._lock:
+                self.used = max(0, self.used - n)
+
+    @property
+    def remaining(self) -> int:
+        return self.limit - self.used
+
+
+def measure_throughput(proxies: dict | None, url: str = THROUGHPUT_DEFAULT_URL, max_bytes: int = 262144,
+                       timeout_s: int = 15, session=None) -> dict:
+    """Download up to max_bytes of url through the proxy; kbps excludes time to first byte."""
+    if session is None:
+        session = PROXY_SESSIONS.session_for(proxies)
+    out = {"ok": False, "bytes": 0, "ttfb_ms": None, "kbps": None, "error": ""}
+    deadline = time.monotonic() + timeout_s * 2
+    t0 = time.perf_counter()
+    try:
+        with session.get(url, proxies=proxies, timeout=timeout_s, stream=True) as r:
+            if r.status_code != 200:
+                out["error"] = f"HTTP {r.status_code}"
+                return out
+            t_first = None
+            first_len = 0
+            got = 0
+            for chunk in r.iter_content(chunk_size=16384):
+                if not chunk:
+                    continue
+                if t_first is None:
+                    t_first = time.perf_counter()
+                    first_len = len(chunk)
+                got += len(chunk)
+                if got >= max_bytes or time.monotonic() > deadline:
+                    break
+            t_end = time.perf_counter()
+    except requests.exceptions.ProxyError:
+        out["error"] = "ProxyError"
+        return out
+    except requests.exceptions.ConnectTimeout:
+        out["error"] = "ConnectTimeout"
+        return out
+    except requests.exceptions.ReadTimeout:
+        out["error"] = "ReadTimeout"
+        return out
+    except requests.exceptions.RequestException as e:
+        out["error"] = f"RequestException:{type(e).__name__}"
+        return out
+    except Exception as e:
+        out["error"] = f"Exception:{type(e).__name__}"
+        return out
+
+    out["bytes"] = got
+    if t_first is None:
+        out["error"] = "EmptyBody"
+        return out
+    out["ok"] = True
+    out["ttfb_ms"] = int((t_first - t0) * 1000)
+    body_s = t_end - t_first
+    if got > first_len and body_s > 0:
+        out["kbps"] = int((got - first_len) / 1024 / body_s)
+    else:
+        out["kbps"] = int(got / 1024 / max(t_end - t0, 1e-3))
+    return out
+
+
+# ===================== Raw asyncio check engine =====================
+CHECK_ENGINES = ("requests", "raw")
+RAW_ENGINE_DEFAULT_CONCURRENCY = 200
+RAW_MAX_HEADER_BYTES = 65536
+RAW_MAX_BODY_BYTES = 1 << 20
+RAW_PUMP_POLL_S = 0.5  # how often a pump blocked on a full lane group checks that the loop is still running
+LAUNCH_RACE_TOP_K = 5
+LAUNCH_RACE_DEADLINE_S = 8.0
+
+_raw_ssl_ctx = None
+
+
+def raw_ssl_context() -> "ssl.SSLContext":
+    """One shared client context on the CA bundle requests uses (certifi; sessions ignore the environment)."""
+    global _raw_ssl_ctx
+    if _raw_ssl_ctx is None:
+        try:
+            import certifi
+            cafile = certifi.where()
+        except ImportError:
+            cafile = None
+        _raw_ssl_ctx = ssl.create_default_context(cafile=cafile)
+    return _raw_ssl_ctx
+
+
+def _raw_parse_head(head: bytes) -> tuple[int, dict]:
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ", 2)
+    code = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 0
+    headers = {}
+    for ln in lines[1:]:
+        k, sep, v = ln.partition(":")
+        if sep:
+            headers[k.strip().lower()] = v.strip()
+    return code, headers
+
+
+async def _raw_start_tls(reader, writer, server_hostname: str):
+    """writer.start_tls() (3.11+) or the loop-level equivalent on 3.10; returns the writer to use from now on."""
+    if hasattr(writer, "start_tls"):
+        await writer.start_tls(raw_ssl_context(), server_hostname=server_hostname)
+        return writer
+    loop = asyncio.get_running_loop()
+    protocol = writer.transport.get_protocol()
+    transport = await loop.start_tls(writer.transport, protocol, raw_ssl_context(), server_hostname=server_hostname)
+    protocol._over_ssl = True  # what 3.11's StreamWriter.start_tls sets: EOF then closes instead of half-closing
+    return asyncio.StreamWriter(transport, protocol, reader, loop)
+
+
+async def _raw_read_body(reader: "asyncio.StreamReader", headers: dict) -> bytes:
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = bytearray()
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+            if size == 0:
+                return bytes(body)
+            body += await reader.readexactly(size + 2)
+            del body[-2:]
+            if len(body) > RAW_MAX_BODY_BYTES:
+                raise ValueError("body too large")
+    if "content-length" in headers:
+        return await reader.readexactly(min(int(headers["content-length"]), RAW_MAX_BODY_BYTES))
+    return await reader.read(RAW_MAX_BODY_BYTES)
+
+
+async def ipinfo_request_raw(host: str, port: str, user: str = "", pwd: str = "", timeout_s: float = 15,
+                             url: str = IPINFO_URL) -> tuple[int, dict, str]:
+    """ipinfo_request() on asyncio streams (CONNECT, TLS, one GET) with the same error classes."""
+    u = urlsplit(url)
+    target_host = u.hostname
+    target_port = u.port or (443 if u.scheme == "https" else 80)
+    path = (u.path or "/") + (f"?{u.query}" if u.query else "")
+    auth = ""
+    if user:
+        token = base64.b64encode(f"{user}:{pwd}".encode("utf-8")).decode("ascii")
+        auth = f"Proxy-Authorization: Basic {token}\r\n"
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s  # one budget for connect, tunnel and response, like requests' total
+
+    def remaining() -> float:
+        return max(0.0, deadline - loop.time())
+
+    writer = tls_writer = None  # on 3.10 TLS gets its own writer; the raw one must stay referenced
+    try:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, int(port), limit=RAW_MAX_HEADER_BYTES), remaining())
+        except asyncio.TimeoutError:
+            return 0, {}, "ConnectTimeout"
+        except (OSError, ValueError):
+            return 0, {}, "ProxyError"
+
+        async def tunnel():
+            writer.write((f"CONNECT {target_host}:{target_port} HTTP/1.1\r\n"
+                          f"Host: {target_host}:{target_port}\r\n{auth}\r\n").encode("latin-1"))
+            code, _ = _raw_parse_head(await reader.readuntil(b"\r\n\r\n"))
+            if code != 200:
+                return None
+            return await _raw_start_tls(reader, writer, target_host)
+
+        if u.scheme == "https":
+            try:
+                tls_writer = await asyncio.wait_for(tunnel(), remaining())
+            except asyncio.TimeoutError:
+                return 0, {}, "ReadTimeout"
+            except ssl.SSLError:
+                return 0, {}, "SSLError"
+            except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+                return 0, {}, "ProxyError"
+            if tls_writer is None:
+                return 0, {}, "ProxyError"
+
+        if u.scheme == "https":
+            request_target, proxy_auth = path, ""
+        else:
+            request_target, proxy_auth = url, auth
+        (tls_writer or writer).write((f"GET {request_target} HTTP/1.1\r\nHost: {target_host}\r\n"
+                                      f"User-Agent: {APP_NAME}\r\nAccept: application/json\r\n"
+                                      f"{proxy_auth}Connection: close\r\n\r\n").encode("latin-1"))
+
+        async def response():
+            code, headers = _raw_parse_head(await reader.readuntil(b"\r\n\r\n"))
+            if code != 200:
+                return code, b""
+            return code, await _raw_read_body(reader, headers)
+
+        try:
+            code, body = await asyncio.wait_for(response(), remaining())
+            if code != 200:
+                return code, {}, f"HTTP {code}"
+        except asyncio.TimeoutError:
+            return 0, {}, "ReadTimeout"
+        except ssl.SSLError:
+            return 0, {}, "SSLError"
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return 0, {}, "RequestException:ConnectionError"
+        except ValueError:
+            return 0, {}, "RequestException:ChunkedEncodingError"
+        try:
+            return 200, json.loads(body), ""
+        except ValueError:
+            return 0, {}, "RequestException:JSONDecodeError"
+    except Exception as e:
+        return 0, {}, f"Exception:{type(e).__name__}"
+    finally:
+        if writer is not None:
+            (tls_writer or writer).close()
+
+
+async def check_candidate_async(p: dict, opts: dict) -> dict:
+    """check_candidate() with the ipinfo step on the raw engine; sampling/throughput still go through requests."""
+    timeout_s = int(opts.get("timeout_s", 12))
+    host, port, user, pwd = p["host"], p["port"], p.get("user", ""), p.get("pass", "")
+    res = failed_check_result(p, "")
+    t0 = time.perf_counter()
+    with TRACER.span("ipinfo (raw)"):
+        code, info, err = await ipinfo_request_raw(p.get("addr") or host, port, user, pwd, timeout_s,
+                                                   url=opts.get("ipinfo_url") or IPINFO_URL)
+    res["latency_ms"] = int((time.perf_counter() - t0) * 1000)
+    res["error"] = err
+    if code != 200:
+        return res
+    iana_tz = info.get("timezone", "-")
+    res.update(status="OK", ip=info.get("ip", "-"), country=info.get("country", "-"),
+               iana_tz=iana_tz, win_tz=iana_to_windows_best(iana_tz))
+    if opts.get("latency_samples") or opts.get("throughput_bytes"):
+        extra = await asyncio.to_thread(_check_quality, build_requests_proxies(p.get("addr") or host, port, user, pwd),
+                                        opts)
+        res.update(extra)
+    return res
+
+
+async def _race_verify_async(candidates: list[dict], deadline_s: float, timeout_s: float):
+    async def probe(c):
+        t0 = time.perf_counter()
+        code, info, err = await ipinfo_request_raw(c.get("addr") or c["host"], c["port"], c.get("user", ""),
+                                                   c.get("pass", ""), timeout_s)
+        return c, code, info, err, int((time.perf_counter() - t0) * 1000)
+
+    attempts = []
+    tasks = [asyncio.ensure_future(probe(c)) for c in candidates]
+    try:
+        for fut in asyncio.as_completed(tasks, timeout=deadline_s):
+            c, code, info, err, ms = await fut
+            expect = c.get("iana_tz") or "-"
+            if code == 200 and expect not in ("", "-") and info.get("timezone") != expect:
+                err = f"TimezoneChanged:{info.get('timezone', '-')}"
+            attempts.append({"host": c["host"], "port": c["port"], "ms": ms, "error": err})
+            if code == 200 and not err:
+                return c, info, attempts
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        for t in tasks:
+            t.cancel()
+    return None, {}, attempts
+
+
+def race_verify(candidates: list[dict], deadline_s: float = LAUNCH_RACE_DEADLINE_S,
+                timeout_s: float | None = None) -> tuple[dict | None, dict, list[dict]]:
+    """Re-check candidates concurrently; first one still on its recorded timezone wins."""
+    if not candidates:
+        return None, {}, []
+    return asyncio.run(_race_verify_async(candidates, deadline_s, timeout_s or deadline_s))
+
+
+def _check_quality(proxies: dict, opts: dict) -> dict:
+    """Latency samples and throughput probe for an alive proxy (shared by both engines)."""
+    timeout_s = int(opts.get("timeout_s", 12))
+    res = {}
+    k = int(opts.get("latency_samples") or 0)
+    if k:
+        with TRACER.span("latency samples"):
+            stats = sample_latency(proxies, k, timeout_s)
+        for name in ("min_ms", "p50_ms", "p95_ms", "jitter_ms"):
+            res[name] = stats[name]
+    tp_bytes = int(opts.get("throughput_bytes") or 0)
+    if tp_bytes:
+        with TRACER.span("throughput"):
+            tp = measure_throughput(proxies, opts.get("throughput_url") or THROUGHPUT_DEFAULT_URL, tp_bytes,
+                                    timeout_s)
+        res["kbps"] = tp["kbps"]
+        res["ttfb_ms"] = tp["ttfb_ms"]
+        res["tp_bytes"] = tp["bytes"]
+        if not tp["ok"]:
+            res["tp_error"] = tp["error"]
+    return res
+
+
+# ===================== Check engine & distributed lanes =====================
+CHECK_WORKER_DEFAULT_PORT = 8765
+CHECK_LANES_PER_PROCESS = 2
+CHECK_LANES_PER_NODE = 8
+# what a remote coordinator may set; URLs are never taken from the wire (the worker would fetch them)
+CHECK_REMOTE_OPT_LIMITS = {"timeout_s": 60, "latency_samples": 50, "throughput_bytes": 16 * 1024 * 1024}
+CHECK_DEFAULT_RETRIES = 2
+CHECK_RETRY_BACKOFF_S = 0.5
+CHECK_RETRY_RATIO = 0.2  # run-wide: retries <= CHECK_RETRY_MIN + ratio * first attempts
+CHECK_RETRY_MIN = 10
+CHECK_BREAKER_FAILS = 3
+CHECK_BREAKER_COOLDOWN_S = 60.0
+CHECK_BREAKER_ERROR = "CircuitOpen"
+
+
+def check_candidate(p: dict, opts: dict) -> dict:
+    """Full check of one parsed proxy: ipinfo, then optional latency samples and throughput."""
+    if opts.get("engine") == "raw":
+        return asyncio.run(check_candidate_async(p, opts))
+    timeout_s = int(opts.get("timeout_s", 12))
+    host, port, user, pwd = p["host"], p["port"], p.get("user", ""), p.get("pass", "")
+    res = failed_check_result(p, "")
+
+    # connect to the pre-resolved address so requests does not resolve again per check
+    proxies = build_requests_proxies(p.get("addr") or host, port, user, pwd)
+    t0 = time.perf_counter()
+    with TRACER.span("ipinfo"):
+        code, info, err = ipinfo_request(proxies=proxies, timeout_s=timeout_s,
+                                         url=opts.get("ipinfo_url") or IPINFO_URL)
+    res["latency_ms"] = int((time.perf_counter() - t0) * 1000)
+    res["error"] = err
+    if code != 200:
+        return res
+
+    iana_tz = info.get("timezone", "-")
+    res.update(status="OK", ip=info.get("ip", "-"), country=info.get("country", "-"),
+               iana_tz=iana_tz, win_tz=iana_to_windows_best(iana_tz))
+    res.update(_check_quality(proxies, opts))
+    return res
+
+
+def failed_check_result(p: dict, err: str) -> dict:
+    return {"host": p["host"], "port": p["port"], "user": p.get("user", ""), "pass": p.get("pass", ""),
+            "source": p.get("source", ""), "status": "FAIL", "latency_ms": 0, "ip": "-", "country": "-",
+            "iana_tz": "-", "win_tz": "-", "error": err}
+
+
+class LaneDead(Exception):
+    """A lane lost its backend (remote node down); the in-flight item goes back to the feed."""
+
+
+def parse_node_list(text: str) -> list[str]:
+    nodes = []
+    for part in (text or "").replace("\n", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if ":" not in part:
+            part = f"{part}:{CHECK_WORKER_DEFAULT_PORT}"
+        nodes.append(part)
+    return nodes
+
+
+class RemoteCheckClient:
+    """One connection to a check worker node. Protocol: JSON lines, a hello/token handshake then request/response."""
+
+    def __init__(self, node: str, token: str = "", io_timeout_s: float = 120.0):
+        self.node = node
+        self.token = token
+        self.io_timeout_s = io_timeout_s
+        self._sock = None
+        self._rf = None
+        self._next_id = 0
+
+    def _connect(self) -> None:
+        host, port = self.node.rsplit(":", 1)
+        sock = socket.create_connection((host, int(port)), timeout=10)
+        sock.settimeout(self.io_timeout_s)
+        self._sock = sock
+        self._rf = sock.makefile("r", encoding="utf-8", newline="\n")
+        reply = self._roundtrip({"hello": self.token})
+        if reply.get("hello") != "ok":
+            self.close()
+            raise LaneDead(f"{self.node}: handshake refused")
+
+    def _roundtrip(self, msg: dict) -> dict:
+        self._sock.sendall((json.dumps(msg) + "\n").encode("utf-8"))
+        line = self._rf.readline()
+        if not line:
+            raise OSError("connection closed")
+        return json.loads(line)
+
+    def check(self, p: dict, opts: dict) -> dict:
+        try:
+            if self._sock is None:
+                self._connect()
+            self._next_id += 1
+            reply = self._roundtrip({"id": self._next_id, "p": p, "opts": opts})
+        except (OSError, ValueError) as e:
+            self.close()
+            raise LaneDead(f"{self.node}: {type(e).__name__}") from e
+        return reply["result"]
+
+    def close(self) -> None:
+        for obj in (self._rf, self._sock):
+            try:
+                if obj is not None:
+                    obj.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._rf = None
+
+
+def _is_loopback_host(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+def remote_check_args(msg: dict) -> tuple[dict, dict]:
+    """Validated (p, opts) from a coordinator request; ValueError if malformed."""
+    raw = msg.get("p")
+    if not isinstance(raw, dict) or not raw.get("host") or not str(raw.get("port", "")).isdigit():
+        raise ValueError("bad proxy")
+    p = {k: str(raw.get(k) or "") for k in ("host", "port", "user", "pass", "addr", "source")}
+    given = msg.get("opts") if isinstance(msg.get("opts"), dict) else {}
+    opts = {k: max(0, min(limit, int(given.get(k) or 0))) for k, limit in CHECK_REMOTE_OPT_LIMITS.items()}
+    opts["timeout_s"] = opts["timeout_s"] or 12
+    if given.get("engine") in CHECK_ENGINES:
+        opts["engine"] = given["engine"]
+    return p, opts
+
+
+class _CheckWorkerHandler:
+    """Request logic of a check worker; mixed into socketserver.StreamRequestHandler when serving."""
+
+    def _send(self, obj: dict) -> None:
+        self.wfile.write((json.dumps(obj) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+    def handle(self):
+        authed = False
+        for raw in self.rfile:
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                return
+            if "hello" in msg:
+                authed = hmac.compare_digest(str(msg.get("hello") or "").encode("utf-8"),
+                                             self.server.token.encode("utf-8"))
+                self._send({"hello": "ok" if authed else "denied"})
+                if not authed:
+                    return
+                continue
+            if not authed:
+                return
+            try:
+                p, opts = remote_check_args(msg)
+            except (ValueError, TypeError):
+                return
+            try:
+                res = check_candidate(p, opts)
+            except Exception as e:
+                res = failed_check_result(p, f"Exception:{type(e).__name__}")
+            self._send({"id": msg.get("id"), "result": res})
+
+
+def serve_check_worker(listen: str, token: str = "") -> None:
+    """Run a check worker node; a non-loopback address needs a token."""
+    host, port = listen.rsplit(":", 1) if ":" in listen else (listen, CHECK_WORKER_DEFAULT_PORT)
+    if not token and not _is_loopback_host(host):
+        raise ValueError(f"refusing to serve checks on {host} without --worker-token (or listen on 127.0.0.1)")
+    import socketserver
+
+    handler = type("CheckWorkerHandler", (_CheckWorkerHandler, socketserver.StreamRequestHandler), {})
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer((host, int(port)), handler)
+    server.daemon_threads = True
+    server.token = token
+    print(f"check worker listening on {host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def is_retryable_error(err: str) -> bool:
+    """Transient failures worth another attempt: ReadTimeout, HTTP 5xx and 429."""
+    cls = error_class(err)
+    if cls == "HTTP":
+        try:
+            code = int(err.split()[1])
+        except (IndexError, ValueError):
+            return False
+        return code >= 500 or code == 429
+    return cls == "ReadTimeout"
+
+
+class RetryPolicy:
+    """Per-proxy retries with jittered backoff, capped per proxy and by a run-wide budget."""
+
+    def __init__(self, retries: int = CHECK_DEFAULT_RETRIES, timeout_s: float = 12,
+                 backoff_s: float = CHECK_RETRY_BACKOFF_S):
+        self.retries = max(0, int(retries))
+        self.timeout_s = float(timeout_s)
+        self.backoff_s = backoff_s
+        self.time_cap_s = (1 + self.retries) * self.timeout_s + backoff_s * (2 ** self.retries - 1)
+        self.first_attempts = 0
+        self.retried = 0
+        self.recovered = 0
+        self._lock = threading.Lock()
+
+    def delay(self, attempt: int, res: dict, elapsed_s: float) -> float | None:
+        """Seconds to wait before attempt+1 after `res`, or None when `res` is final."""
+        with self._lock:
+            if attempt == 1:
+                self.first_attempts += 1
+            if res["status"] == "OK" or attempt > self.retries or not is_retryable_error(res["error"]):
+                return None
+            wait = self.backoff_s * (2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            if elapsed_s + wait + self.timeout_s > self.time_cap_s:
+                return None
+            if self.retried >= CHECK_RETRY_MIN + CHECK_RETRY_RATIO * self.first_attempts:
+                return None
+            self.retried += 1
+            return wait
+
+    def finished(self, attempts: int, res: dict) -> None:
+        if attempts > 1 and res["status"] == "OK":
+            with self._lock:
+                self.recovered += 1
+
+
+class HostBreaker:
+    """Per-host circuit breaker: skip the remaining ports of a host that keeps failing."""
+
+    def __init__(self, threshold: int = CHECK_BREAKER_FAILS, cooldown_s: float = CHECK_BREAKER_COOLDOWN_S):
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.skipped = 0
+        self._state: dict[str, list] = {}  # host -> [consecutive fails, open until, probing, ever ok]
+        self._opened: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(p: dict) -> str:
+        return p.get("addr") or p["host"]
+
+    def allow(self, p: dict) -> bool:
+        host = self.host_of(p)
+        with self._lock:
+            st = self._state.get(host)
+            if st is None or not st[1]:
+                return True
+            if not st[2] and time.monotonic() >= st[1]:
+                st[2] = True  # half-open: this check is the probe
+                return True
+            self.skipped += 1
+            return False
+
+    def record(self, p: dict, ok: bool) -> None:
+        host = self.host_of(p)
+        with self._lock:
+            st = self._state.setdefault(host, [0, 0.0, False, False])
+            if ok:
+                st[:] = [0, 0.0, False, True]
+                return
+            st[0] += 1
+            if st[3]:
+                return
+            if st[2] or st[0] >= self.threshold:
+                st[1] = time.monotonic() + self.cooldown_s
+                st[2] = False
+                self._opened.add(host)
+
+    @property
+    def opened_hosts(self) -> int:
+        return len(self._opened)
+
+
+def run_check_lanes(feed: CandidateFeed, opts: dict, on_result, on_start=None, pre_check=None, threads: int = 1,
+                    processes: int = 0, nodes: list[str] | None = None, token: str = "",
+                    budget: ByteBudget | None = None, cancel_event: threading.Event | None = None,
+                    resume_event: threading.Event | None = None, on_log=None) -> dict:
+    """Drain the feed through parallel check lanes; returns per-lane-group check counts."""
+    nodes = nodes or []
+    on_log = on_log or (lambda *a: None)
+    counts: dict[str, int] = {}
+    counts_lock = threading.Lock()
+    budget_warned = threading.Event()
+    tp_want = int(opts.get("throughput_bytes") or 0)
+    retry = RetryPolicy(opts.get("retries", CHECK_DEFAULT_RETRIES), float(opts.get("timeout_s", 12)))
+    breaker = HostBreaker() if opts.get("breaker", True) else None
+
+    pool = None
+    if processes > 0:
+        # spawn, not fork: lane threads may hold locks (session pool, resolver) at fork time
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    io_timeout = float(opts.get("timeout_s", 12)) * (4 + int(opts.get("latency_samples") or 0))
+
+    def wait_turn() -> bool:
+        if resume_event is not None and not resume_event.is_set():
+            resume_event.wait()
+        return not (cancel_event is not None and cancel_event.is_set())
+
+    def begin(item) -> tuple[dict, int]:
+        if on_start:
+            on_start(item)
+        if not (tp_want and budget is not None):
+            return opts, 0
+        grant = budget.reserve(tp_want)
+        if not grant and not budget_warned.is_set():
+            budget_warned.set()
+            on_log("Throughput byte budget used up; remaining proxies are not measured", logging.WARNING)
+        return dict(opts, throughput_bytes=grant), grant
+
+    def finish(name: str, item, res: dict, grant: int) -> None:
+        if budget is not None:
+            budget.refund(grant - int(res.get("tp_bytes") or 0))
+        with counts_lock:
+            counts[name] = counts.get(name, 0) + 1
+        with TRACER.span("on_result", "lanes"):
+            on_result(item, res)
+
+    def settled(item) -> bool:
+        if pre_check:
+            with TRACER.span("pre-check", "lanes"):
+                res = pre_check(item)
+            if res is not None:
+                finish("not checked (pre-check)", item, res, 0)
+                return True
+        if breaker is not None and not breaker.allow(item[2]):
+            finish("not checked (host breaker)", item, failed_check_result(item[2], CHECK_BREAKER_ERROR), 0)
+            return True
+        return False
+
+    def attempts_done(p: dict, attempts: int, res: dict) -> dict:
+        retry.finished(attempts, res)
+        if breaker is not None:
+            breaker.record(p, res["status"] == "OK")
+        return res
+
+    def with_retries(run_one, p: dict, item_opts: dict) -> dict:
+        t0 = time.monotonic()
+        attempt = 1
+        while True:
+            res = run_one(p, item_opts)
+            wait = retry.delay(attempt, res, time.monotonic() - t0)
+            if wait is None:
+                break
+            with TRACER.span("retry backoff", "lanes"):
+                if cancel_event is not None and cancel_event.wait(wait):
+                    break
+                if cancel_event is None:
+                    time.sleep(wait)
+            attempt += 1
+        return attempts_done(p, attempt, res)
+
+    def lane(name: str, run_one, cleanup=None):
+        try:
+            with TRACER.profile_thread():
+                run_lane(name, run_one)
+        finally:
+            if cleanup:
+                cleanup()
+
+    def run_lane(name: str, run_one):
+        check_span = f"check ({name})"
+        while wait_turn():
+            with TRACER.span("wait for candidate", "lanes"):
+                item = feed.get()
+            if item is None:
+                return
+            if settled(item):
+                continue
+            item_opts, grant = begin(item)
+            try:
+                with TRACER.span(check_span, "lanes"):
+                    res = with_retries(run_one, item[2], item_opts)
+            except LaneDead as e:
+                feed.requeue(item)
+                if budget is not None:
+                    budget.refund(grant)
+                on_log(f"[lanes] {e}; lane closed, proxy re-queued", logging.WARNING)
+                return
+            except Exception as e:
+                res = failed_check_result(item[2], f"Exception:{type(e).__name__}")
+            finish(name, item, res, grant)
+
+    def async_lane_group(name: str, concurrency: int):
+        """`concurrency` raw-engine checks on one event loop; a pump thread moves items from the feed."""
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            q = asyncio.Queue()
+            slots = threading.Semaphore(concurrency)  # backpressure for the pump, never waited on by the loop
+            stopped = threading.Event()
+
+            def post(item) -> bool:
+                if stopped.is_set() or loop.is_closed():
+                    return False
+                try:
+                    loop.call_soon_threadsafe(q.put_nowait, item)
+                except RuntimeError:  # the loop closed in between
+                    return False
+                return True
+
+            def hand_over(item) -> bool:
+                """Queue item on the loop; False once the lane group has stopped."""
+                while not slots.acquire(timeout=RAW_PUMP_POLL_S):
+                    if stopped.is_set():
+                        return False
+                return post(item)
+
+            def pump():
+                try:
+                    while wait_turn():
+                        with TRACER.span("wait for candidate", "lanes"):
+                            item = feed.get()
+                        if item is None or not hand_over(item):
+                            break
+                finally:
+                    post(None)
+
+            async def with_retries_async(p: dict, item_opts: dict) -> dict:
+                t0 = time.monotonic()
+                attempt = 1
+                while True:
+                    res = await check_candidate_async(p, item_opts)
+                    wait = retry.delay(attempt, res, time.monotonic() - t0)
+                    if wait is None or (cancel_event is not None and cancel_event.is_set()):
+                        break
+                    with TRACER.span("retry backoff", "lanes"):
+                        await asyncio.sleep(wait)
+                    attempt += 1
+                return attempts_done(p, attempt, res)
+
+            async def turn() -> bool:
+                # same gate as wait_turn(), without blocking the loop; on cancel, drop what the pump queued
+                while resume_event is not None and not resume_event.is_set():
+                    await asyncio.sleep(0.2)
+                if cancel_event is not None and cancel_event.is_set():
+                    while not q.empty():
+                        if q.get_nowait() is None:
+                            q.put_nowait(None)  # the end marker is last; keep it for the other lanes
+                            break
+                        slots.release()
+                    return False
+                return True
+
+            async def one():
+                while True:
+                    item = await q.get()
+                    if item is None:
+                        q.put_nowait(None)
+                        return
+                    slots.release()
+                    if not await turn():
+                        return
+                    if settled(item):
+                        continue
+                    item_opts, grant = begin(item)
+                    try:
+                        with TRACER.span(check_span, "lanes"):
+                            res = await with_retries_async(item[2], item_opts)
+                    except Exception as e:
+                        res = failed_check_result(item[2], f"Exception:{type(e).__name__}")
+                    finish(name, item, res, grant)
+
+            threading.Thread(target=pump, daemon=True, name="raw-engine-pump").start()
+            try:
+                await asyncio.gather(*(one() for _ in range(concurrency)))
+            finally:
+                stopped.set()
+
+        check_span = f"check ({name})"
+        with TRACER.profile_thread():
+            asyncio.run(run())
+
+    lanes = []
+    if opts.get("engine") == "raw" and threads > 0:
+        lanes.append((f"raw-engine[{threads}]", threads))
+    else:
+        for i in range(max(0, threads)):
+            lanes.append(("in-process", check_candidate, None))
+    if pool is not None:
+        def run_in_pool(p, o):
+            return pool.submit(check_candidate, p, o).result()
+        for i in range(processes * CHECK_LANES_PER_PROCESS):
+            lanes.append((f"process-pool[{processes}]", run_in_pool, None))
+    for node in nodes:
+        for i in range(CHECK_LANES_PER_NODE):
+            client = RemoteCheckClient(node, token, io_timeout)
+            lanes.append((f"node {node}", client.check, client.close))
+    if not lanes:
+        lanes.append(("in-process", check_candidate, None))
+
+    workers = [threading.Thread(target=async_lane_group if len(spec) == 2 else lane, args=spec, daemon=True,
+                                name=f"lane-{i}") for i, spec in enumerate(lanes)]
+    try:
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # every lane closed (remote nodes down) with work left: finish it here rather than dropping it
+    if not (cancel_event is not None and cancel_event.is_set()) and not feed.stop_event.is_set():
+        lane("in-process (fallback)", check_candidate)
+    if retry.retried or (breaker is not None and breaker.skipped):
+        on_log(f"Retries: {retry.retried} extra attempts, {retry.recovered} proxies recovered"
+               + (f"; host breaker skipped {breaker.skipped} checks on {breaker.opened_hosts} hosts"
+                  if breaker is not None else ""))
+    return counts
+
+
+def _feed_from_lines(lines: list[str]) -> CandidateFeed:
+    feed = CandidateFeed(resolver=DNS_RESOLVER)
+    feed.open_sources(1)
+    for idx, line in enumerate(lines):
+        feed.put_line(line, PROVIDER_TEXTBOX, line_idx=idx)
+    feed.close_source()
+    return feed
+
+
+def run_check_file(path: str, opts: dict, threads: int = 1, processes: int = 0, nodes: list[str] | None = None,
+                   token: str = "", out=None, trace_dir: str | None = None, also=None) -> dict:
+    """Headless coordinator: check a proxy file, one JSON result per line on `out`."""
+    out = out or sys.stdout
+    if trace_dir:
+        TRACER.start()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        feed = _feed_from_lines(f.read().splitlines())
+    out_lock = threading.Lock()
+
+    def on_result(item, res):
+        with out_lock:
+            out.write(json.dumps(res) + "\n")
+            out.flush()
+        if also is not None:
+            also(res)
+
+    def on_log(msg, level=logging.INFO):
+        print(msg, file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    try:
+        counts = run_check_lanes(feed, opts, on_result, threads=threads, processes=processes, nodes=nodes,
+                                 token=token, on_log=on_log)
+    finally:
+        snap = TRACER.stop() if trace_dir else None
+    on_log(f"checked {sum(counts.values())} proxies in {time.perf_counter() - t0:.1f}s: "
+           + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    if snap is not None:
+        written = write_trace_run(snap, trace_dir)
+        on_log(f"trace: {written['trace']} ({written['events']} events), profile: {written['profile']}")
+        for line in written["summary"]:
+            on_log(f"  {line}")
+    return counts
+
+
+def bench_check_engines(path: str, opts: dict, concurrency: int = 50, engines=CHECK_ENGINES) -> list[dict]:
+    """Check the same list with each engine at the same concurrency and compare."""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        lines = f.read().splitlines()
+    rows = []
+    for engine in engines:
+        PROXY_SESSIONS.clear()
+        results = []
+        feed = _feed_from_lines(lines)
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        run_check_lanes(feed, dict(opts, engine=engine), lambda item, res: results.append(res), threads=concurrency)
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        n = max(len(results), 1)
+        rows.append({
+            "engine": engine, "checked": len(results), "ok": sum(r["status"] == "OK" for r in results),
+            "wall_s": round(wall, 3), "per_s": round(len(results) / wall, 1) if wall else 0.0,
+            "cpu_ms_per_check": round(cpu * 1000 / n, 3),
+            "errors": dict(sorted(Counter(error_class(r["error"]) for r in results if r["error"]).items())),
+        })
+    return rows
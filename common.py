@@ -0,0 +1,437 @@
+"""Shared helpers: lazy imports, startup profiling, run tracing, profile dirs and the auto log file."""
+
+import time
+import os
+import sys
+import json
+import threading
+import logging
+import logging.handlers
+import importlib.util
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+
+
+APP_NAME = "Proxy Browser Launcher + Whoer 100%"
+
+AUTO_LOG_FILENAME = "auto_check.log"
+AUTO_LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+AUTO_LOG_FILE_BACKUPS = 3
+AUTO_LOG_BUFFER_RECORDS = 500
+
+PROFILES_ROOT_NAME = "Brave Profile"
+DEFAULT_PROFILE_NAME = "Default"
+
+
+# ===================== Startup profiling / lazy imports =====================
+class StartupProfiler:
+    """Collects (phase, seconds) pairs for --startup-profile. Disabled instances ignore everything."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.phases: list[tuple[str, float]] = []
+        self.t0 = self._last = time.perf_counter()
+
+    def start_at(self, t0: float) -> None:
+        """Measure from t0 (the launcher's first statement) rather than from this module's import."""
+        self.t0 = self._last = t0
+
+    def add(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            self.phases.append((name, seconds))
+
+    def mark(self, name: str) -> None:
+        """Record the time since the previous mark (or interpreter start of this module)."""
+        now = time.perf_counter()
+        if self.enabled:
+            self.phases.append((name, now - self._last))
+        self._last = now
+
+    def report(self) -> str:
+        lines = ["Startup profile:"]
+        for name, secs in self.phases:
+            lines.append(f"  {secs * 1000:9.1f} ms  {name}")
+        lines.append(f"  {(time.perf_counter() - self.t0) * 1000:9.1f} ms  total since module start")
+        return "\n".join(lines)
+
+
+STARTUP_PROFILER = StartupProfiler(enabled=False)
+
+
+class _LazyModule:
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        mod = self._module
+        if mod is None:
+            t0 = time.perf_counter()
+            mod = self._module = importlib.import_module(self._name)
+            STARTUP_PROFILER.add(f"import {self._name} (lazy, first use)", time.perf_counter() - t0)
+        return getattr(mod, attr)
+
+
+# requests costs ~150ms to import; only the checker/providers need it
+requests = _LazyModule("requests")
+# asyncio + ssl cost another 60-80ms; only the raw engine, launch race and profiling use them
+asyncio = _LazyModule("asyncio")
+ssl = _LazyModule("ssl")
+
+
+# ===================== Run tracing =====================
+TRACE_DIRNAME = "traces"
+TRACE_MAX_EVENTS = 500_000
+TRACE_SUMMARY_TOP = 10
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "t0")
+
+    def __init__(self, tracer, name: str, cat: str):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, self.cat, self.t0, time.perf_counter_ns())
+        return False
+
+
+class _ThreadProfile:
+    """cProfile for the current thread while the block runs, merged into the run's dump."""
+    __slots__ = ("tracer", "prof")
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.prof = None
+
+    def __enter__(self):
+        self.prof = self.tracer._enable_profiler()
+        return self
+
+    def __exit__(self, *exc):
+        if self.prof is not None:
+            self.prof.disable()
+        return False
+
+
+class Tracer:
+    """Opt-in run instrumentation: Chrome trace events plus one aggregated cProfile dump."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._profile = False
+        self._reset()
+
+    def _reset(self) -> None:
+        self._t0 = time.perf_counter_ns()
+        self._events: list[dict] = []
+        self._dropped = 0
+        self._names: dict[int, str] = {}
+        self._task_tids: dict[int, int] = {}
+        self._profilers: list = []
+        self._main_prof = None
+
+    def start(self, profile: bool = True) -> None:
+        with self._lock:
+            self._reset()
+        self._profile = profile
+        self._main_prof = self._enable_profiler()
+        self.enabled = True
+
+    def stop(self) -> dict:
+        """Stop recording; returns the run's data for write_trace_run() (call on the start() thread)."""
+        self.enabled = False
+        if self._main_prof is not None:
+            self._main_prof.disable()
+        with self._lock:
+            snap = {"events": self._events, "names": dict(self._names), "profilers": list(self._profilers),
+                    "dropped": self._dropped, "pid": os.getpid()}
+            self._reset()
+        return snap
+
+    def span(self, name: str, cat: str = "checker"):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat)
+
+    def profile_thread(self):
+        if not (self.enabled and self._profile):
+            return _NULL_SPAN
+        return _ThreadProfile(self)
+
+    def _enable_profiler(self):
+        if not self._profile:
+            return None
+        import cProfile
+        prof = cProfile.Profile()
+        try:
+            prof.enable()
+        except ValueError:
+            # 3.12+: one profiler per interpreter, and the first one already sees every thread
+            return None
+        with self._lock:
+            self._profilers.append(prof)
+        return prof
+
+    def _tid(self) -> int:
+        aio = sys.modules.get("asyncio")  # not imported yet means no task can be running
+        try:
+            task = aio.current_task() if aio is not None else None
+        except RuntimeError:
+            task = None
+        if task is None:
+            tid = threading.get_ident()
+            if tid not in self._names:
+                self._names[tid] = threading.current_thread().name
+            return tid
+        tid = self._task_tids.get(id(task))
+        if tid is None:
+            tid = self._task_tids[id(task)] = 1_000_000 + len(self._task_tids)
+            self._names[tid] = f"{threading.current_thread().name} / {task.get_name()}"
+        return tid
+
+    def _record(self, name: str, cat: str, t0: int, t1: int) -> None:
+        with self._lock:
+            if len(self._events) >= TRACE_MAX_EVENTS:
+                self._dropped += 1
+                return
+            self._events.append({"name": name, "cat": cat, "ph": "X", "ts": (t0 - self._t0) / 1000,
+                                 "dur": (t1 - t0) / 1000, "tid": self._tid()})
+
+
+TRACER = Tracer()
+
+
+def traced(name: str, fn, cat: str = "ui"):
+    """fn wrapped in a TRACER span, or fn itself while tracing is off (e.g. for Tk after() callbacks)."""
+    if not TRACER.enabled:
+        return fn
+
+    def run(*args, **kwargs):
+        with TRACER.span(name, cat):
+            return fn(*args, **kwargs)
+    return run
+
+
+def trace_summary(events: list[dict], top: int = TRACE_SUMMARY_TOP) -> list[str]:
+    """Total/count/avg per span name, biggest total first (nested spans count in both)."""
+    totals: dict[str, list] = {}
+    for ev in events:
+        t = totals.setdefault(ev["name"], [0.0, 0])
+        t[0] += ev["dur"]
+        t[1] += 1
+    rows = sorted(totals.items(), key=lambda kv: -kv[1][0])[:top]
+    return [f"{name}: {tot / 1000:.1f} ms total, {n}x, avg {tot / n / 1000:.2f} ms" for name, (tot, n) in rows]
+
+
+def write_trace_run(snap: dict, out_dir: str, stamp: str | None = None) -> dict:
+    """Write a stopped run as trace-<stamp>.json and profile-<stamp>.pstats under out_dir."""
+    import pstats
+
+    ensure_dir(out_dir)
+    stamp = stamp or datetime.now().strftime("%Y%m%d-%H%M%S")
+    pid = snap["pid"]
+    events = [dict(ev, pid=pid) for ev in snap["events"]]
+    meta = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in snap["names"].items()]
+    trace_path = os.path.join(out_dir, f"trace-{stamp}.json")
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms",
+                   "otherData": {"dropped_events": snap["dropped"]}}, f)
+
+    prof_path = None
+    profs = [p for p in snap["profilers"] if p.getstats()]
+    if profs:
+        stats = pstats.Stats(profs[0])
+        for p in profs[1:]:
+            stats.add(p)
+        prof_path = os.path.join(out_dir, f"profile-{stamp}.pstats")
+        stats.dump_stats(prof_path)
+    return {"trace": trace_path, "profile": prof_path, "events": len(events), "dropped": snap["dropped"],
+            "summary": trace_summary(snap["events"])}
+
+
+# ===================== Basic utils =====================
+def desktop_path() -> str:
+    return os.path.join(os.path.expanduser("~"), "Desktop")
+
+
+def profiles_root_dir() -> str:
+    return os.path.join(desktop_path(), PROFILES_ROOT_NAME)
+
+
+def ensure_dir(path: str) -> None:
+    os.makedirs(path, exist_ok=True)
+
+
+def config_path(profile_dir: str) -> str:
+    return os.path.join(profile_dir, "launcher_config.json")
+
+
+def load_config(profile_dir: str) -> dict:
+    cfg_path = config_path(profile_dir)
+    if os.path.isfile(cfg_path):
+        try:
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+
+def save_config(profile_dir: str, cfg: dict) -> None:
+    cfg_path = config_path(profile_dir)
+    with open(cfg_path, "w", encoding="utf-8") as f:
+        json.dump(cfg, f, indent=2)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Linear-interpolated percentile, q in [0, 100]."""
+    if not values:
+        return None
+    vals = sorted(values)
+    if len(vals) == 1:
+        return float(vals[0])
+    pos = (len(vals) - 1) * (q / 100.0)
+    lo = int(pos)
+    hi = min(lo + 1, len(vals) - 1)
+    return vals[lo] + (vals[hi] - vals[lo]) * (pos - lo)
+
+
+# ===================== Daemon thread pool =====================
+class DaemonPool:
+    """Minimal executor on daemon threads, so a stuck call never holds the process open at exit."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self._max_workers = max(1, int(max_workers))
+        self._prefix = thread_name_prefix
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._threads = 0
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, fn) -> Future:
+        fut = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._queue.append((fut, fn))
+            if self._idle:
+                self._cond.notify()
+            elif self._threads < self._max_workers:
+                self._threads += 1
+                threading.Thread(target=self._work, daemon=True,
+                                 name=f"{self._prefix}_{self._threads - 1}").start()
+        return fut
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                if not self._queue:
+                    return
+                fut, fn = self._queue.popleft()
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                fut.set_result(fn())
+            except BaseException as e:
+                fut.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Drop queued work and let idle workers exit; running calls finish (or die with the process)."""
+        with self._cond:
+            self._closed = True
+            pending, self._queue = list(self._queue), deque()
+            self._cond.notify_all()
+        for fut, _fn in pending:
+            fut.cancel()
+
+
+# ===================== Auto log file =====================
+_AUTO_FILE_LOGGERS: dict[str, logging.Logger] = {}
+
+
+def get_auto_file_logger(profile_dir: str) -> logging.Logger:
+    """Buffered rotating log file in the profile directory."""
+    path = os.path.abspath(os.path.join(profile_dir, AUTO_LOG_FILENAME))
+    logger = _AUTO_FILE_LOGGERS.get(path)
+    if logger is not None:
+        return logger
+
+    ensure_dir(profile_dir)
+    logger = logging.getLogger(f"whoer.auto.{len(_AUTO_FILE_LOGGERS)}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=AUTO_LOG_FILE_MAX_BYTES, backupCount=AUTO_LOG_FILE_BACKUPS, encoding="utf-8", delay=True
+    )
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    logger.addHandler(logging.handlers.MemoryHandler(
+        AUTO_LOG_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler
+    ))
+    _AUTO_FILE_LOGGERS[path] = logger
+    return logger
+
+
+def flush_auto_file_logger(logger: logging.Logger | None) -> None:
+    if logger is None:
+        return
+    for h in logger.handlers:
+        try:
+            h.flush()
+        except Exception:
+            pass
+
+
+# ===================== Profiles helpers =====================
+def list_profiles() -> list[tuple[str, str]]:
+    root = profiles_root_dir()
+    ensure_dir(root)
+    out = []
+    try:
+        for name in os.listdir(root):
+            p = os.path.join(root, name)
+            if os.path.isdir(p):
+                out.append((name, p))
+    except Exception:
+        pass
+    out.sort(key=lambda x: x[0].lower())
+    return out
+
+
+def sanitize_profile_name(name: str) -> str:
+    bad = '<>:"/\\|?*'
+    name = (name or "").strip()
+    for ch in bad:
+        name = name.replace(ch, "")
+    name = name.strip().strip(".")
+    return name
@@ -0,0 +1,618 @@
+"""Candidate feed: proxy providers, ordering, exit-IP dedupe and DNS resolution."""
+
+import time
+import os
+import heapq
+import threading
+import socket
+import ipaddress
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from common import TRACER, DaemonPool, requests
+
+
+# NEW: built-in provider
+PROXYSCRAPE_URL = (
+    "https://api.proxyscrape.com/v4/free-proxy-list/get"
+    "?request=display_proxies&proxy_format=ipport&format=text&timeout=5000"
+)
+
+
+# ===================== Proxy providers =====================
+def parse_proxy_line(line: str):
+    raw = line.strip()
+    if not raw or raw.startswith("#"):
+        return None
+    parts = raw.split(":")
+    if len(parts) == 2:
+        host, port = parts
+        return {"host": host.strip(), "port": port.strip(), "user": "", "pass": "", "raw": raw}
+    if len(parts) >= 4:
+        host, port, user = parts[0], parts[1], parts[2]
+        pwd = ":".join(parts[3:])
+        return {"host": host.strip(), "port": port.strip(), "user": user.strip(), "pass": pwd.strip(), "raw": raw}
+    return None
+
+
+def fetch_proxyscrape_list(timeout_s: int = 15) -> tuple[bool, list[str], str]:
+    """Fetch ip:port lines from ProxyScrape endpoint."""
+    try:
+        r = requests.get(PROXYSCRAPE_URL, timeout=timeout_s)
+        if r.status_code != 200:
+            return False, [], f"HTTP {r.status_code}"
+        txt = (r.text or "").strip()
+        lines = [ln.strip() for ln in txt.splitlines() if ln.strip()]
+        return True, lines, ""
+    except requests.exceptions.ConnectTimeout:
+        return False, [], "ConnectTimeout"
+    except requests.exceptions.ReadTimeout:
+        return False, [], "ReadTimeout"
+    except requests.exceptions.RequestException as e:
+        return False, [], f"RequestException:{type(e).__name__}"
+    except Exception as e:
+        return False, [], f"Exception:{type(e).__name__}"
+
+
+PROVIDER_PROXYSCRAPE = "proxyscrape"
+PROVIDER_URL = "url"
+PROVIDER_FILE = "file"
+PROVIDER_TEXTBOX = "textbox"
+
+DEFAULT_PROVIDER_SPECS = PROVIDER_PROXYSCRAPE
+
+
+def parse_provider_specs(text: str) -> list[dict]:
+    """
+    One provider per line:
+    - proxyscrape        -> built-in ProxyScrape list
+    - http(s)://...      -> user-defined URL returning host:port lines
+    - anything else      -> local file path
+    """
+    out = []
+    seen = set()
+    for ln in (text or "").splitlines():
+        spec = ln.strip()
+        if not spec or spec.startswith("#"):
+            continue
+        low = spec.lower()
+        if low == PROVIDER_PROXYSCRAPE:
+            prov = {"kind": PROVIDER_PROXYSCRAPE, "target": PROXYSCRAPE_URL, "name": "ProxyScrape"}
+        elif low.startswith(("http://", "https://")):
+            prov = {"kind": PROVIDER_URL, "target": spec, "name": spec}
+        else:
+            prov = {"kind": PROVIDER_FILE, "target": spec, "name": os.path.basename(spec) or spec}
+        if prov["target"] in seen:
+            continue
+        seen.add(prov["target"])
+        out.append(prov)
+    return out
+
+
+def proxy_dedupe_key(p: dict) -> str:
+    return f'{p["host"]}:{p["port"]}:{p["user"]}'.lower()
+
+
+class FifoOrder:
+    """Pending candidates in arrival order (file order for the textbox)."""
+
+    def __init__(self):
+        self._items = deque()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, item) -> None:
+        self._items.append(item)
+
+    def pop(self):
+        return self._items.popleft()
+
+    def record(self, p: dict, ok: bool, err: str = "") -> None:
+        pass
+
+
+def ipv4_subnet24(host: str) -> str:
+    parts = host.split(".")
+    if len(parts) == 4 and all(x.isdigit() for x in parts):
+        return ".".join(parts[:3]) + ".0/24"
+    return host.lower()
+
+
+def error_class(err: str) -> str:
+    """Collapse ipinfo_request error strings into a small set of classes."""
+    if not err:
+        return ""
+    if err.startswith("HTTP "):
+        return "HTTP"
+    return err.split(":", 1)[0]
+
+
+class CandidateScheduler:
+    """Orders pending candidates by an in-run estimate of their success probability."""
+
+    PRIOR_WEIGHT = 4.0
+    MAX_RESCORE = 32
+
+    def __init__(self):
+        self._buckets: dict[tuple, deque] = {}
+        self._heap = []
+        self._version: dict[tuple, int] = {}
+        self._seq = 0
+        self._size = 0
+        self._ok = 0
+        self._fail = 0
+        self._by = {"source": {}, "subnet": {}, "port": {}}
+        self._last_err: dict[str, str] = {}
+        self._err_follow: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _bucket_key(p: dict) -> tuple:
+        return p.get("source", ""), ipv4_subnet24(p.get("addr") or p["host"]), p["port"]
+
+    def _global_rate(self) -> float:
+        # start pessimistic: free lists are mostly dead
+        return (self._ok + 1.0) / (self._ok + self._fail + 5.0)
+
+    def _lift(self, stats: dict, key) -> float:
+        okfail = stats.get(key)
+        if not okfail:
+            return 1.0
+        g = self._global_rate()
+        ok, fail = okfail
+        rate = (ok + self.PRIOR_WEIGHT * g) / (ok + fail + self.PRIOR_WEIGHT)
+        return rate / g
+
+    def score(self, key: tuple) -> float:
+        source, subnet, port = key
+        s = self._global_rate()
+        s *= self._lift(self._by["source"], source)
+        s *= self._lift(self._by["subnet"], subnet)
+        s *= self._lift(self._by["port"], port)
+        last = self._last_err.get(subnet)
+        if last:
+            s *= self._lift(self._err_follow, last)
+        return s
+
+    def _push_bucket(self, key: tuple) -> None:
+        ver = self._version.get(key, 0) + 1
+        self._version[key] = ver
+        self._seq += 1
+        heapq.heappush(self._heap, (-self.score(key), self._seq, key, ver))
+
+    def push(self, item) -> None:
+        key = self._bucket_key(item[2])
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = deque()
+        bucket.append(item)
+        self._size += 1
+        if len(bucket) == 1:
+            self._push_bucket(key)
+
+    def pop(self):
+        best = None
+        for _ in range(self.MAX_RESCORE):
+            if not self._heap:
+                break
+            neg, _, key, ver = heapq.heappop(self._heap)
+            if ver != self._version.get(key) or not self._buckets.get(key):
+                continue
+            fresh = self.score(key)
+            if best is None or fresh > best[0]:
+                if best is not None:
+                    self._push_bucket(best[1])
+                best = (fresh, key)
+            else:
+                self._push_bucket(key)
+            if not self._heap or best[0] >= -self._heap[0][0]:
+                break
+        if best is None:
+            raise IndexError("pop from empty scheduler")
+
+        key = best[1]
+        bucket = self._buckets[key]
+        item = bucket.popleft()
+        self._size -= 1
+        if bucket:
+            self._push_bucket(key)
+        else:
+            del self._buckets[key]
+        return item
+
+    def record(self, p: dict, ok: bool, err: str = "") -> None:
+        source, subnet, port = self._bucket_key(p)
+        idx = 0 if ok else 1
+        if ok:
+            self._ok += 1
+        else:
+            self._fail += 1
+        for name, key in (("source", source), ("subnet", subnet), ("port", port)):
+            okfail = self._by[name].setdefault(key, [0, 0])
+            okfail[idx] += 1
+
+        prev = self._last_err.get(subnet)
+        if prev:
+            self._err_follow.setdefault(prev, [0, 0])[idx] += 1
+        if ok:
+            self._last_err.pop(subnet, None)
+        else:
+            self._last_err[subnet] = error_class(err) or "Unknown"
+
+        # refresh the touched bucket right away so a live subnet jumps ahead
+        if (source, subnet, port) in self._buckets:
+            self._push_bucket((source, subnet, port))
+
+
+class AliveClock:
+    """Time-to-first-alive / time-to-N-alive for a checker run (monotonic clock)."""
+
+    MILESTONES = (1, 5, 10, 20, 50)
+
+    def __init__(self):
+        self.t0 = time.monotonic()
+        self.checked = 0
+        self.alive = 0
+        self.marks: dict[int, tuple[float, int]] = {}
+
+    def record(self, ok: bool) -> None:
+        self.checked += 1
+        if ok:
+            self.alive += 1
+            if self.alive in self.MILESTONES:
+                self.marks[self.alive] = (time.monotonic() - self.t0, self.checked)
+
+    def summary(self) -> str:
+        if not self.marks:
+            return f"No alive proxy after {self.checked} checks ({time.monotonic() - self.t0:.1f}s)"
+        parts = [f"#{n}: {secs:.1f}s/{checks} checks" for n, (secs, checks) in sorted(self.marks.items())]
+        return "Time to alive - " + ", ".join(parts)
+
+
+EXIT_DEDUPE_SPOT_CHECK_EVERY = 5
+EXIT_DUP_STATUS = "DUP"
+
+
+class ExitIpIndex:
+    """Exit IPs confirmed during a run; candidates behind a trusted front address or /24 are sampled."""
+
+    TRUST_AFTER = 2
+
+    def __init__(self, spot_check_every: int = EXIT_DEDUPE_SPOT_CHECK_EVERY):
+        self.spot_check_every = max(1, spot_check_every)
+        self._lock = threading.Lock()
+        self._exits: set[str] = set()
+        self._keys: dict[str, list] = {}  # "exit:<ip>" / "front:<ip>" / "net:<ip/24>" -> [exit ip, confirmations, hits]
+        self._multi: set[str] = set()
+        self.sampled = 0
+
+    @staticmethod
+    def _key_names(p: dict) -> tuple[str, str, str]:
+        front = p.get("addr") or p["host"]
+        return front, f"front:{front}", f"net:{ipv4_subnet24(front)}"
+
+    def sample(self, p: dict) -> str | None:
+        """Known exit IP to count this candidate against, or None to check it in full."""
+        front, fkey, nkey = self._key_names(p)
+        with self._lock:
+            if fkey in self._multi:
+                return None
+            for key in (f"exit:{front}", fkey, nkey):
+                if key in self._multi:
+                    return None
+                entry = self._keys.get(key)
+                if entry is None:
+                    continue
+                if entry[1] < self.TRUST_AFTER:
+                    return None
+                entry[2] += 1
+                if entry[2] % self.spot_check_every == 0:
+                    return None
+                self.sampled += 1
+                return entry[0]
+            return None
+
+    def record(self, p: dict, exit_ip: str) -> bool:
+        """Note an alive proxy's exit IP; True if that exit was already known (a duplicate)."""
+        if not exit_ip or exit_ip == "-":
+            return False
+        _, fkey, nkey = self._key_names(p)
+        with self._lock:
+            for key in (fkey, nkey):
+                if key in self._multi:
+                    continue
+                entry = self._keys.get(key)
+                if entry is None:
+                    self._keys[key] = [exit_ip, 1, 0]
+                elif entry[0] == exit_ip:
+                    entry[1] += 1
+                else:
+                    self._multi.add(key)
+                    del self._keys[key]
+            entry = self._keys.setdefault(f"exit:{exit_ip}", [exit_ip, 0, 0])
+            entry[1] += 1
+            known = exit_ip in self._exits
+            self._exits.add(exit_ip)
+            return known
+
+
+def is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def _default_resolve(host: str) -> str | None:
+    infos = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)
+    return infos[0][4][0] if infos else None
+
+
+class HostResolver:
+    """Concurrent hostname -> IPv4 resolution with a TTL cache and shared in-flight lookups."""
+
+    def __init__(self, resolve_fn=None, ttl_s: float = 300.0, negative_ttl_s: float = 60.0, max_workers: int = 16):
+        self.resolve_fn = resolve_fn or _default_resolve
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._cache: dict[str, tuple[str | None, float]] = {}
+        self._inflight: dict[str, list] = {}
+        self._pool = None
+        self.lookups = 0
+        self.cache_hits = 0
+
+    def cached(self, host: str) -> tuple[bool, str | None]:
+        host = host.lower()
+        with self._lock:
+            hit = self._cache.get(host)
+            if hit is not None and hit[1] > time.monotonic():
+                self.cache_hits += 1
+                return True, hit[0]
+        return False, None
+
+    def _store(self, host: str, ip: str | None) -> None:
+        ttl = self.ttl_s if ip else self.negative_ttl_s
+        self._cache[host] = (ip, time.monotonic() + ttl)
+
+    def _lookup(self, host: str) -> None:
+        try:
+            ip = self.resolve_fn(host)
+        except (OSError, UnicodeError):
+            ip = None
+        with self._lock:
+            self.lookups += 1
+            self._store(host, ip)
+            callbacks = self._inflight.pop(host, [])
+        for cb in callbacks:
+            cb(ip)
+
+    def resolve_async(self, host: str, callback) -> None:
+        """Call callback(ip | None), synchronously on a cache hit, else from a resolver thread."""
+        if is_ip_literal(host):
+            callback(host)
+            return
+        hit, ip = self.cached(host)
+        if hit:
+            callback(ip)
+            return
+        host = host.lower()
+        with self._lock:
+            waiting = self._inflight.get(host)
+            if waiting is not None:
+                waiting.append(callback)
+                return
+            self._inflight[host] = [callback]
+            if self._pool is None:
+                self._pool = DaemonPool(self.max_workers, thread_name_prefix="dns")
+            pool = self._pool
+        pool.submit(lambda: self._lookup(host))
+
+    def close(self) -> None:
+        """Fail every pending lookup with None; a lookup stuck in getaddrinfo dies with the process."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            pending, self._inflight = self._inflight, {}
+        for callbacks in pending.values():
+            for cb in callbacks:
+                cb(None)
+        if pool is not None:
+            pool.shutdown()
+
+    def resolve(self, host: str, timeout_s: float | None = None) -> str | None:
+        done = threading.Event()
+        box = []
+
+        def cb(ip):
+            box.append(ip)
+            done.set()
+
+        self.resolve_async(host, cb)
+        done.wait(timeout_s)
+        return box[0] if box else None
+
+
+DNS_RESOLVER = HostResolver()
+
+
+class CandidateFeed:
+    """Thread-safe, de-duplicating queue between provider fetchers and the checker."""
+
+    def __init__(self, order=None, resolver: HostResolver | None = None, on_drop=None):
+        self._cond = threading.Condition()
+        self._pending = order if order is not None else FifoOrder()
+        self.resolver = resolver
+        self.on_drop = on_drop or (lambda line_idx: None)
+        self._seen = set()
+        self._seen_addr = set()
+        self._open_sources = 0
+        self._resolving = 0
+        self._finished = False
+        self.stop_event = threading.Event()
+        self.accepted = 0
+        self.duplicates = 0
+        self.collapsed = 0
+        self.unresolved = 0
+
+    def open_sources(self, count: int) -> None:
+        with self._cond:
+            self._open_sources += count
+            self._maybe_finish_locked()
+
+    def close_source(self) -> None:
+        with self._cond:
+            self._open_sources -= 1
+            self._maybe_finish_locked()
+
+    def _maybe_finish_locked(self) -> None:
+        if self._open_sources <= 0 and self._resolving <= 0:
+            self._finished = True
+            self._cond.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished
+
+    def put_line(self, line: str, source: str, line_idx: int | None = None) -> bool:
+        with TRACER.span("parse", "feed"):
+            p = parse_proxy_line(line)
+        if not p:
+            return False
+        key = proxy_dedupe_key(p)
+        p["source"] = source
+        with self._cond:
+            if key in self._seen:
+                self.duplicates += 1
+                accepted = False
+            elif self.resolver is None or is_ip_literal(p["host"]):
+                self._seen.add(key)
+                p["addr"] = p["host"]
+                accepted = self._accept_locked((line_idx, line.strip(), p))
+            else:
+                self._seen.add(key)
+                self._resolving += 1
+                accepted = None  # decided once the hostname resolves
+        if accepted is not None:
+            if not accepted:
+                self.on_drop(line_idx)
+            return accepted
+
+        def on_resolved(ip):
+            with self._cond:
+                self._resolving -= 1
+                if ip:
+                    p["addr"] = ip
+                    accepted = self._accept_locked((line_idx, line.strip(), p))
+                else:
+                    self.unresolved += 1
+                    accepted = False
+                self._maybe_finish_locked()
+            if not accepted:
+                self.on_drop(line_idx)
+
+        self.resolver.resolve_async(p["host"], on_resolved)
+        return True
+
+    def _accept_locked(self, item) -> bool:
+        p = item[2]
+        addr_key = f'{p["addr"]}:{p["port"]}:{p["user"]}'.lower()
+        if addr_key in self._seen_addr:
+            self.collapsed += 1
+            return False
+        self._seen_addr.add(addr_key)
+        self.accepted += 1
+        self._pending.push(item)
+        self._cond.notify()
+        return True
+
+    def requeue(self, item) -> None:
+        """Put back an item whose check was lost (e.g. a remote worker dropped)."""
+        with self._cond:
+            self._pending.push(item)
+            self._cond.notify()
+
+    def preload_seen(self, keys) -> None:
+        """Treat keys as already handled (e.g. tested in a resumed run)."""
+        with self._cond:
+            self._seen.update(keys)
+
+    def get(self):
+        with self._cond:
+            while not len(self._pending):
+                if self._finished or self.stop_event.is_set():
+                    return None
+                self._cond.wait()
+            if self.stop_event.is_set():
+                return None
+            return self._pending.pop()
+
+    def record_result(self, p: dict, ok: bool, err: str = "") -> None:
+        with self._cond:
+            self._pending.record(p, ok, err)
+
+    def stop(self) -> None:
+        """Ask fetchers to stop early (stop_first found an alive proxy, or the run was cancelled)."""
+        self.stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+
+def _pump_provider(provider: dict, feed: CandidateFeed, timeout_s: int, on_log=None) -> None:
+    name = provider["name"]
+    count = 0
+    err = ""
+    try:
+        if provider["kind"] == PROVIDER_FILE:
+            with open(provider["target"], "r", encoding="utf-8", errors="ignore") as f:
+                for ln in f:
+                    if feed.stop_event.is_set():
+                        break
+                    if feed.put_line(ln, name):
+                        count += 1
+        else:
+            # stream=True lets the checker start on the first lines instead of waiting for the whole body
+            with requests.get(provider["target"], timeout=timeout_s, stream=True) as r:
+                if r.status_code != 200:
+                    err = f"HTTP {r.status_code}"
+                else:
+                    for ln in r.iter_lines(decode_unicode=True):
+                        if feed.stop_event.is_set():
+                            break
+                        if ln and feed.put_line(ln, name):
+                            count += 1
+    except requests.exceptions.ConnectTimeout:
+        err = "ConnectTimeout"
+    except requests.exceptions.ReadTimeout:
+        err = "ReadTimeout"
+    except requests.exceptions.RequestException as e:
+        err = f"RequestException:{type(e).__name__}"
+    except OSError as e:
+        err = f"OSError:{type(e).__name__}"
+    except Exception as e:
+        err = f"Exception:{type(e).__name__}"
+    finally:
+        feed.close_source()
+
+    if on_log:
+        if err:
+            on_log(f"[provider] {name} - ERROR({err}) after {count} proxies", logging.WARNING)
+        else:
+            on_log(f"[provider] {name} - {count} new proxies")
+
+
+def start_provider_fetch(providers: list[dict], feed: CandidateFeed, timeout_s: int = 20,
+                         on_log=None) -> ThreadPoolExecutor | None:
+    """Fetch all providers concurrently into feed. Returns the executor (already shut down for new work)."""
+    if not providers:
+        return None
+    pool = ThreadPoolExecutor(max_workers=min(8, len(providers)), thread_name_prefix="provider")
+    for prov in providers:
+        pool.submit(_pump_provider, prov, feed, timeout_s, on_log)
+    pool.shutdown(wait=False)
+    return pool
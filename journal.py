@@ -0,0 +1,91 @@
+"""Crash-resumable run journal."""
+
+import time
+import os
+import json
+import threading
+
+
+AUTO_JOURNAL_FILENAME = "auto_run_journal.jsonl"
+AUTO_JOURNAL_FLUSH_RECORDS = 50
+AUTO_JOURNAL_FLUSH_SECONDS = 2.0
+
+
+# ===================== Run journal =====================
+class RunJournal:
+    """Buffered append-only JSONL journal of a checker run, kept for resume unless the run completes."""
+
+    def __init__(self, profile_dir: str):
+        self.path = os.path.join(profile_dir, AUTO_JOURNAL_FILENAME)
+        self._f = None
+        self._buf = []
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def load(self) -> tuple[dict, list[tuple[str, dict]]] | None:
+        """Return (header, [(key, rec), ...]) of an unfinished run, or None."""
+        if not os.path.isfile(self.path):
+            return None
+        header = None
+        done = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for ln in f:
+                    try:
+                        obj = json.loads(ln)
+                    except ValueError:
+                        continue  # torn last line after a crash
+                    kind = obj.get("type")
+                    if kind == "run":
+                        header = obj
+                    elif kind == "result" and obj.get("key"):
+                        done.append((obj["key"], obj.get("rec") or {}))
+                    elif kind == "done":
+                        return None
+        except OSError:
+            return None
+        if header is None:
+            return None
+        return header, done
+
+    def begin(self, header: dict, resumed: list[tuple[str, dict]] | None = None) -> None:
+        """Start a fresh journal file, carrying over results of a resumed run."""
+        with self._lock:
+            self._f = open(self.path, "w", encoding="utf-8")
+            self._f.write(json.dumps({"type": "run", "started": time.time(), **header}) + "\n")
+            for key, rec in resumed or []:
+                self._f.write(json.dumps({"type": "result", "key": key, "rec": rec}) + "\n")
+            self._f.flush()
+            self._last_flush = time.monotonic()
+
+    def record(self, key: str, rec: dict) -> None:
+        with self._lock:
+            if self._f is None:
+                return
+            self._buf.append(json.dumps({"type": "result", "key": key, "rec": rec}))
+            if (len(self._buf) >= AUTO_JOURNAL_FLUSH_RECORDS
+                    or time.monotonic() - self._last_flush >= AUTO_JOURNAL_FLUSH_SECONDS):
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buf:
+            self._f.write("\n".join(self._buf) + "\n")
+            self._buf = []
+        self._f.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self, completed: bool) -> None:
+        with self._lock:
+            if self._f is None:
+                return
+            self._flush_locked()
+            self._f.close()
+            self._f = None
+        if completed:
+            self.discard()
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,239 @@
+"""Browser profiling engine (Playwright) and its page-load report."""
+
+import time
+import os
+import json
+import threading
+import random
+from datetime import datetime
+
+from common import asyncio, ensure_dir, load_config, percentile
+
+
+PROFILING_DEFAULT_MINUTES = 15
+PROFILING_PROFILE_DIRNAME = "Browser Profiling"
+PROFILING_DEFAULT_CONCURRENCY = 4
+PROFILING_DEFAULT_PAGES_PER_PROFILE = 2
+PROFILING_BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+PROFILING_REPORT_FILENAME = "profiling_report.jsonl"
+PROFILING_SUMMARY_FILENAME = "profiling_summary.json"
+
+BROWSER_PROFILING_URLS = [
+    "https://openai.com/",
+    "https://www.anthropic.com/",
+    "https://ai.google/",
+    "https://huggingface.co/",
+    "https://pandas.pydata.org/",
+    "https://numpy.org/",
+    "https://scikit-learn.org/",
+    "https://cloud.google.com/",
+    "https://aws.amazon.com/",
+    "https://azure.microsoft.com/",
+    "https://playwright.dev/",
+    "https://www.selenium.dev/",
+    "https://docs.python.org/3/library/asyncio.html",
+    "https://developer.mozilla.org/",
+]
+
+
+# ===================== Browser profiling engine =====================
+# Navigation Timing Level 2; cross-origin resources without Timing-Allow-Origin report transferSize 0
+_NAV_TIMING_JS = """() => {
+    const n = performance.getEntriesByType('navigation')[0];
+    if (!n) return null;
+    const res = performance.getEntriesByType('resource');
+    let bytes = n.transferSize || 0;
+    for (const r of res) bytes += r.transferSize || 0;
+    return {
+        dns_ms: n.domainLookupEnd - n.domainLookupStart,
+        connect_ms: n.connectEnd - n.connectStart,
+        tls_ms: n.secureConnectionStart > 0 ? n.connectEnd - n.secureConnectionStart : 0,
+        ttfb_ms: n.responseStart - n.requestStart,
+        dcl_ms: n.domContentLoadedEventEnd - n.startTime,
+        load_ms: n.loadEventEnd - n.startTime,
+        bytes: bytes,
+        resources: res.length,
+        http_status: n.responseStatus || 0,
+    };
+}"""
+
+PROFILING_TIMING_FIELDS = ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "dcl_ms", "load_ms", "nav_ms", "bytes")
+
+
+class ProfilingReport:
+    """Per-profile page-load report: JSONL per visit, per-URL percentiles on close."""
+
+    def __init__(self, profile_dir: str, proxy: str = ""):
+        self.profile_dir = profile_dir
+        self.proxy = proxy
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.visits: list[dict] = []
+        self._f = open(os.path.join(profile_dir, PROFILING_REPORT_FILENAME), "a", encoding="utf-8")
+
+    def add(self, visit: dict) -> None:
+        visit = {"run": self.run_id, "ts": time.time(), "proxy": self.proxy, **visit}
+        self.visits.append(visit)
+        self._f.write(json.dumps(visit) + "\n")
+        self._f.flush()
+
+    def summary(self) -> dict:
+        by_url: dict[str, list[dict]] = {}
+        for v in self.visits:
+            by_url.setdefault(v["url"], []).append(v)
+
+        urls = {}
+        for url, visits in by_url.items():
+            ok = [v for v in visits if v.get("ok")]
+            entry = {"visits": len(visits), "failures": len(visits) - len(ok),
+                     "errors": sorted({v.get("error", "") for v in visits if not v.get("ok")})}
+            for field in PROFILING_TIMING_FIELDS:
+                vals = [v[field] for v in ok if isinstance(v.get(field), (int, float))]
+                if vals:
+                    entry[field] = {"p50": round(percentile(vals, 50), 1), "p90": round(percentile(vals, 90), 1),
+                                    "p95": round(percentile(vals, 95), 1), "max": max(vals)}
+            urls[url] = entry
+        return {"run": self.run_id, "proxy": self.proxy, "profile": self.profile_dir,
+                "visits": len(self.visits), "urls": urls}
+
+    def close(self) -> None:
+        try:
+            self._f.close()
+        finally:
+            if self.visits:
+                with open(os.path.join(self.profile_dir, PROFILING_SUMMARY_FILENAME), "w", encoding="utf-8") as f:
+                    json.dump(self.summary(), f, indent=2)
+
+
+async def _profiling_visit(page, url: str) -> dict:
+    t0 = time.monotonic()
+    try:
+        resp = await page.goto(url, wait_until="load", timeout=60000)
+    except Exception as e:
+        return {"url": url, "ok": False, "error": type(e).__name__, "detail": (str(e).splitlines() or [""])[0][:200],
+                "nav_ms": int((time.monotonic() - t0) * 1000)}
+
+    visit = {"url": url, "ok": True, "nav_ms": int((time.monotonic() - t0) * 1000),
+             "status": resp.status if resp is not None else 0}
+    try:
+        timing = await page.evaluate(_NAV_TIMING_JS)
+        if timing:
+            visit.update({k: (round(v, 1) if isinstance(v, float) else v) for k, v in timing.items()})
+    except Exception as e:
+        visit["timing_error"] = type(e).__name__
+    return visit
+
+
+def profile_playwright_proxy(profile_dir: str) -> dict | None:
+    """Playwright proxy settings from the profile's launcher config (proxy_hostport + optional auth)."""
+    cfg = load_config(profile_dir)
+    hp = (cfg.get("proxy_hostport") or "").strip()
+    if not hp:
+        return None
+    proxy = {"server": f"http://{hp}"}
+    auth_hp = f'{(cfg.get("proxy_host") or "").strip()}:{(cfg.get("proxy_port") or "").strip()}'
+    if auth_hp == hp and (cfg.get("proxy_user") or "").strip():
+        proxy["username"] = cfg["proxy_user"].strip()
+        proxy["password"] = (cfg.get("proxy_pass") or "").strip()
+    return proxy
+
+
+async def _route_block_heavy(route):
+    if route.request.resource_type in PROFILING_BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _profiling_page_loop(page, urls: list[str], end_time: float, visit_sem: "asyncio.Semaphore",
+                               label: str, ui_status, stop_event: threading.Event,
+                               report: ProfilingReport) -> None:
+    rnd = random.Random()
+    idx = rnd.randrange(len(urls))
+    while time.monotonic() < end_time and not stop_event.is_set():
+        url = urls[idx % len(urls)]
+        idx += 1
+        # the cap covers navigation + reading, so at most `concurrency` pages are active at once
+        async with visit_sem:
+            ui_status(f"[{label}] Visiting {url}")
+            visit = await _profiling_visit(page, url)
+            report.add(visit)
+            if not visit["ok"]:
+                ui_status(f"[{label}] Failed {url}: {visit['error']}")
+                continue
+
+            await page.wait_for_timeout(int(rnd.uniform(2, 5) * 1000))
+            for _ in range(rnd.randint(3, 7)):
+                await page.mouse.wheel(0, rnd.randint(400, 1200))
+                await page.wait_for_timeout(rnd.randint(400, 1200))
+
+        await asyncio.sleep(rnd.uniform(2, 8))
+
+
+async def _profiling_session(pw, profile_dir: str, urls: list[str], end_time: float,
+                             visit_sem: "asyncio.Semaphore", pages_per_profile: int, block_heavy: bool,
+                             headless: bool, ui_status, stop_event: threading.Event) -> None:
+    user_data_dir = os.path.join(profile_dir, PROFILING_PROFILE_DIRNAME)
+    ensure_dir(user_data_dir)
+    label = os.path.basename(os.path.normpath(profile_dir))
+
+    kwargs = {"user_data_dir": user_data_dir, "headless": headless, "viewport": {"width": 1280, "height": 720}}
+    proxy = profile_playwright_proxy(profile_dir)
+    if proxy:
+        kwargs["proxy"] = proxy
+
+    report = ProfilingReport(profile_dir, proxy["server"] if proxy else "")
+    try:
+        context = await pw.chromium.launch_persistent_context(**kwargs)
+    except Exception:
+        report.close()
+        raise
+    try:
+        if block_heavy:
+            await context.route("**/*", _route_block_heavy)
+        pages = list(context.pages[:pages_per_profile])
+        while len(pages) < pages_per_profile:
+            pages.append(await context.new_page())
+        await asyncio.gather(*(
+            _profiling_page_loop(page, urls, end_time, visit_sem, label, ui_status, stop_event, report)
+            for page in pages
+        ))
+    finally:
+        try:
+            await context.close()
+        finally:
+            report.close()
+
+
+async def run_profiling_engine_async(profile_dirs: list[str], duration_min: float, urls: list[str] | None = None,
+                                     concurrency: int = PROFILING_DEFAULT_CONCURRENCY,
+                                     pages_per_profile: int = PROFILING_DEFAULT_PAGES_PER_PROFILE,
+                                     block_heavy: bool = False, headless: bool = False,
+                                     ui_status=None, stop_event: threading.Event | None = None) -> list[str]:
+    """Warm every profile; returns one "<profile>: <error>" line per failed profile, raises if all failed."""
+    from playwright.async_api import async_playwright
+
+    urls = list(urls or BROWSER_PROFILING_URLS)
+    ui_status = ui_status or (lambda msg: None)
+    stop_event = stop_event or threading.Event()
+    # one persistent context per user-data dir; Chromium refuses to open the same dir twice
+    profile_dirs = list(dict.fromkeys(os.path.abspath(p) for p in profile_dirs))
+
+    end_time = time.monotonic() + duration_min * 60
+    visit_sem = asyncio.Semaphore(max(1, int(concurrency)))
+
+    async with async_playwright() as pw:
+        results = await asyncio.gather(*(
+            _profiling_session(pw, d, urls, end_time, visit_sem, max(1, int(pages_per_profile)),
+                               block_heavy, headless, ui_status, stop_event)
+            for d in profile_dirs
+        ), return_exceptions=True)
+
+    errors = [f"{os.path.basename(d)}: {r}" for d, r in zip(profile_dirs, results) if isinstance(r, Exception)]
+    if errors and len(errors) == len(profile_dirs):
+        raise RuntimeError("\n".join(errors))
+    return errors
+
+
+def run_profiling_engine(profile_dirs: list[str], duration_min: float, **kwargs) -> list[str]:
+    """Blocking wrapper; run it from a worker thread."""
+    return asyncio.run(run_profiling_engine_async(profile_dirs, duration_min, **kwargs))
@@ -0,0 +1,165 @@
+"""Bulk profile provisioning from a template profile."""
+
+import time
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from common import (
+    AUTO_LOG_FILENAME, TRACE_DIRNAME, ensure_dir, load_config, profiles_root_dir, sanitize_profile_name,
+    save_config
+)
+from journal import AUTO_JOURNAL_FILENAME
+from profiling import PROFILING_REPORT_FILENAME, PROFILING_SUMMARY_FILENAME
+
+
+# ===================== Bulk profile provisioning =====================
+PROVISION_COPY_WORKERS = 8
+PROVISION_DEFAULT_PREFIX = "Profile"
+# Chromium caches: the only files hardlink_caches may share between profiles (opt-in; see ProfileProvisioner)
+PROVISION_LINKABLE_DIRS = ("Cache", "Code Cache", "GPUCache", "ShaderCache", "GrShaderCache", "DawnCache",
+                           "DawnGraphiteCache", "DawnWebGPUCache", "component_crx_cache", "extensions_crx_cache")
+# never carried over: browser lock files and this tool's own per-profile files
+PROVISION_SKIP_NAMES = ("SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile", "launcher_config.json",
+                        AUTO_LOG_FILENAME, AUTO_JOURNAL_FILENAME, PROFILING_REPORT_FILENAME,
+                        PROFILING_SUMMARY_FILENAME, TRACE_DIRNAME)
+_FICLONE = 0x40049409  # Linux ioctl: share extents with copy-on-write (btrfs, xfs, ...)
+
+
+def _reflink(src: str, dst: str) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+
+
+def plan_template(template_dir: str) -> tuple[list[str], list[tuple[str, int, bool]]]:
+    """Relative dirs and (relative file, size, linkable) for a template profile, skipping locks/tool files."""
+    dirs, files = [], []
+    for root, dnames, fnames in os.walk(template_dir):
+        rel_root = os.path.relpath(root, template_dir)
+        parts = [] if rel_root == "." else rel_root.split(os.sep)
+        linkable = any(part in PROVISION_LINKABLE_DIRS for part in parts)
+        dnames[:] = [d for d in dnames if d not in PROVISION_SKIP_NAMES]
+        for d in dnames:
+            dirs.append(os.path.join(*parts, d))
+        for f in fnames:
+            if f in PROVISION_SKIP_NAMES:
+                continue
+            rel = os.path.join(*parts, f)
+            try:
+                size = os.path.getsize(os.path.join(template_dir, rel))
+            except OSError:
+                continue
+            files.append((rel, size, linkable))
+    return dirs, files
+
+
+class ProfileProvisioner:
+    """Clones a template profile by reflink or copy; hardlink_caches shares caches (opt-in)."""
+
+    def __init__(self, template_dir: str, workers: int = PROVISION_COPY_WORKERS, reflink: bool = True,
+                 hardlink_caches: bool = False):
+        self.template_dir = template_dir
+        self.workers = workers
+        self.hardlink_caches = hardlink_caches
+        self._can_reflink = reflink
+        self._can_hardlink = hardlink_caches
+        self.dirs, self.files = plan_template(template_dir)
+
+    def _clone_file(self, rel: str, size: int, linkable: bool, dest_dir: str) -> str:
+        src = os.path.join(self.template_dir, rel)
+        dst = os.path.join(dest_dir, rel)
+        if self._can_reflink:
+            if _reflink(src, dst):
+                return "reflinked"
+            self._can_reflink = False
+        if linkable and self._can_hardlink:
+            try:
+                os.link(src, dst)
+                return "linked"
+            except OSError:
+                self._can_hardlink = False
+        shutil.copy2(src, dst)
+        return "copied"
+
+    def clone_into(self, dest_dir: str, pool: ThreadPoolExecutor) -> dict:
+        t0 = time.perf_counter()
+        ensure_dir(dest_dir)
+        for d in self.dirs:
+            ensure_dir(os.path.join(dest_dir, d))
+        stats = {"files": 0, "copied_bytes": 0, "linked_bytes": 0, "reflinked_bytes": 0, "errors": 0}
+        futures = [(size, pool.submit(self._clone_file, rel, size, linkable, dest_dir))
+                   for rel, size, linkable in self.files]
+        for size, fut in futures:
+            try:
+                how = fut.result()
+            except OSError:
+                stats["errors"] += 1
+                continue
+            stats["files"] += 1
+            stats[f"{how}_bytes"] += size
+        stats["seconds"] = round(time.perf_counter() - t0, 3)
+        return stats
+
+
+def next_profile_names(prefix: str, count: int, existing) -> list[str]:
+    taken = {n.lower() for n in existing}
+    names, i = [], 1
+    while len(names) < count:
+        name = sanitize_profile_name(f"{prefix} {i:03d}")
+        if name.lower() not in taken:
+            names.append(name)
+        i += 1
+    return names
+
+
+def provision_profiles(template_dir: str, count: int, prefix: str = PROVISION_DEFAULT_PREFIX,
+                       proxies: list[dict] | None = None, root_dir: str | None = None,
+                       reflink: bool = True, hardlink_caches: bool = False, on_progress=None) -> list[dict]:
+    """Create `count` profiles from template_dir, each with its own proxy; one report per profile."""
+    root_dir = root_dir or profiles_root_dir()
+    ensure_dir(root_dir)
+    names = next_profile_names(prefix, count, os.listdir(root_dir))
+    prov = ProfileProvisioner(template_dir, reflink=reflink, hardlink_caches=hardlink_caches)
+    base_cfg = load_config(template_dir)
+    proxies = proxies or []
+    reports = []
+    with ThreadPoolExecutor(max_workers=prov.workers, thread_name_prefix="provision") as pool:
+        for i, name in enumerate(names):
+            dest = os.path.join(root_dir, name)
+            stats = prov.clone_into(dest, pool)
+            cfg = dict(base_cfg, profile_dir=dest)
+            p = proxies[i] if i < len(proxies) else None
+            cfg.update(
+                proxy_hostport=f"{p['host']}:{p['port']}" if p else "",
+                proxy_host=p["host"] if p else "", proxy_port=p["port"] if p else "",
+                proxy_user=p.get("user", "") if p else "", proxy_pass=p.get("pass", "") if p else "",
+            )
+            save_config(dest, cfg)
+            report = dict(stats, name=name, dir=dest, proxy=cfg["proxy_hostport"])
+            reports.append(report)
+            if on_progress:
+                on_progress(i + 1, len(names), report)
+    return reports
+
+
+def format_bytes(n: float) -> str:
+    if n < 1024:
+        return f"{n:.0f} B"
+    for unit in ("KB", "MB"):
+        n /= 1024
+        if n < 1024:
+            return f"{n:.1f} {unit}"
+    return f"{n / 1024:.1f} GB"
@@ -0,0 +1,345 @@
+"""In-memory proxy index and the local query daemon that serves it."""
+
+import time
+import os
+import json
+import heapq
+import threading
+import hmac
+import stat
+import bisect
+from collections import Counter
+from urllib.parse import urlsplit, parse_qsl
+
+from feed import proxy_dedupe_key
+
+
+# ===================== Query daemon =====================
+QUERY_DAEMON_DEFAULT_LISTEN = "127.0.0.1:8766"
+QUERY_LEASE_DEFAULT_S = 600.0
+QUERY_LEASE_MAX_S = 3600.0
+QUERY_MAX_LIMIT = 100
+QUERY_MAX_HEADER_LINES = 64
+QUERY_MAX_LINE_BYTES = 8192
+QUERY_IO_TIMEOUT_S = 10
+QUERY_INDEX_FIELDS = ("country", "iana_tz", "win_tz", "protocol")
+QUERY_RECORD_KEYS = ("host", "port", "user", "pass", "ip", "country", "iana_tz", "win_tz", "latency_ms",
+                     "p50_ms", "p95_ms", "jitter_ms", "kbps", "source")
+
+
+def parse_proxy_query(params: dict) -> dict:
+    """Query-string params -> ProxyIndex query; ValueError on bad numbers."""
+    q = {}
+    if params.get("country"):
+        q["country"] = params["country"].upper()
+    if params.get("tz"):
+        q["iana_tz"] = params["tz"]
+    for name in ("win_tz", "protocol"):
+        if params.get(name):
+            q[name] = params[name]
+    if params.get("max_ms"):
+        q["max_ms"] = float(params["max_ms"])
+    if params.get("unused_for"):
+        q["unused_for_s"] = float(params["unused_for"])
+    q["limit"] = max(1, min(QUERY_MAX_LIMIT, int(params.get("limit") or 1)))
+    return q
+
+
+class ProxyIndex:
+    """Thread-safe in-memory index of verified proxies with leases, bucketed by QUERY_INDEX_FIELDS."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recs: dict[str, dict] = {}  # proxy_dedupe_key (host:port:user) -> record
+        self._all: list[tuple] = []  # sorted (rank, key)
+        self._buckets: dict[tuple, list[tuple]] = {}
+        self._leases: dict[str, list] = {}  # lease id -> [key, client, expires]
+        self._leased: dict[str, str] = {}  # key -> lease id
+        self._expiry: list[tuple] = []  # heap of (expires, lease id)
+        self._last_used: dict[str, float] = {}
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._recs)
+
+    # ---- records ----
+    def upsert(self, d: dict, origin: str = "") -> bool:
+        """Add or refresh a check result; anything but status OK is ignored."""
+        if d.get("status") != "OK":
+            return False
+        rec = {k: d.get(k) for k in QUERY_RECORD_KEYS}
+        rec["port"] = str(rec["port"])
+        rec["user"] = rec["user"] or ""
+        rec["country"] = (rec["country"] or "-").upper()
+        rec["protocol"] = d.get("protocol") or "http"
+        rec["origin"] = origin
+        rec["rank"] = d["p95_ms"] if d.get("p95_ms") is not None else int(d.get("latency_ms") or 0)
+        hp = proxy_dedupe_key(rec)
+        with self._lock:
+            self._remove_locked(hp)
+            self._recs[hp] = rec
+            entry = (rec["rank"], hp)
+            bisect.insort(self._all, entry)
+            for field in QUERY_INDEX_FIELDS:
+                bisect.insort(self._buckets.setdefault((field, rec[field]), []), entry)
+        return True
+
+    def remove(self, key: str) -> None:
+        """Drop the record for a proxy_dedupe_key() (host:port:user)."""
+        with self._lock:
+            self._remove_locked(key.lower())
+
+    def replace_origin(self, origin: str, dicts) -> None:
+        """Make the records of `origin` exactly `dicts` (e.g. the warm pool's current members)."""
+        keep = set()
+        for d in dicts:
+            if self.upsert(d, origin):
+                keep.add(proxy_dedupe_key(dict(d, user=d.get("user") or "")))
+        with self._lock:
+            for hp in [hp for hp, rec in self._recs.items() if rec["origin"] == origin and hp not in keep]:
+                self._remove_locked(hp)
+
+    def load_jsonl(self, path: str, origin: str = "file") -> int:
+        """Load check results written by --check-file; returns how many were indexed."""
+        n = 0
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                try:
+                    n += self.upsert(json.loads(line), origin)
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return n
+
+    def _remove_locked(self, hp: str) -> None:
+        rec = self._recs.pop(hp, None)
+        if rec is None:
+            return
+        entry = (rec["rank"], hp)
+        for lst in [self._all] + [self._buckets[(f, rec[f])] for f in QUERY_INDEX_FIELDS]:
+            i = bisect.bisect_left(lst, entry)
+            if i < len(lst) and lst[i] == entry:
+                del lst[i]
+
+    # ---- queries & leases ----
+    def _expire_locked(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            _, lid = heapq.heappop(self._expiry)
+            lease = self._leases.get(lid)
+            if lease is not None and lease[2] <= now:
+                self._drop_lease_locked(lid, now)
+
+    def _drop_lease_locked(self, lid: str, now: float) -> bool:
+        lease = self._leases.pop(lid, None)
+        if lease is None:
+            return False
+        self._leased.pop(lease[0], None)
+        self._last_used[lease[0]] = now
+        return True
+
+    def _match_locked(self, q: dict, now: float) -> list[str]:
+        eq = [(f, q[f]) for f in QUERY_INDEX_FIELDS if q.get(f)]
+        scan = min((self._buckets.get(k, []) for k in eq), key=len) if eq else self._all
+        max_ms = q.get("max_ms")
+        unused_for = q.get("unused_for_s")
+        limit = q.get("limit", 1)
+        out = []
+        for rank, hp in scan:
+            if max_ms is not None and rank > max_ms:
+                break
+            if hp in self._leased:
+                continue
+            rec = self._recs[hp]
+            if any(rec[f] != v for f, v in eq):
+                continue
+            if unused_for and now - self._last_used.get(hp, float("-inf")) < unused_for:
+                continue
+            out.append(hp)
+            if len(out) >= limit:
+                break
+        return out
+
+    def _public(self, hp: str) -> dict:
+        rec = dict(self._recs[hp])
+        del rec["origin"], rec["rank"]
+        return rec
+
+    def query(self, q: dict) -> list[dict]:
+        """Best matching free proxies (no lease taken)."""
+        now = time.time()
+        with self._lock:
+            self.queries += 1
+            self._expire_locked(now)
+            return [self._public(hp) for hp in self._match_locked(q, now)]
+
+    def lease(self, q: dict, client: str = "", ttl_s: float = QUERY_LEASE_DEFAULT_S) -> dict | None:
+        """Lease the best free match, or None when nothing matches."""
+        now = time.time()
+        ttl_s = max(1.0, min(QUERY_LEASE_MAX_S, float(ttl_s)))
+        with self._lock:
+            self.queries += 1
+            self._expire_locked(now)
+            hps = self._match_locked(dict(q, limit=1), now)
+            if not hps:
+                return None
+            hp, lid = hps[0], os.urandom(8).hex()
+            self._leases[lid] = [hp, client, now + ttl_s]
+            self._leased[hp] = lid
+            self._last_used[hp] = now
+            heapq.heappush(self._expiry, (now + ttl_s, lid))
+            return {"lease": lid, "expires": now + ttl_s, "proxy": self._public(hp)}
+
+    def renew(self, lid: str, ttl_s: float = QUERY_LEASE_DEFAULT_S) -> float | None:
+        now = time.time()
+        with self._lock:
+            self._expire_locked(now)
+            lease = self._leases.get(lid)
+            if lease is None:
+                return None
+            lease[2] = now + max(1.0, min(QUERY_LEASE_MAX_S, float(ttl_s)))
+            heapq.heappush(self._expiry, (lease[2], lid))
+            return lease[2]
+
+    def release(self, lid: str) -> bool:
+        with self._lock:
+            return self._drop_lease_locked(lid, time.time())
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire_locked(time.time())
+            return {"proxies": len(self._recs), "leased": len(self._leases), "queries": self.queries,
+                    "countries": dict(Counter(rec["country"] for rec in self._recs.values()).most_common()),
+                    "origins": dict(Counter(rec["origin"] for rec in self._recs.values()))}
+
+
+class _QueryHandler:
+    """HTTP/1.0 JSON API: /query, /lease, /renew, /release and /stats (token via X-Token or ?token=)."""
+    timeout = QUERY_IO_TIMEOUT_S
+
+    def _reply(self, code: int, obj) -> None:
+        body = json.dumps(obj).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found"}.get(code, "Error")
+        self.wfile.write(f"HTTP/1.0 {code} {reason}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("ascii") + body)
+
+    def handle(self):
+        try:
+            method, target, _ = self.rfile.readline(QUERY_MAX_LINE_BYTES).decode("latin-1").split(" ", 2)
+        except (ValueError, OSError):
+            return
+        headers = {}
+        for _ in range(QUERY_MAX_HEADER_LINES + 1):
+            try:
+                raw = self.rfile.readline(QUERY_MAX_LINE_BYTES)
+            except OSError:
+                return
+            if len(raw) >= QUERY_MAX_LINE_BYTES:
+                return self._reply(400, {"error": "header line too long"})
+            line = raw.decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            return self._reply(400, {"error": "too many headers"})
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        index: ProxyIndex = self.server.index
+        given = (headers.get("x-token") or params.pop("token", "") or "").encode("utf-8")
+        if self.server.token and not hmac.compare_digest(given, self.server.token.encode("utf-8")):
+            return self._reply(403, {"error": "bad token"})
+        if method not in ("GET", "POST"):
+            return self._reply(400, {"error": "GET or POST only"})
+        try:
+            if url.path == "/query":
+                return self._reply(200, {"proxies": index.query(parse_proxy_query(params))})
+            if url.path == "/lease":
+                got = index.lease(parse_proxy_query(params), params.get("client", ""),
+                                  float(params.get("ttl") or QUERY_LEASE_DEFAULT_S))
+                return self._reply(200 if got else 404, got or {"error": "no free proxy matches"})
+            if url.path == "/renew":
+                expires = index.renew(params.get("lease", ""), float(params.get("ttl") or QUERY_LEASE_DEFAULT_S))
+                return self._reply(200 if expires else 404, {"expires": expires} if expires else
+                                   {"error": "unknown or expired lease"})
+            if url.path == "/release":
+                ok = index.release(params.get("lease", ""))
+                return self._reply(200 if ok else 404, {"released": ok})
+            if url.path == "/stats":
+                return self._reply(200, index.stats())
+        except ValueError as e:
+            return self._reply(400, {"error": str(e)})
+        return self._reply(404, {"error": "unknown path"})
+
+
+def _unlink_socket(path: str, missing_ok: bool = False) -> None:
+    """Remove a unix socket file; refuses (ValueError) to delete anything that is not a socket."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        if missing_ok:
+            return
+        raise
+    if not stat.S_ISSOCK(st.st_mode):
+        raise ValueError(f"{path} exists and is not a socket; not replacing it")
+    os.unlink(path)
+
+
+class QueryDaemon:
+    """Serves a ProxyIndex on host:port (token required) or an owner-only unix:/path socket."""
+
+    def __init__(self, listen: str, index: ProxyIndex, token: str = ""):
+        self.listen = listen.strip() or QUERY_DAEMON_DEFAULT_LISTEN
+        self.index = index
+        self.token = token
+        self._server = None
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    def start(self) -> str:
+        import socketserver
+
+        handler = type("QueryHandler", (_QueryHandler, socketserver.StreamRequestHandler), {})
+        if self.listen.startswith("unix:"):
+            if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+                raise ValueError("unix sockets are not available on this platform; use host:port")
+            path = self.listen[5:]
+            _unlink_socket(path, missing_ok=True)
+            # owner-only from the moment bind() creates the path, not after a chmod
+            old_umask = os.umask(0o077)
+            try:
+                server = socketserver.ThreadingUnixStreamServer(path, handler)
+            finally:
+                os.umask(old_umask)
+            os.chmod(path, 0o600)
+        else:
+            if not self.token:
+                raise ValueError("a token is required to serve proxies (with passwords) over TCP; "
+                                 "set one or use unix:/path")
+            host, _, port = self.listen.rpartition(":")
+            server_cls = type("QueryServer", (socketserver.ThreadingTCPServer,), {"allow_reuse_address": True})
+            server = server_cls((host or "127.0.0.1", int(port)), handler)
+        server.daemon_threads = True
+        server.index = self.index
+        server.token = self.token
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True, name="query-daemon")
+        self._thread.start()
+        return self.listen
+
+    def stop(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        if self.listen.startswith("unix:"):
+            try:
+                _unlink_socket(self.listen[5:])
+            except (OSError, ValueError):
+                pass
+
+    def wait(self) -> None:
+        if self._thread is not None:
+            self._thread.join()
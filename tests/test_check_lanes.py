@@ -0,0 +1,122 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import feed
+import check_lanes
+
+EXIT_INFO = {"ip": "203.0.113.7", "country": "US", "timezone": "America/New_York"}
+
+
+class _StubProxy(BaseHTTPRequestHandler):
+    """Plain HTTP proxy stand-in: answers every proxied GET with the same ipinfo JSON."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps(dict(EXIT_INFO, path=self.path)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_proxy():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubProxy)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_process_lanes_check_against_a_stub_proxy(stub_proxy):
+    dead = closed_port()
+    candidates = feed.CandidateFeed()
+    candidates.open_sources(1)
+    for i in range(6):
+        candidates.put_line(f"127.0.0.1:{stub_proxy}:user{i}:pw", "stub")
+    candidates.put_line(f"127.0.0.1:{dead}", "stub")
+    candidates.close_source()
+
+    results = {}
+    lock = threading.Lock()
+
+    def on_result(item, res):
+        with lock:
+            results[feed.proxy_dedupe_key(item[2])] = res
+
+    opts = {"timeout_s": 5, "retries": 0, "breaker": False, "ipinfo_url": "http://ipinfo.test/json"}
+    counts = check_lanes.run_check_lanes(candidates, opts, on_result, threads=0, processes=2)
+
+    assert sum(counts.values()) == 7
+    assert all("process" in name for name in counts)
+    alive = [r for r in results.values() if r["status"] == "OK"]
+    assert len(alive) == 6
+    assert {(r["ip"], r["country"], r["iana_tz"]) for r in alive} == {
+        (EXIT_INFO["ip"], EXIT_INFO["country"], EXIT_INFO["timezone"])}
+    assert {r["user"] for r in alive} == {f"user{i}" for i in range(6)}
+    assert results[f"127.0.0.1:{dead}:"]["status"] == "FAIL"
+
+
+def test_raw_engine_stops_taking_work_on_cancel(stub_proxy):
+    candidates = feed.CandidateFeed()
+    candidates.open_sources(1)
+    for i in range(200):
+        candidates.put_line(f"127.0.0.1:{stub_proxy}:user{i}:pw", "stub")
+    candidates.close_source()
+
+    cancel = threading.Event()
+    done = []
+
+    def on_result(item, res):
+        done.append(res)
+        cancel.set()
+
+    opts = {"engine": "raw", "timeout_s": 5, "retries": 0, "ipinfo_url": "http://ipinfo.test/json"}
+    counts = check_lanes.run_check_lanes(candidates, opts, on_result, threads=4, cancel_event=cancel)
+
+    assert done and done[0]["status"] == "OK"
+    assert sum(counts.values()) == len(done) <= 4  # only checks already in flight at cancel
+
+
+def test_byte_budget_grants_up_to_its_limit_and_takes_refunds():
+    budget = check_lanes.ByteBudget(1000)
+    assert budget.reserve(600) == 600
+    assert budget.reserve(600) == 400  # partial grant at the limit
+    assert budget.reserve(1) == 0 and budget.remaining == 0
+    budget.refund(300)  # probe stopped early
+    assert budget.remaining == 300 and budget.reserve(500) == 300
+    budget.refund(-5)
+    budget.refund(5000)
+    assert budget.used == 0
+
+
+def test_byte_budget_never_overcommits_across_threads():
+    budget = check_lanes.ByteBudget(100_000)
+    grants = []
+
+    def probe():
+        for _ in range(200):
+            grants.append(budget.reserve(100))
+
+    threads = [threading.Thread(target=probe) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(grants) == budget.used == 100_000
@@ -0,0 +1,43 @@
+import feed
+
+
+def test_front_key_trusted_after_two_confirmations_with_spot_checks():
+    idx = feed.ExitIpIndex(spot_check_every=3)
+    p = {"host": "10.0.0.1", "port": "80"}
+    assert idx.record(p, "9.9.9.9") is False
+    assert idx.sample(p) is None  # one confirmation is not enough
+    assert idx.record(p, "9.9.9.9") is True
+    assert [idx.sample(p) for _ in range(6)] == ["9.9.9.9", "9.9.9.9", None, "9.9.9.9", "9.9.9.9", None]
+    assert idx.sampled == 4
+
+
+def test_subnet_key_samples_neighbours():
+    idx = feed.ExitIpIndex(spot_check_every=100)
+    idx.record({"host": "10.0.0.1"}, "9.9.9.9")
+    idx.record({"host": "10.0.0.2"}, "9.9.9.9")
+    assert idx.sample({"host": "10.0.0.77"}) == "9.9.9.9"
+    assert idx.sample({"host": "10.0.1.77"}) is None
+
+
+def test_rotating_gateway_is_never_sampled():
+    idx = feed.ExitIpIndex(spot_check_every=100)
+    p = {"host": "10.0.0.1"}
+    idx.record(p, "9.9.9.9")
+    idx.record(p, "9.9.9.9")
+    idx.record(p, "8.8.8.8")
+    assert idx.sample(p) is None
+
+
+def test_front_is_exit_follows_trust_and_spot_checks():
+    idx = feed.ExitIpIndex(spot_check_every=2)
+    idx.record({"host": "10.0.0.1"}, "1.1.1.1")
+    front = {"host": "1.1.1.1"}
+    assert idx.sample(front) is None
+    idx.record({"host": "10.0.5.1"}, "1.1.1.1")
+    assert [idx.sample(front) for _ in range(4)] == ["1.1.1.1", None, "1.1.1.1", None]
+
+
+def test_missing_exit_is_ignored():
+    idx = feed.ExitIpIndex()
+    assert idx.record({"host": "10.0.0.1"}, "-") is False
+    assert idx.record({"host": "10.0.0.1"}, "") is False
@@ -0,0 +1,50 @@
+import json
+
+import journal
+
+
+def test_cancelled_run_resumes_with_its_results(tmp_path):
+    j = journal.RunJournal(str(tmp_path))
+    assert j.load() is None
+    j.begin({"source": "textbox"})
+    j.record("1.2.3.4:80:", {"status": "OK"})
+    j.record("5.6.7.8:80:", {"status": "FAIL"})
+    j.close(completed=False)
+
+    header, done = journal.RunJournal(str(tmp_path)).load()
+    assert header["source"] == "textbox"
+    assert done == [("1.2.3.4:80:", {"status": "OK"}), ("5.6.7.8:80:", {"status": "FAIL"})]
+
+
+def test_resumed_results_carry_over_and_a_torn_line_is_skipped(tmp_path):
+    j = journal.RunJournal(str(tmp_path))
+    j.begin({"source": "a"}, resumed=[("1.2.3.4:80:", {"status": "OK"})])
+    j.record("9.9.9.9:80:", {"status": "OK"})
+    j.close(completed=False)
+    with open(j.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "result", "key": "cut')  # crash mid-write
+
+    _, done = j.load()
+    assert [key for key, _ in done] == ["1.2.3.4:80:", "9.9.9.9:80:"]
+
+
+def test_completed_run_leaves_nothing_to_resume(tmp_path):
+    j = journal.RunJournal(str(tmp_path))
+    j.begin({})
+    j.record("1.2.3.4:80:", {})
+    j.close(completed=True)
+    assert not (tmp_path / journal.AUTO_JOURNAL_FILENAME).exists()
+    assert j.load() is None
+
+
+def test_records_are_buffered_until_the_flush_threshold(tmp_path):
+    j = journal.RunJournal(str(tmp_path))
+    j.begin({})
+    for i in range(journal.AUTO_JOURNAL_FLUSH_RECORDS - 1):
+        j.record(f"10.0.0.{i}:80:", {})
+    assert len(open(j.path, encoding="utf-8").read().splitlines()) == 1  # header only
+    j.record("10.0.1.0:80:", {})
+    lines = open(j.path, encoding="utf-8").read().splitlines()
+    assert len(lines) == journal.AUTO_JOURNAL_FLUSH_RECORDS + 1
+    assert json.loads(lines[-1])["key"] == "10.0.1.0:80:"
+    j.close(completed=False)
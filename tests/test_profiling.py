@@ -0,0 +1,30 @@
+import json
+
+import profiling
+
+
+def test_summary_aggregates_per_url_percentiles(tmp_path):
+    report = profiling.ProfilingReport(str(tmp_path), proxy="1.2.3.4:80")
+    for ms in (100, 200, 300, 400):
+        report.add({"url": "https://a.test/", "ok": True, "nav_ms": ms, "ttfb_ms": ms / 2})
+    report.add({"url": "https://a.test/", "ok": False, "error": "TimeoutError", "nav_ms": 60000})
+    report.add({"url": "https://b.test/", "ok": False, "error": "Error"})
+    report.close()
+
+    with open(tmp_path / profiling.PROFILING_SUMMARY_FILENAME, encoding="utf-8") as f:
+        summary = json.load(f)
+    assert summary["proxy"] == "1.2.3.4:80" and summary["visits"] == 6
+    a = summary["urls"]["https://a.test/"]
+    assert (a["visits"], a["failures"], a["errors"]) == (5, 1, ["TimeoutError"])
+    assert a["nav_ms"]["max"] == 400  # the failed visit's timing is left out
+    assert a["nav_ms"]["p50"] == 250.0 and a["ttfb_ms"]["max"] == 200
+    b = summary["urls"]["https://b.test/"]
+    assert b["failures"] == 1 and "nav_ms" not in b
+
+    lines = (tmp_path / profiling.PROFILING_REPORT_FILENAME).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 6 and json.loads(lines[0])["run"] == report.run_id
+
+
+def test_empty_report_writes_no_summary(tmp_path):
+    profiling.ProfilingReport(str(tmp_path)).close()
+    assert not (tmp_path / profiling.PROFILING_SUMMARY_FILENAME).exists()
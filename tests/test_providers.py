@@ -0,0 +1,20 @@
+import feed
+
+
+def test_parse_provider_specs_kinds():
+    specs = feed.parse_provider_specs("proxyscrape\nhttps://example.com/list.txt\n/tmp/proxies.txt\n")
+    assert [s["kind"] for s in specs] == [feed.PROVIDER_PROXYSCRAPE, feed.PROVIDER_URL, feed.PROVIDER_FILE]
+    assert specs[0]["target"] == feed.PROXYSCRAPE_URL
+    assert specs[1]["target"] == "https://example.com/list.txt"
+    assert specs[2]["name"] == "proxies.txt"
+
+
+def test_parse_provider_specs_skips_comments_blanks_and_duplicates():
+    text = "# lists\n\n  ProxyScrape  \nproxyscrape\nhttp://a/x\nhttp://a/x\n"
+    specs = feed.parse_provider_specs(text)
+    assert [s["kind"] for s in specs] == [feed.PROVIDER_PROXYSCRAPE, feed.PROVIDER_URL]
+
+
+def test_parse_provider_specs_empty():
+    assert feed.parse_provider_specs("") == []
+    assert feed.parse_provider_specs(None) == []
@@ -0,0 +1,46 @@
+import os
+
+import common
+import provision
+
+
+def make_template(root):
+    template = root / "template"
+    (template / "Default" / "Cache").mkdir(parents=True)
+    (template / "Default" / "Cache" / "data_0").write_bytes(b"c" * 4096)
+    (template / "Default" / "Preferences").write_text("{}")
+    (template / "SingletonLock").write_text("")
+    common.save_config(str(template), {"brave_exe": "brave", "profile_dir": str(template), "proxy_host": "old"})
+    return template
+
+
+def test_profiles_are_copies_by_default(tmp_path):
+    template = make_template(tmp_path)
+    out = tmp_path / "profiles"
+    reports = provision.provision_profiles(str(template), 2, "P", proxies=[{"host": "1.2.3.4", "port": "80"}],
+                                           root_dir=str(out), reflink=False)
+    assert [r["name"] for r in reports] == ["P 001", "P 002"]
+    assert all(r["linked_bytes"] == 0 and r["errors"] == 0 for r in reports)
+    for rep in reports:
+        dest = rep["dir"]
+        cache = os.path.join(dest, "Default", "Cache", "data_0")
+        assert not os.path.samefile(cache, template / "Default" / "Cache" / "data_0")
+        assert not os.path.exists(os.path.join(dest, "SingletonLock"))
+        assert common.load_config(dest)["profile_dir"] == dest
+    assert common.load_config(reports[0]["dir"])["proxy_host"] == "1.2.3.4"
+    assert common.load_config(reports[1]["dir"])["proxy_host"] == ""
+
+
+def test_hardlinked_caches_are_opt_in(tmp_path):
+    template = make_template(tmp_path)
+    rep, = provision.provision_profiles(str(template), 1, "P", root_dir=str(tmp_path / "profiles"),
+                                        reflink=False, hardlink_caches=True)
+    assert rep["linked_bytes"] == 4096
+    assert os.path.samefile(os.path.join(rep["dir"], "Default", "Cache", "data_0"),
+                            template / "Default" / "Cache" / "data_0")
+    assert not os.path.samefile(os.path.join(rep["dir"], "Default", "Preferences"),
+                                template / "Default" / "Preferences")
+
+
+def test_next_profile_names_skips_taken():
+    assert provision.next_profile_names("P", 2, ["p 001", "P 003"]) == ["P 002", "P 004"]
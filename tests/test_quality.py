@@ -0,0 +1,23 @@
+import common
+import check_lanes
+
+
+def test_latency_stats_empty():
+    assert check_lanes.latency_stats([]) == {"min_ms": None, "p50_ms": None, "p95_ms": None, "jitter_ms": None}
+
+
+def test_latency_stats_single_sample():
+    assert check_lanes.latency_stats([120.7]) == {"min_ms": 120, "p50_ms": 120, "p95_ms": 120, "jitter_ms": 0}
+
+
+def test_latency_stats_percentiles_and_jitter():
+    st = check_lanes.latency_stats([100, 300, 200, 400, 500])
+    assert st["min_ms"] == 100
+    assert st["p50_ms"] == 300
+    assert st["jitter_ms"] == 150  # (200 + 100 + 200 + 100) / 4, in sample order
+
+
+def test_latency_stats_p95_interpolates():
+    st = check_lanes.latency_stats([float(v) for v in range(0, 2100, 100)])  # 21 samples: p95 is exactly the 20th
+    assert st["p95_ms"] == 1900
+    assert common.percentile([0, 1000], 95) == 950
@@ -0,0 +1,131 @@
+import http.client
+import json
+import socket
+
+import pytest
+
+import query_daemon
+
+
+def result(host, ms, country="US", user="", tz="America/New_York", **extra):
+    return dict({"host": host, "port": 8080, "user": user, "pass": "pw" if user else "", "status": "OK",
+                 "latency_ms": ms, "ip": host, "country": country, "iana_tz": tz, "win_tz": "-"}, **extra)
+
+
+@pytest.fixture
+def index():
+    idx = query_daemon.ProxyIndex()
+    idx.upsert(result("10.0.0.1", 300), "run")
+    idx.upsert(result("10.0.0.2", 100), "run")
+    idx.upsert(result("10.0.0.3", 50, country="DE", tz="Europe/Berlin"), "run")
+    idx.upsert(result("10.0.0.4", 900, p95_ms=200), "run")
+    return idx
+
+
+def test_parse_proxy_query():
+    q = query_daemon.parse_proxy_query({"country": "us", "tz": "America/New_York", "max_ms": "800",
+                                        "unused_for": "60", "limit": "500"})
+    assert q == {"country": "US", "iana_tz": "America/New_York", "max_ms": 800.0, "unused_for_s": 60.0,
+                 "limit": query_daemon.QUERY_MAX_LIMIT}
+    assert query_daemon.parse_proxy_query({}) == {"limit": 1}
+    with pytest.raises(ValueError):
+        query_daemon.parse_proxy_query({"max_ms": "fast"})
+
+
+def test_query_is_best_first_and_filtered(index):
+    hosts = [p["host"] for p in index.query({"country": "US", "limit": 10})]
+    assert hosts == ["10.0.0.2", "10.0.0.4", "10.0.0.1"]  # ranked by p95 when sampled
+    assert [p["host"] for p in index.query({"max_ms": 150, "limit": 10})] == ["10.0.0.3", "10.0.0.2"]
+    assert index.query({"iana_tz": "Asia/Tokyo"}) == []
+    assert "rank" not in index.query({})[0]
+
+
+def test_failed_results_are_not_indexed(index):
+    assert not index.upsert(dict(result("10.0.0.9", 10), status="FAIL"))
+    assert len(index) == 4
+
+
+def test_lease_hides_until_release(index):
+    first = index.lease({"country": "US"}, "a")
+    second = index.lease({"country": "US"}, "b")
+    assert (first["proxy"]["host"], second["proxy"]["host"]) == ("10.0.0.2", "10.0.0.4")
+    assert [p["host"] for p in index.query({"country": "US", "limit": 10})] == ["10.0.0.1"]
+    assert index.renew(first["lease"], 30) is not None
+    assert index.release(first["lease"])
+    assert not index.release(first["lease"])
+    assert index.query({"country": "US"})[0]["host"] == "10.0.0.2"
+    assert index.query({"country": "US", "unused_for_s": 600})[0]["host"] == "10.0.0.1"
+
+
+def test_lease_expires(index, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_daemon.time, "time", lambda: now[0])
+    lease = index.lease({"country": "DE"}, ttl_s=5)
+    assert index.lease({"country": "DE"}) is None
+    now[0] += 6
+    assert index.renew(lease["lease"]) is None
+    assert index.lease({"country": "DE"})["proxy"]["host"] == "10.0.0.3"
+
+
+def test_users_on_one_gateway_lease_separately():
+    idx = query_daemon.ProxyIndex()
+    idx.upsert(result("gw", 100, user="alice"))
+    idx.upsert(result("gw", 100, user="bob"))
+    users = {idx.lease({})["proxy"]["user"], idx.lease({})["proxy"]["user"]}
+    assert users == {"alice", "bob"}
+    idx.remove("GW:8080:alice")
+    assert len(idx) == 1
+
+
+def test_replace_origin(index):
+    index.replace_origin("pool", [result("10.1.0.1", 10)])
+    index.replace_origin("run", [result("10.0.0.1", 300)])
+    assert index.stats()["origins"] == {"pool": 1, "run": 1}
+
+
+def test_daemon_over_tcp_requires_token(index):
+    with pytest.raises(ValueError):
+        query_daemon.QueryDaemon("127.0.0.1:0", index).start()
+    daemon = query_daemon.QueryDaemon("127.0.0.1:0", index, token="s3cret")
+    daemon.start()
+    try:
+        host, port = daemon._server.server_address
+
+        def get(path, token=None):
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+            conn.request("GET", path, headers={"X-Token": token} if token else {})
+            resp = conn.getresponse()
+            return resp.status, json.loads(resp.read())
+
+        assert get("/stats")[0] == 403
+        assert get("/stats", "wrong")[0] == 403
+        status, body = get("/query?country=de", "s3cret")
+        assert status == 200 and [p["host"] for p in body["proxies"]] == ["10.0.0.3"]
+        status, body = get("/lease?country=de&client=t", "s3cret")
+        assert status == 200
+        assert get("/lease?country=de", "s3cret")[0] == 404
+        assert get(f"/release?lease={body['lease']}", "s3cret") == (200, {"released": True})
+        assert get("/query?max_ms=fast", "s3cret")[0] == 400
+    finally:
+        daemon.stop()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="unix sockets only")
+def test_daemon_refuses_to_replace_a_regular_file(index, tmp_path):
+    path = tmp_path / "pool.sock"
+    path.write_text("keep me")
+    with pytest.raises(ValueError):
+        query_daemon.QueryDaemon(f"unix:{path}", index).start()
+    assert path.read_text() == "keep me"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="unix sockets only")
+def test_unix_socket_is_owner_only_from_bind(index, tmp_path, monkeypatch):
+    path = tmp_path / "pool.sock"
+    monkeypatch.setattr(query_daemon.os, "chmod", lambda *a, **k: None)  # only the bind-time umask counts
+    daemon = query_daemon.QueryDaemon(f"unix:{path}", index)
+    daemon.start()
+    try:
+        assert path.stat().st_mode & 0o077 == 0
+    finally:
+        daemon.stop()
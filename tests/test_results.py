@@ -0,0 +1,67 @@
+import pytest
+
+import bot
+
+
+def test_parse_result_filter_numbers_and_text():
+    pred = bot.parse_result_filter("country == US, latency < 500ms")
+    assert pred({"country": "us", "latency_ms": 120})
+    assert not pred({"country": "US", "latency_ms": 500})
+    assert not pred({"country": "DE", "latency_ms": 10})
+
+
+def test_parse_result_filter_contains_and_and():
+    pred = bot.parse_result_filter("tz ~ york and status != FAIL")
+    assert pred({"iana_tz": "America/New_York", "status": "OK"})
+    assert not pred({"iana_tz": "Europe/Berlin", "status": "OK"})
+
+
+def test_parse_result_filter_works_on_records():
+    store = bot.ResultsStore()
+    rec = store.add("1.2.3.4", "80", status="OK", latency_ms=300, country="US")
+    assert bot.parse_result_filter("ms <= 300, cc = us")(rec)
+
+
+def test_parse_result_filter_empty_and_invalid():
+    assert bot.parse_result_filter("  ") is None
+    with pytest.raises(ValueError):
+        bot.parse_result_filter("country US")
+    with pytest.raises(ValueError):
+        bot.parse_result_filter("contry == US")
+
+
+def test_parse_result_filter_values_may_contain_separator_words():
+    pred = bot.parse_result_filter("error ~ read and write, status == FAIL and ms >= 10")
+    assert pred({"error": "Read and write timed out", "status": "FAIL", "latency_ms": 20})
+    assert not pred({"error": "read timed out", "status": "FAIL", "latency_ms": 20})
+    assert bot.parse_result_filter("error ~ a=b")({"error": "got A=B back"})
+
+
+def test_results_table_model_remove_keeps_order():
+    store = bot.ResultsStore()
+    recs = [store.add(f"10.0.0.{i}", "80", status="OK", latency_ms=ms) for i, ms in enumerate((30, 10, 30, 20))]
+    for desc in (None, False, True):
+        model = bot.ResultsTableModel()
+        if desc is not None:
+            model.set_sort("latency_ms", desc)
+        for rec in recs:
+            model.append(rec)
+        expected = [r for r in model.view if r is not recs[2]]
+        model.remove(recs[2])
+        model.remove(recs[2])
+        assert model.view == expected
+        model.set_filter(None)
+        assert model.view == expected
+
+
+def test_results_store_keeps_users_on_one_gateway_apart():
+    store = bot.ResultsStore()
+    a = store.add("gw.example", "8000", "alice", "pa", "OK")
+    b = store.add("gw.example", "8000", "bob", "pb", "OK")
+    assert store.get("gw.example:8000:alice") is a
+    assert store.get("GW.example:8000:bob") is b
+    assert (store.password(a), store.password(b)) == ("pa", "pb")
+    store.remove(a)
+    assert store.get("gw.example:8000:alice") is None
+    assert store.get("gw.example:8000:bob") is b
+    assert store.ok_count == 1
@@ -0,0 +1,75 @@
+import check_lanes
+
+TIMEOUT = {"status": "FAIL", "error": "ReadTimeout"}
+OK = {"status": "OK", "error": ""}
+
+
+def attempts_until_final(policy, res, attempt_s):
+    """Attempts a proxy gets when every attempt fails with `res` after attempt_s seconds."""
+    elapsed, attempt = 0.0, 1
+    while True:
+        elapsed += attempt_s
+        wait = policy.delay(attempt, res, elapsed)
+        if wait is None:
+            return attempt
+        elapsed += wait
+        attempt += 1
+
+
+def test_is_retryable_error():
+    assert check_lanes.is_retryable_error("ReadTimeout")
+    assert check_lanes.is_retryable_error("HTTP 503")
+    assert check_lanes.is_retryable_error("HTTP 429")
+    assert not check_lanes.is_retryable_error("HTTP 404")
+    assert not check_lanes.is_retryable_error("ConnectTimeout")
+    assert not check_lanes.is_retryable_error("ProxyError")
+
+
+def test_retries_are_not_cut_short_by_the_time_cap():
+    for retries in range(4):
+        policy = check_lanes.RetryPolicy(retries, timeout_s=10)
+        assert attempts_until_final(policy, TIMEOUT, attempt_s=10) == 1 + retries
+
+
+def test_no_retry_for_ok_or_fail_fast_errors():
+    policy = check_lanes.RetryPolicy(3, timeout_s=10)
+    assert policy.delay(1, OK, 1.0) is None
+    assert policy.delay(1, {"status": "FAIL", "error": "ProxyError"}, 1.0) is None
+    assert policy.retried == 0
+
+
+def test_run_wide_retry_budget():
+    policy = check_lanes.RetryPolicy(1, timeout_s=10, backoff_s=0)
+    granted = sum(policy.delay(1, TIMEOUT, 10.0) is not None for _ in range(100))
+    assert granted == check_lanes.CHECK_RETRY_MIN + int(check_lanes.CHECK_RETRY_RATIO * 100)
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = check_lanes.HostBreaker(threshold=3, cooldown_s=60)
+    p = {"host": "10.0.0.1", "port": "80"}
+    for _ in range(3):
+        assert breaker.allow(p)
+        breaker.record(p, False)
+    assert not breaker.allow(dict(p, port="81"))
+    assert breaker.skipped == 1
+    assert breaker.opened_hosts == 1
+    assert breaker.allow({"host": "10.0.0.2", "port": "80"})
+
+
+def test_breaker_half_open_probe():
+    breaker = check_lanes.HostBreaker(threshold=1, cooldown_s=0)
+    p = {"host": "10.0.0.1", "port": "80"}
+    breaker.record(p, False)
+    assert breaker.allow(p)  # cooldown over: this is the probe
+    assert not breaker.allow(p)  # only one probe at a time
+    breaker.record(p, True)
+    assert breaker.allow(p) and breaker.allow(p)
+
+
+def test_breaker_never_opens_for_a_host_that_answered():
+    breaker = check_lanes.HostBreaker(threshold=1, cooldown_s=60)
+    p = {"host": "10.0.0.1", "port": "80"}
+    breaker.record(p, True)
+    for _ in range(5):
+        breaker.record(p, False)
+    assert breaker.allow(p)
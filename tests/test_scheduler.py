@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+import feed
+
+
+def item(host, port="8080", source="a"):
+    return (None, f"{host}:{port}", {"host": host, "port": port, "user": "", "source": source})
+
+
+def test_pop_empty_raises():
+    with pytest.raises(IndexError):
+        feed.CandidateScheduler().pop()
+
+
+def test_bucket_keeps_arrival_order():
+    s = feed.CandidateScheduler()
+    for i in range(3):
+        s.push(item(f"10.0.0.{i}"))
+    assert len(s) == 3
+    assert [s.pop()[2]["host"] for _ in range(3)] == ["10.0.0.0", "10.0.0.1", "10.0.0.2"]
+    assert len(s) == 0
+
+
+def test_live_subnet_jumps_ahead():
+    s = feed.CandidateScheduler()
+    for i in range(5):
+        s.push(item(f"10.0.0.{i}"))
+    for i in range(5):
+        s.push(item(f"10.0.9.{i}"))
+    for _ in range(3):
+        s.record({"host": "10.0.9.200", "port": "8080", "source": "a"}, True)
+        s.record({"host": "10.0.0.200", "port": "8080", "source": "a"}, False, "ConnectTimeout")
+    assert [s.pop()[2]["host"] for _ in range(5)] == [f"10.0.9.{i}" for i in range(5)]
+    assert s.pop()[2]["host"] == "10.0.0.0"
+
+
+def test_feed_drains_through_scheduler():
+    candidates = feed.CandidateFeed(feed.CandidateScheduler())
+    candidates.open_sources(1)
+    assert candidates.put_line("1.2.3.4:80", "a")
+    assert not candidates.put_line("1.2.3.4:80", "b")
+    candidates.close_source()
+    assert candidates.get()[2]["host"] == "1.2.3.4"
+    assert candidates.get() is None
+    assert candidates.duplicates == 1
+
+
+class InstantResolver:
+    def __init__(self, table):
+        self.table = table
+
+    def resolve_async(self, host, callback):
+        callback(self.table.get(host))
+
+
+def test_feed_reports_dropped_lines():
+    dropped = []
+    candidates = feed.CandidateFeed(resolver=InstantResolver({"a.example": "1.2.3.4"}), on_drop=dropped.append)
+    candidates.preload_seen(["5.6.7.8:80:"])
+    candidates.open_sources(1)
+    candidates.put_line("5.6.7.8:80", "a", line_idx=0)  # resumed
+    candidates.put_line("1.2.3.4:80", "a", line_idx=1)
+    candidates.put_line("1.2.3.4:80", "a", line_idx=2)  # duplicate
+    candidates.put_line("a.example:80", "a", line_idx=3)  # collapses onto line 1
+    candidates.put_line("gone.example:80", "a", line_idx=4)  # unresolved
+    candidates.close_source()
+    assert dropped == [0, 2, 3, 4]
+    assert candidates.get()[0] == 1
+    assert candidates.get() is None
+
+
+def test_resolver_close_fails_pending_lookups():
+    release = threading.Event()
+
+    def slow_resolve(host):
+        release.wait(5)
+        return "1.2.3.4"
+
+    resolver = feed.HostResolver(slow_resolve, max_workers=1)
+    answers = []
+    resolver.resolve_async("a.example", answers.append)
+    resolver.resolve_async("b.example", answers.append)  # queued behind the stuck lookup
+    resolver.close()
+    assert answers == [None, None]
+    release.set()
+    time.sleep(0.05)
+    assert answers == [None, None]
@@ -0,0 +1,59 @@
+import logging
+
+import timezones
+
+
+class StubBackend:
+    def __init__(self, tz="UTC"):
+        self.tz = tz
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return self.tz
+
+    def write(self, tz_id):
+        self.tz = tz_id
+        return True, "ok"
+
+
+def test_current_is_cached_until_invalidated():
+    backend = StubBackend()
+    svc = timezones.TimezoneService(backend, poll_interval_s=0)
+    assert svc.current() == svc.current() == "UTC"
+    assert backend.reads == 1
+    svc.invalidate()
+    backend.tz = "Tokyo Standard Time"
+    assert svc.current() == "Tokyo Standard Time"
+    assert backend.reads == 2
+
+
+def test_set_notifies_and_a_failing_subscriber_is_logged(caplog):
+    svc = timezones.TimezoneService(StubBackend(), poll_interval_s=0)
+    seen = []
+
+    def broken(tz_id):
+        raise RuntimeError("boom")
+
+    svc.subscribe(broken)
+    unsubscribe = svc.subscribe(seen.append)
+    with caplog.at_level(logging.ERROR, logger="whoer.tz"):
+        assert svc.set("W. Europe Standard Time") == (True, "ok")
+    assert seen == ["W. Europe Standard Time"]
+    assert "boom" in caplog.text
+    unsubscribe()
+    unsubscribe()
+    svc.set("UTC")
+    assert seen == ["W. Europe Standard Time"]
+
+
+def test_poll_once_reports_outside_changes():
+    backend = StubBackend()
+    svc = timezones.TimezoneService(backend, poll_interval_s=0)
+    seen = []
+    svc.subscribe(seen.append)
+    svc.current()
+    assert not svc.poll_once()
+    backend.tz = "Pacific Standard Time"
+    assert svc.poll_once()
+    assert seen == ["Pacific Standard Time"] and svc.cached() == "Pacific Standard Time"
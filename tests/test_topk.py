@@ -0,0 +1,83 @@
+import random
+import tracemalloc
+
+import bot
+
+
+def rec(ms, country="US", kbps=None):
+    r = bot.ResultsStore().add("10.0.0.1", "80", status="OK", latency_ms=ms, country=country)
+    r.kbps = kbps
+    return r
+
+
+def test_keeps_the_k_fastest_overall():
+    ranking = bot.TopKRanking(k=3, per_country=False)
+    recs = [rec(ms) for ms in (500, 100, 300, 50, 400, 200)]
+    for r in recs:
+        ranking.offer(r)
+    assert [r.rank_latency for r in ranking.ranked()] == [50, 100, 200]
+    assert len(ranking) == 3
+    assert ranking.offered == 6
+
+
+def test_offer_reports_kept_and_dropped():
+    ranking = bot.TopKRanking(k=2, per_country=False)
+    a, b, c, d = rec(300), rec(200), rec(100), rec(900)
+    assert ranking.offer(a) == (True, [])
+    assert ranking.offer(b) == (True, [])
+    assert ranking.offer(c) == (True, [a])
+    assert ranking.offer(d) == (False, [])
+
+
+def test_per_country_keeps_a_record_alive_while_any_heap_holds_it():
+    ranking = bot.TopKRanking(k=1, per_country=True)
+    de = rec(500, "DE")
+    ranking.offer(rec(100, "US"))
+    kept, dropped = ranking.offer(de)  # worse than the overall best, but best in DE
+    assert kept and dropped == []
+    assert ranking.ranked("DE") == [de]
+    assert [r.country for r in ranking.ranked()] == ["US"]
+
+
+def test_higher_is_better_keys_and_missing_values():
+    ranking = bot.TopKRanking(k=2, key="kbps", per_country=False)
+    for kbps in (None, 100, 5000, 800):
+        ranking.offer(rec(10, kbps=kbps))
+    assert [r.kbps for r in ranking.ranked()] == [5000, 800]
+
+
+def test_memory_stays_bounded():
+    ranking = bot.TopKRanking(k=5, per_country=True)
+    rng = random.Random(7)
+    kept_total = 0
+    for _ in range(5000):
+        kept, dropped = ranking.offer(rec(rng.randint(1, 5000), rng.choice("ABC")))
+        kept_total += kept - len(dropped)
+    assert len(ranking) == kept_total <= 5 + 3 * 5
+
+
+def ranked_store_bytes(n):
+    """Retained bytes of a store fed like a top-k run: only ranked records stay."""
+    tracemalloc.start()
+    try:
+        store = bot.ResultsStore()
+        ranking = bot.TopKRanking(k=5, per_country=True)
+        rng = random.Random(n)
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(n):
+            r = store.add(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}", "80", f"u{i}", f"p{i}", "OK",
+                          rng.randint(1, 5000), country=rng.choice("ABC"))
+            kept, dropped = ranking.offer(r)
+            for old in dropped:
+                store.remove(old)
+            if not kept:
+                store.remove(r)
+        return tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def test_ranked_results_do_not_grow_with_proxy_count():
+    small = ranked_store_bytes(2000)
+    large = ranked_store_bytes(20000)
+    assert large < small + 16 * 1024
@@ -0,0 +1,54 @@
+import json
+import threading
+
+import common
+
+
+def test_disabled_tracer_hands_back_fn_and_records_nothing():
+    tracer = common.Tracer()
+    with tracer.span("idle"):
+        pass
+    assert tracer.stop()["events"] == []
+
+    def fn():
+        return 1
+
+    assert common.traced("ui", fn) is fn  # global TRACER is off by default
+
+
+def test_spans_from_threads_end_up_in_a_chrome_trace(tmp_path):
+    tracer = common.Tracer()
+    tracer.start(profile=False)
+
+    def work():
+        with tracer.span("check", "lanes"):
+            with tracer.span("connect", "lanes"):
+                pass
+
+    workers = [threading.Thread(target=work, name=f"lane_{i}") for i in range(2)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    snap = tracer.stop()
+    assert not tracer.enabled and len(snap["events"]) == 4
+    assert {"lane_0", "lane_1"} <= set(snap["names"].values())
+
+    out = common.write_trace_run(snap, str(tmp_path), stamp="t")
+    assert out["profile"] is None and out["events"] == 4
+    assert sorted(line.split(":")[0] for line in out["summary"]) == ["check", "connect"]
+    with open(out["trace"], encoding="utf-8") as f:
+        trace = json.load(f)["traceEvents"]
+    assert sum(ev["ph"] == "X" for ev in trace) == 4
+    assert sum(ev["ph"] == "M" for ev in trace) == len(snap["names"])
+
+
+def test_event_cap_counts_dropped_spans(monkeypatch):
+    monkeypatch.setattr(common, "TRACE_MAX_EVENTS", 3)
+    tracer = common.Tracer()
+    tracer.start(profile=False)
+    for _ in range(5):
+        with tracer.span("s"):
+            pass
+    snap = tracer.stop()
+    assert len(snap["events"]) == 3 and snap["dropped"] == 2
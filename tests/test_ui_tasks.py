@@ -0,0 +1,75 @@
+import queue
+import threading
+
+import bot
+
+
+class FakeTk:
+    """Stands in for Tk's after(0, ...): callbacks queue up until the test pumps them."""
+
+    def __init__(self):
+        self.calls = queue.Queue()
+
+    def pump(self, n=1):
+        for _ in range(n):
+            self.calls.get(timeout=5)()
+
+
+def make_runner(tk):
+    busy = []
+    errors = []
+    runner = bot.UiTaskRunner(tk.calls.put, max_workers=2, on_busy=lambda name, b: busy.append((name, b)),
+                              on_error=lambda name, exc: errors.append((name, exc)))
+    return runner, busy, errors
+
+
+def test_result_is_handed_back_on_the_ui_side():
+    tk = FakeTk()
+    runner, busy, _ = make_runner(tk)
+    got = []
+    assert runner.submit("detect", lambda x: x * 2, 21, on_done=got.append) is not None
+    assert runner.busy("detect")
+    assert runner.submit("detect", lambda: None) is None  # same action already running
+    tk.pump()
+    assert got == [42] and not runner.busy("detect")
+    assert busy == [("detect", True), ("detect", False)]
+    runner.shutdown()
+
+
+def test_errors_go_to_the_task_handler_or_the_runner_default():
+    tk = FakeTk()
+    runner, _, errors = make_runner(tk)
+    mine = []
+
+    def boom():
+        raise OSError("no route")
+
+    runner.submit("a", boom, on_error=mine.append)
+    runner.submit("b", boom)
+    tk.pump(2)
+    assert [str(e) for e in mine] == ["no route"]
+    assert [(name, str(e)) for name, e in errors] == [("b", "no route")]
+    runner.shutdown()
+
+
+def test_cancel_drops_the_result_and_frees_the_name():
+    tk = FakeTk()
+    runner, busy, _ = make_runner(tk)
+    started, release = threading.Event(), threading.Event()
+    got = []
+
+    def slow(cancel_event):
+        started.set()
+        release.wait(5)
+        return cancel_event.is_set()
+
+    first = runner.submit("fetch", slow, pass_cancel=True, on_done=got.append)
+    assert started.wait(5)
+    assert runner.cancel("fetch") and first.cancel_event.is_set()
+    second = runner.submit("fetch", lambda: "again", on_done=got.append)  # name is free right away
+    release.set()
+    tk.pump(2)
+    assert got == ["again"]
+    assert busy == [("fetch", True), ("fetch", False), ("fetch", True), ("fetch", False)]
+    assert second is not first and not runner.cancel("fetch")
+    runner.shutdown()
@@ -0,0 +1,75 @@
+import logging
+import time
+
+import warm_pool
+from feed import proxy_dedupe_key
+
+
+def member(host, country="US", tz="America/New_York", latency=100):
+    return {"host": host, "port": "80", "user": "", "pass": "", "source": "stub", "country": country,
+            "iana_tz": tz, "latency_ms": latency, "ip": host, "verified_at": time.time()}
+
+
+def admit(pool, *members):
+    with pool._lock:
+        return [pool._admit_locked(proxy_dedupe_key(m), m) for m in members]
+
+
+def stub_checker(monkeypatch, verdicts):
+    """Replace the real check lanes with a table of canned results keyed by host."""
+    def run_check_lanes(feed, opts, on_result, threads, cancel_event=None):
+        while (item := feed.get()) is not None:
+            on_result(item, dict(verdicts[item[2]["host"]]))
+    monkeypatch.setattr(warm_pool, "run_check_lanes", run_check_lanes)
+
+
+def ok(host, tz="America/New_York", latency=50):
+    return {"status": "OK", "error": "", "iana_tz": tz, "latency_ms": latency, "ip": host}
+
+
+def test_slots_fill_per_country_and_overflow_goes_to_spares():
+    pool = warm_pool.WarmPool("", size=1, countries=["us", "DE"])
+    assert admit(pool, member("1.1.1.1"), member("2.2.2.2"), member("3.3.3.3", "DE"), member("4.4.4.4", "FR")) == \
+        [True, False, True, False]
+    assert [m["host"] for m in pool.members("us")] == ["1.1.1.1"]
+    assert list(pool._spares) == ["2.2.2.2:80:"]
+    st = pool.stats()
+    assert (st["size"], st["target"], st["slots"]) == (2, 2, {"US": 1, "DE": 1})
+
+
+def test_revalidate_evicts_dead_and_moved_members(monkeypatch):
+    logs = []
+    pool = warm_pool.WarmPool("", size=3, on_log=lambda msg, level=logging.INFO: logs.append(msg))
+    admit(pool, member("1.1.1.1"), member("2.2.2.2"), member("3.3.3.3"))
+    stub_checker(monkeypatch, {
+        "1.1.1.1": ok("1.1.1.1", latency=20),
+        "2.2.2.2": {"status": "FAIL", "error": "timeout"},
+        "3.3.3.3": ok("3.3.3.3", tz="Europe/Berlin"),
+    })
+    pool._revalidate()
+
+    assert [(m["host"], m["latency_ms"]) for m in pool.members()] == [("1.1.1.1", 20)]
+    assert pool.evicted == 2 and pool.stats()["churn_per_h"] == 2
+    assert {"2.2.2.2:80:", "3.3.3.3:80:"} <= set(pool._recent)  # not re-checked right away
+    assert any("timezone America/New_York -> Europe/Berlin" in msg for msg in logs)
+
+
+def test_refill_promotes_fresh_spares_before_asking_providers():
+    pool = warm_pool.WarmPool("", size=1)
+    admit(pool, member("1.1.1.1"), member("2.2.2.2"))
+    with pool._lock:
+        pool._evict_locked("1.1.1.1:80:", "dead")
+    assert pool._refill() is True  # no provider configured, yet the spare fills the slot
+    assert pool.best()["host"] == "2.2.2.2" and not pool._spares
+
+
+def test_stale_spares_are_not_promoted():
+    logs = []
+    pool = warm_pool.WarmPool("", size=1, revalidate_s=60, on_log=lambda msg, level=logging.INFO: logs.append(msg))
+    stale = member("2.2.2.2")
+    stale["verified_at"] -= 120
+    admit(pool, member("1.1.1.1"), stale)
+    with pool._lock:
+        pool._evict_locked("1.1.1.1:80:", "dead")
+    assert pool._refill() is False
+    assert pool.members() == [] and "[pool] no provider configured" in logs
@@ -0,0 +1,336 @@
+"""System timezone service and IANA -> Windows timezone mapping."""
+
+import time
+import os
+import json
+import platform
+import threading
+import subprocess
+import logging
+from datetime import datetime
+
+from common import TRACER, ensure_dir, profiles_root_dir
+
+try:
+    from zoneinfo import ZoneInfo  # Python 3.9+
+except Exception:
+    ZoneInfo = None
+
+
+TZUTIL_CACHE_FILENAME = "tzutil_cache.json"
+TZUTIL_CACHE_MAX_AGE_S = 30 * 24 * 3600
+
+
+# ===================== System timezone service =====================
+class TzutilBackend:
+    """Windows: tzutil /g and /s."""
+
+    name = "tzutil"
+
+    def read(self) -> str:
+        p = subprocess.run(["tzutil", "/g"], capture_output=True, text=True)
+        return (p.stdout or "").strip()
+
+    def write(self, tz_id: str) -> tuple[bool, str]:
+        try:
+            subprocess.run(["tzutil", "/s", tz_id], check=True, capture_output=True, text=True)
+            return True, "Timezone changed."
+        except subprocess.CalledProcessError as e:
+            msg = (e.stderr or e.stdout or str(e)).strip()
+            return False, f"Fail change Timezone. Please Run as Administrator.\n{msg}"
+
+
+class LocaltimeBackend:
+    """Linux/macOS: IANA name from the /etc/localtime symlink (falls back to /etc/timezone)."""
+
+    name = "localtime"
+
+    def __init__(self, path: str = "/etc/localtime"):
+        self.path = path
+
+    def read(self) -> str:
+        try:
+            target = os.path.realpath(self.path)
+            if "zoneinfo" + os.sep in target:
+                return target.split("zoneinfo" + os.sep, 1)[1]
+        except OSError:
+            pass
+        try:
+            with open("/etc/timezone", "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except OSError:
+            return ""
+
+    def write(self, tz_id: str) -> tuple[bool, str]:
+        try:
+            subprocess.run(["timedatectl", "set-timezone", tz_id], check=True, capture_output=True, text=True)
+            return True, "Timezone changed."
+        except (OSError, subprocess.CalledProcessError) as e:
+            msg = (getattr(e, "stderr", "") or str(e)).strip()
+            return False, f"Fail change Timezone.\n{msg}"
+
+
+class StaticBackend:
+    """In-memory timezone, for tests and benchmarks."""
+
+    name = "static"
+
+    def __init__(self, tz_id: str = "UTC"):
+        self.tz_id = tz_id
+        self.reads = 0
+
+    def read(self) -> str:
+        self.reads += 1
+        return self.tz_id
+
+    def write(self, tz_id: str) -> tuple[bool, str]:
+        self.tz_id = tz_id
+        return True, "Timezone changed."
+
+
+def make_tz_backend(spec: str | None = None):
+    """'tzutil', 'localtime' or 'static[:<tz id>]'; None picks the platform default."""
+    spec = (spec or "").strip()
+    if spec == "tzutil":
+        return TzutilBackend()
+    if spec == "localtime":
+        return LocaltimeBackend()
+    if spec.startswith("static"):
+        return StaticBackend(spec.split(":", 1)[1] if ":" in spec else "UTC")
+    if os.name == "nt":
+        return TzutilBackend()
+    if os.path.exists("/etc/localtime"):
+        return LocaltimeBackend()
+    return StaticBackend()
+
+
+_TZ_LOG = logging.getLogger("whoer.tz")
+
+
+class TimezoneService:
+    """Cached system timezone; subscribers hear about set() and watcher-detected changes."""
+
+    def __init__(self, backend=None, poll_interval_s: float = 60.0):
+        self.backend = backend
+        self.poll_interval_s = poll_interval_s
+        self._lock = threading.Lock()
+        self._current: str | None = None
+        self._subscribers = []
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+
+    def _backend(self):
+        if self.backend is None:
+            self.backend = make_tz_backend()
+        return self.backend
+
+    def current(self, force: bool = False) -> str:
+        with self._lock:
+            if self._current is None or force:
+                self._current = self._backend().read()
+            return self._current
+
+    def cached(self) -> str | None:
+        return self._current
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._current = None
+
+    def set(self, tz_id: str) -> tuple[bool, str]:
+        ok, msg = self._backend().write(tz_id)
+        self.invalidate()
+        if ok:
+            self._notify(self.current())
+        return ok, msg
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _notify(self, tz_id: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for cb in subscribers:
+            try:
+                cb(tz_id)
+            except Exception:
+                _TZ_LOG.exception("timezone subscriber %r failed", cb)
+
+    def poll_once(self) -> bool:
+        """Re-read the backend; notify and return True if the timezone changed."""
+        fresh = self._backend().read()
+        with self._lock:
+            changed = self._current is not None and fresh != self._current
+            self._current = fresh
+        if changed:
+            self._notify(fresh)
+        return changed
+
+    def start_watch(self) -> None:
+        if self._watch_thread is not None or self.poll_interval_s <= 0:
+            return
+
+        def loop():
+            while not self._watch_stop.wait(self.poll_interval_s):
+                try:
+                    self.poll_once()
+                except Exception:
+                    _TZ_LOG.exception("timezone poll failed")
+
+        self._watch_thread = threading.Thread(target=loop, daemon=True, name="tz-watch")
+        self._watch_thread.start()
+
+    def stop_watch(self) -> None:
+        self._watch_stop.set()
+
+
+TZ_SERVICE = TimezoneService()
+
+
+def get_current_tz() -> str:
+    return TZ_SERVICE.current()
+
+
+def set_windows_timezone(tz_id: str) -> tuple[bool, str]:
+    return TZ_SERVICE.set(tz_id)
+
+
+# ===================== Timezone mapping helpers =====================
+_TZUTIL_ITEMS_CACHE = None
+
+
+def parse_utc_offset_minutes(display: str) -> int | None:
+    if "(UTC" not in display:
+        return None
+    try:
+        inside = display.split("(UTC", 1)[1].split(")", 1)[0].strip()
+        if inside == "":
+            return 0
+        if inside.startswith("+"):
+            sign = 1
+            hhmm = inside[1:]
+        elif inside.startswith("-"):
+            sign = -1
+            hhmm = inside[1:]
+        else:
+            return 0
+        hh, mm = hhmm.split(":")
+        return sign * (int(hh) * 60 + int(mm))
+    except Exception:
+        return None
+
+
+def _tzutil_cache_path() -> str:
+    return os.path.join(profiles_root_dir(), TZUTIL_CACHE_FILENAME)
+
+
+def _load_tzutil_disk_cache() -> list[dict] | None:
+    """Parsed `tzutil /l` from a previous launch, if it is recent and from the same OS build."""
+    try:
+        with open(_tzutil_cache_path(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("os") != platform.version():
+        return None
+    if time.time() - float(data.get("saved", 0)) > TZUTIL_CACHE_MAX_AGE_S:
+        return None
+    items = data.get("items")
+    return items if isinstance(items, list) and items else None
+
+
+def _save_tzutil_disk_cache(items: list[dict]) -> None:
+    try:
+        ensure_dir(profiles_root_dir())
+        with open(_tzutil_cache_path(), "w", encoding="utf-8") as f:
+            json.dump({"os": platform.version(), "saved": time.time(), "items": items}, f)
+    except OSError:
+        pass
+
+
+def get_tzutil_items_cached() -> list[dict]:
+    global _TZUTIL_ITEMS_CACHE
+    if _TZUTIL_ITEMS_CACHE is not None:
+        return _TZUTIL_ITEMS_CACHE
+
+    items = _load_tzutil_disk_cache()
+    if items is not None:
+        _TZUTIL_ITEMS_CACHE = items
+        return items
+
+    try:
+        out = subprocess.run(["tzutil", "/l"], capture_output=True, text=True).stdout
+    except OSError:  # no tzutil (a check worker on Linux/macOS): win_tz stays "(no map)"
+        out = ""
+    lines = [ln.rstrip() for ln in (out or "").splitlines() if ln.strip()]
+
+    items = []
+    i = 0
+    while i < len(lines) - 1:
+        display = lines[i]
+        tzid = lines[i + 1]
+        off_min = parse_utc_offset_minutes(display)
+        items.append({"display": display, "id": tzid, "offset_min": off_min})
+        i += 2
+
+    _TZUTIL_ITEMS_CACHE = items
+    if items:
+        _save_tzutil_disk_cache(items)
+    return items
+
+
+def iana_offset_minutes_now(iana_tz: str) -> int | None:
+    if not iana_tz or iana_tz == "-":
+        return None
+    if ZoneInfo is None:
+        return None
+    try:
+        dt = datetime.now(ZoneInfo(iana_tz))
+        off = dt.utcoffset()
+        if off is None:
+            return None
+        return int(off.total_seconds() // 60)
+    except Exception:
+        return None
+
+
+def iana_to_windows_best(iana_tz: str) -> str:
+    with TRACER.span("tz map", "tz"):
+        return _iana_to_windows_best(iana_tz)
+
+
+def _iana_to_windows_best(iana_tz: str) -> str:
+    if not iana_tz or iana_tz in ("-", ""):
+        return "(no map)"
+
+    items = get_tzutil_items_cached()
+    off = iana_offset_minutes_now(iana_tz)
+    if off is None:
+        return "(no map)"
+
+    cands = [it for it in items if it["offset_min"] == off]
+    if not cands:
+        return "(no map)"
+
+    keyword = ""
+    if "/" in iana_tz:
+        keyword = iana_tz.split("/")[-1].replace("_", " ").strip().lower()
+
+    if keyword:
+        for it in cands:
+            if keyword in (it["display"] or "").lower():
+                return it["id"]
+
+    return cands[0]["id"]
+
+
+def windows_tz_candidates_by_offset(offset_min: int) -> list[dict]:
+    items = get_tzutil_items_cached()
+    return [it for it in items if it["offset_min"] == offset_min]
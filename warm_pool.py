@@ -0,0 +1,261 @@
+"""Warm pool of pre-verified proxies kept fresh in the background."""
+
+import time
+import threading
+import logging
+from collections import deque, OrderedDict
+
+from feed import (
+    DNS_RESOLVER, CandidateFeed, CandidateScheduler, parse_provider_specs, proxy_dedupe_key, start_provider_fetch
+)
+from check_lanes import run_check_lanes
+
+
+# ===================== Warm pool =====================
+WARM_POOL_DEFAULT_SIZE = 10
+WARM_POOL_CHECK_LANES = 32
+WARM_POOL_REVALIDATE_S = 120.0
+WARM_POOL_RETRY_S = 60.0
+WARM_POOL_RECHECK_AFTER_S = 1800.0
+WARM_POOL_ANY_COUNTRY = "*"
+
+
+class WarmPool:
+    """Keeps `size` verified proxies ready in the background, per country when `countries` is set."""
+
+    def __init__(self, providers_text: str, size: int = WARM_POOL_DEFAULT_SIZE, countries=(), opts: dict | None = None,
+                 lanes: int = WARM_POOL_CHECK_LANES, revalidate_s: float = WARM_POOL_REVALIDATE_S,
+                 on_change=None, on_log=None):
+        self.providers_text = providers_text
+        self.size = max(1, int(size))
+        self.countries = [c.strip().upper() for c in countries if c.strip()]
+        self.opts = dict(opts or {}, latency_samples=0, throughput_bytes=0)
+        self.lanes = lanes
+        self.revalidate_s = revalidate_s
+        self.on_change = on_change or (lambda stats: None)
+        self.on_log = on_log or (lambda *a: None)
+
+        self._lock = threading.Lock()
+        self._members: dict[str, dict] = {}
+        self._recent: dict[str, float] = {}
+        self._spares: OrderedDict[str, dict] = OrderedDict()
+        self._stop = threading.Event()
+        self._feed: CandidateFeed | None = None
+        self._thread: threading.Thread | None = None
+        self.state = "stopped"
+        self.added = 0
+        self.evicted = 0
+        self._evictions = deque()
+        self._deficit_since: float | None = None
+        self.last_refill_s: float | None = None
+        self._refill_times = deque(maxlen=20)
+
+    # ---- slots ----
+    def _slot(self, country: str) -> str | None:
+        if not self.countries:
+            return WARM_POOL_ANY_COUNTRY
+        cc = (country or "").upper()
+        return cc if cc in self.countries else None
+
+    def _slot_counts_locked(self) -> dict[str, int]:
+        counts = {c: 0 for c in (self.countries or [WARM_POOL_ANY_COUNTRY])}
+        for m in self._members.values():
+            slot = self._slot(m["country"])
+            if slot is not None:
+                counts[slot] += 1
+        return counts
+
+    def _deficit_locked(self) -> int:
+        return sum(max(0, self.size - n) for n in self._slot_counts_locked().values())
+
+    # ---- public ----
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="warm-pool")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        feed = self._feed
+        if feed is not None:
+            feed.stop()
+
+    def members(self, country: str | None = None) -> list[dict]:
+        with self._lock:
+            rows = [m for m in self._members.values() if not country or m["country"] == country.upper()]
+        return sorted(rows, key=lambda m: m["latency_ms"])
+
+    def best(self, country: str | None = None) -> dict | None:
+        rows = self.members(country)
+        return rows[0] if rows else None
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            while self._evictions and now - self._evictions[0] > 3600:
+                self._evictions.popleft()
+            counts = self._slot_counts_locked()
+            return {
+                "state": self.state, "size": len(self._members), "target": self.size * len(counts),
+                "slots": counts, "added": self.added, "evicted": self.evicted,
+                "churn_per_h": len(self._evictions), "last_refill_s": self.last_refill_s,
+                "avg_refill_s": (sum(self._refill_times) / len(self._refill_times)) if self._refill_times else None,
+            }
+
+    # ---- rounds ----
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        self.on_change(self.stats())
+
+    def _evict_locked(self, key: str, why: str) -> None:
+        m = self._members.pop(key, None)
+        if m is None:
+            return
+        self.evicted += 1
+        self._evictions.append(time.time())
+        self._recent[key] = time.time()
+        self.on_log(f"[pool] evicted {m['host']}:{m['port']} ({why})", logging.DEBUG)
+
+    def _note_deficit_locked(self) -> None:
+        deficit = self._deficit_locked()
+        if deficit and self._deficit_since is None:
+            self._deficit_since = time.perf_counter()
+        elif not deficit and self._deficit_since is not None:
+            self.last_refill_s = time.perf_counter() - self._deficit_since
+            self._refill_times.append(self.last_refill_s)
+            self._deficit_since = None
+
+    def _member_feed(self, members: list[dict]) -> CandidateFeed:
+        feed = CandidateFeed()
+        feed.open_sources(1)
+        for m in members:
+            feed.put_line(":".join([m["host"], m["port"]] + ([m["user"], m["pass"]] if m["user"] else [])), m["source"])
+        feed.close_source()
+        return feed
+
+    def _revalidate(self) -> None:
+        with self._lock:
+            snapshot = {k: dict(m) for k, m in self._members.items()}
+        if not snapshot:
+            return
+        self._set_state("revalidating")
+
+        def on_result(item, res):
+            key = proxy_dedupe_key(item[2])
+            old = snapshot.get(key)
+            with self._lock:
+                if key not in self._members:
+                    return
+                if res["status"] != "OK":
+                    self._evict_locked(key, res["error"] or "dead")
+                elif old and res["iana_tz"] != old["iana_tz"]:
+                    self._evict_locked(key, f"timezone {old['iana_tz']} -> {res['iana_tz']}")
+                else:
+                    self._members[key].update(latency_ms=res["latency_ms"], ip=res["ip"], verified_at=time.time())
+                self._note_deficit_locked()
+
+        self._feed = feed = self._member_feed(list(snapshot.values()))
+        run_check_lanes(feed, self.opts, on_result, threads=self.lanes, cancel_event=self._stop)
+        self._feed = None
+
+    def _admit_locked(self, key: str, res: dict) -> bool:
+        slot = self._slot(res["country"])
+        if slot is None:
+            return False
+        if self._slot_counts_locked()[slot] >= self.size:
+            self._spares[key] = res
+            self._spares.move_to_end(key)
+            while len(self._spares) > self.size * max(1, len(self.countries)):
+                old_key, old = self._spares.popitem(last=False)
+                self._recent[old_key] = old["verified_at"]
+            return False
+        self._spares.pop(key, None)
+        self._members[key] = res
+        self.added += 1
+        self._note_deficit_locked()
+        return True
+
+    def _refill(self) -> bool:
+        """Promote spares, then one pass over the providers; True if every slot is full afterwards."""
+        with self._lock:
+            for key, res in list(self._spares.items()):
+                if not self._deficit_locked():
+                    break
+                self._spares.pop(key)
+                if time.time() - res["verified_at"] < self.revalidate_s:
+                    self._admit_locked(key, res)
+            if not self._deficit_locked():
+                return True
+
+        providers = parse_provider_specs(self.providers_text)
+        if not providers:
+            self.on_log("[pool] no provider configured", logging.WARNING)
+            return False
+        self._set_state("refilling")
+        now = time.time()
+        feed = CandidateFeed(CandidateScheduler(), resolver=DNS_RESOLVER)
+        with self._lock:
+            for key, t in list(self._recent.items()):
+                if now - t > WARM_POOL_RECHECK_AFTER_S:
+                    del self._recent[key]
+            feed.preload_seen(list(self._members) + list(self._recent) + list(self._spares))
+
+        def on_result(item, res):
+            key = proxy_dedupe_key(item[2])
+            feed.record_result(item[2], res["status"] == "OK", res["error"])
+            with self._lock:
+                res["verified_at"] = time.time()
+                if res["status"] != "OK" or not self._admit_locked(key, res):
+                    if key not in self._spares:
+                        self._recent[key] = res["verified_at"]
+                    return
+                full = not self._deficit_locked()
+            self.on_change(self.stats())
+            if full:
+                feed.stop()
+
+        feed.open_sources(len(providers))
+        start_provider_fetch(providers, feed, timeout_s=20, on_log=self.on_log)
+        self._feed = feed
+        run_check_lanes(feed, self.opts, on_result, threads=self.lanes, cancel_event=self._stop)
+        self._feed = None
+        with self._lock:
+            return not self._deficit_locked()
+
+    def _run(self) -> None:
+        last_revalidate = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                with self._lock:
+                    self._note_deficit_locked()
+                    deficit = self._deficit_locked()
+                filled = self._refill() if deficit else True
+                if self._stop.is_set():
+                    break
+                until_revalidate = self.revalidate_s - (time.perf_counter() - last_revalidate)
+                if until_revalidate <= 0:
+                    self._revalidate()
+                    last_revalidate = time.perf_counter()
+                    continue
+                self._set_state("ready" if filled else "waiting for providers")
+                self._stop.wait(max(1.0, until_revalidate if filled else min(WARM_POOL_RETRY_S, until_revalidate)))
+        except Exception as e:
+            self.on_log(f"[pool] stopped on error: {type(e).__name__}: {e}", logging.ERROR)
+        finally:
+            self._set_state("stopped")
+
+
+def format_warm_pool_stats(st: dict) -> str:
+    slots = ""
+    if WARM_POOL_ANY_COUNTRY not in st["slots"]:
+        slots = " (" + ", ".join(f"{c} {n}" for c, n in st["slots"].items()) + ")"
+    refill = "-" if st["last_refill_s"] is None else f"{st['last_refill_s']:.1f}s"
+    avg = "" if st["avg_refill_s"] is None else f", avg {st['avg_refill_s']:.1f}s"
+    return (f"{st['state']} - {st['size']}/{st['target']} ready{slots} - +{st['added']} / -{st['evicted']} "
+            f"(churn {st['churn_per_h']}/h) - refill {refill}{avg}")